@@ -1,8 +1,12 @@
+from async_couch.clients.changes.endpoints import ChangesEndpoint
 from async_couch.clients.documents.endpoints import DocEndpoint, DocAttachmentEndpoint
 from async_couch.clients.database.endpoints import DatabaseEndpoint
 from async_couch.clients.designs.endpoints import DesignDocEndpoint, DesignViewEndpoint
 
-from async_couch.http_clients import HttpxCouchClient, BaseHttpClient
+from async_couch.codecs import JsonCodec, get_codec
+from async_couch.http_clients import HttpxCouchClient, BaseHttpClient, ClusterHttpClient
+from async_couch.http_clients.auth import CouchAuth, SessionAuth
+from async_couch.http_clients.cluster import node_url
 
 
 class CouchClient(
@@ -11,6 +15,7 @@ class CouchClient(
     DesignDocEndpoint,
     DesignViewEndpoint,
     DatabaseEndpoint,
+    ChangesEndpoint,
 ):
     pass
 
@@ -22,6 +27,10 @@ def get_couch_client(
     request_adapter: BaseHttpClient = HttpxCouchClient,
     user: str | None = None,
     password: str | None = None,
+    json_codec: str | JsonCodec | None = None,
+    auth_method: str | CouchAuth = "basic",
+    hosts: list[str] | None = None,
+    balancer: str = "round_robin",
     **kwargs,
 ) -> CouchClient:
     """
@@ -47,20 +56,61 @@ def get_couch_client(
     password: str
         Database authentication - password
 
+    json_codec: str | JsonCodec = None
+        Codec for request and response bodies: `orjson`, `msgspec`, `json`
+        or codec instance. The fastest installed one is used by default
+
+    auth_method: str | CouchAuth = 'basic'
+        `basic` sends user and password with every request, `session`
+        logs in once and reuses AuthSession cookie. `JWTAuth`, `ProxyAuth`
+        or any other `CouchAuth` instance can be passed instead, `user` and
+        `password` are not required in this case
+
+    hosts: list[str] = None
+        Cluster nodes as `host`, `host:port`, IPv6 address or
+        `[address]:port`. If passed, requests are spread across nodes and
+        `host`, `port` are used only as defaults
+
+    balancer: str = 'round_robin'
+        Cluster balancing strategy: `round_robin`, `least_outstanding` or
+        `latency_weighted`
+
     Returns
     -------
     CouchClient
         CouchDB API realisation
 
     """
-    if any([user is None, password is None]):
+    couch_auth = None
+
+    if isinstance(auth_method, CouchAuth):
+        couch_auth = auth_method
+
+    elif any([user is None, password is None]):
         raise ValueError("You need to pass 'auth' tuple or both 'user' and 'password'!")
-    kwargs["auth"] = (user, password)
+
+    elif auth_method == "session":
+        couch_auth = SessionAuth(user, password)
+
+    elif auth_method == "basic":
+        kwargs["auth"] = (user, password)
+
+    else:
+        raise ValueError(f"Unknown auth method: {auth_method}")
 
     schema = "http"
 
     if https:
         schema += "s"
 
-    http_client = request_adapter.get_client(f"{schema}://{host}:{port}", **kwargs)
+    if hosts:
+        urls = [node_url(node, port, schema) for node in hosts]
+        http_client = ClusterHttpClient.get_client(
+            urls, request_adapter=request_adapter, balancer=balancer, **kwargs
+        )
+    else:
+        http_client = request_adapter.get_client(f"{schema}://{host}:{port}", **kwargs)
+
+    http_client.codec = get_codec(json_codec)
+    http_client.couch_auth = couch_auth
     return CouchClient(http_client=http_client)
@@ -0,0 +1,288 @@
+import time
+import typing
+
+import anyio
+
+from async_couch import exc, types
+from async_couch.clients.designs.endpoints import encode_view_query, view_query
+from async_couch.clients.designs.responses import ExecuteViewResponse
+from async_couch.clients.documents.responses import DocumentDetailedResponse
+from async_couch.utils.lru import LRUCache
+from async_couch.utils.response_cache import CachedResponse, ResponseCache
+
+
+class PendingFetch:
+    """
+    Request in progress. Its result isn't cached if a change which affects
+    it is received meanwhile
+    """
+
+    __slots__ = ("key", "stale")
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.stale = False
+
+
+class ChangesCache(ResponseCache):
+    """
+    Read-through cache of documents and view results of one database,
+    invalidated by continuous changes feed. While the feed is connected
+    entries are served without requests. If it drops, entries are served
+    only for `fallback_ttl` seconds, the feed is reconnected from the last
+    received sequence and changes missed meanwhile are applied.
+
+    Any change drops all cached view results of the database, since it's
+    unknown which views it affects. With `refresh` cached documents are
+    replaced by their new version from the feed instead of being dropped.
+
+    .. code-block:: python
+
+        cache = ChangesCache(client, "db")
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(cache.run)
+
+            response = await cache.doc_get("doc_id")
+            response = await cache.view_exec("ddoc", "view", key="a")
+    """
+
+    def __init__(
+        self,
+        client,
+        db: str,
+        max_entries: int = 1000,
+        max_views: int = 100,
+        max_bytes: int = 16 * 1024 * 1024,
+        fallback_ttl: float = 1.0,
+        refresh: bool = False,
+        heartbeat: int = 2000,
+        retry_delay: float = 1.0,
+    ):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+
+        db: str
+            Database name
+
+        max_entries: int = 1000
+            Maximum number of cached documents
+
+        max_views: int = 100
+            Maximum number of cached view results
+
+        max_bytes: int = 16 * 1024 * 1024
+            Maximum total size of cached documents, and separately of view
+            results
+
+        fallback_ttl: float = 1.0
+            Seconds entry is served without request while the feed is
+            disconnected
+
+        refresh: bool = False
+            Receive documents with changes and update cached ones
+
+        heartbeat: int = 2000
+            Heartbeat of changes feed in milliseconds, should be less than
+            read timeout of http client
+
+        retry_delay: float = 1.0
+            Seconds to wait before reconnecting the feed
+        """
+        super().__init__(client)
+        self.db = db
+        self.fallback_ttl = fallback_ttl
+        self.refresh = refresh
+        self.heartbeat = heartbeat
+        self.retry_delay = retry_delay
+
+        self.live = False
+        """True while changes feed is connected"""
+
+        self.seq: str | None = None
+        """Sequence of the last applied change"""
+
+        self._docs = LRUCache(max_entries, max_bytes)
+        self._views = LRUCache(max_views, max_bytes)
+        self._fetches: typing.Set[PendingFetch] = set()
+
+    async def run(self):
+        """
+        Follow changes feed until cancelled. Start it in your task group,
+        otherwise cache works in TTL mode only
+        """
+        errors = (exc.HttpError, *self.client.http_client.transport_errors)
+
+        while True:
+            try:
+                await self.resync()
+
+                async with self.client.changes_stream(
+                    self.db,
+                    "continuous",
+                    since=self.seq,
+                    heartbeat=self.heartbeat,
+                    include_docs=self.refresh,
+                ) as changes:
+                    self.live = True
+
+                    async for change in changes:
+                        self.apply(change)
+
+                    self.seq = changes.last_seq or self.seq
+            except errors:
+                pass
+            finally:
+                self.live = False
+
+            await anyio.sleep(self.retry_delay)
+
+    async def resync(self):
+        """
+        Apply changes since the last received sequence or, on first call,
+        get current sequence of the database
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        since = "now" if self.seq is None else self.seq
+
+        async with self.client.changes_stream(
+            self.db, since=since, include_docs=self.refresh
+        ) as changes:
+            async for change in changes:
+                self.apply(change)
+
+        self.seq = changes.last_seq or self.seq
+
+    def apply(self, change: dict):
+        """
+        Drop or update entries affected by the change
+
+        Parameters
+        ----------
+        change: dict
+            Row of changes feed
+        """
+        key = ("doc", change["id"])
+
+        for fetch in self._fetches:
+            if fetch.key == key or fetch.key[0] == "view":
+                fetch.stale = True
+
+        self._views.clear()
+        doc = change.get("doc")
+
+        if self.refresh and doc and not change.get("deleted") and key in self._docs:
+            data = self.client.http_client.codec.dumps(doc)
+            entry = CachedResponse(f'"{doc["_rev"]}"', data, time.monotonic())
+            self._docs.set(key, entry, len(data))
+        else:
+            self._docs.pop(key)
+
+        if change.get("seq") is not None:
+            self.seq = change["seq"]
+
+    async def doc_get(self, doc_id: str) -> types.UniversalResponse:
+        """
+        Gets document from cache or server
+
+        Parameters
+        ----------
+        doc_id: str
+            Document id
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result
+        """
+        key = ("doc", doc_id)
+        entry: CachedResponse | None = self._docs.get(key)
+
+        if entry is not None and self.is_fresh(entry):
+            return self._hit(entry, DocumentDetailedResponse)
+
+        response, stale = await self._fetch(key, self.client.doc_get(self.db, doc_id))
+
+        if self.is_cacheable(response) and not stale:
+            data = response.data
+            entry = CachedResponse(response.headers.get("etag"), data, time.monotonic())
+            self._docs.set(key, entry, len(data))
+
+        return response
+
+    async def view_exec(
+        self, des_id: str, view_name: str, **params
+    ) -> types.UniversalResponse:
+        """
+        Executes view or gets its result from cache
+
+        Parameters
+        ----------
+        des_id: str
+            Design document name
+
+        view_name: str
+            View function name
+
+        params
+            Query parameters, same as for `view_exec`
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result
+        """
+        query = view_query(
+            **{
+                name: value
+                for name, value in params.items()
+                if name not in ("keys_chunk_size", "concurrency", "if_none_match")
+            }
+        )
+        query = encode_view_query(query, self.client.http_client.codec)
+        key = ("view", des_id, view_name, tuple(sorted(query.items())))
+        entry: CachedResponse | None = self._views.get(key)
+
+        if entry is not None and self.is_fresh(entry):
+            return self._hit(entry, ExecuteViewResponse)
+
+        response, stale = await self._fetch(
+            key, self.client.view_exec(self.db, des_id, view_name, **params)
+        )
+
+        if self.is_cacheable(response) and not stale:
+            data = response.data
+            entry = CachedResponse(None, data, time.monotonic())
+            self._views.set(key, entry, len(data))
+
+        return response
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.live or entry.is_fresh(self.fallback_ttl)
+
+    def clear(self):
+        self._docs.clear()
+        self._views.clear()
+
+    async def _fetch(
+        self, key: tuple, request: typing.Awaitable[types.UniversalResponse]
+    ) -> typing.Tuple[types.UniversalResponse, bool]:
+        # Response received together with a change which affects it may be
+        # older than the change, it's returned but not cached
+        fetch = PendingFetch(key)
+        self._fetches.add(fetch)
+        self.misses += 1
+
+        try:
+            response = await request
+        finally:
+            self._fetches.discard(fetch)
+
+        return response, fetch.stale
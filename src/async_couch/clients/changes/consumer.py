@@ -0,0 +1,291 @@
+import collections
+import typing
+
+import anyio
+
+from async_couch import exc
+
+
+class ChangesConsumer:
+    """
+    Processes changes feed with a pool of workers. Changes of the same
+    document are always handled by the same worker, so they are processed
+    in feed order. Sequence of the last change below which everything is
+    processed is saved into `_local/{checkpoint_id}` document periodically
+    and on exit, next run continues from it.
+
+    .. code-block:: python
+
+        async def handle(change: dict):
+            ...
+
+        consumer = ChangesConsumer(client, "db", handle, "indexer")
+        await consumer.run()
+    """
+
+    def __init__(
+        self,
+        client,
+        db: str,
+        handler: typing.Callable[[dict], typing.Awaitable[None]],
+        checkpoint_id: str,
+        workers: int = 8,
+        queue_size: int = 100,
+        checkpoint_interval: float = 5.0,
+        checkpoint_every: int = 1000,
+        follow: bool = True,
+        heartbeat: int = 2000,
+        retry_delay: float = 1.0,
+        **params,
+    ):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+
+        db: str
+            Database name
+
+        handler: typing.Callable[[dict], typing.Awaitable[None]]
+            Coroutine function which processes single change. Exception
+            raised by handler stops the consumer
+
+        checkpoint_id: str
+            Name of `_local` document to keep checkpoint in
+
+        workers: int = 8
+            Number of concurrently running handlers
+
+        queue_size: int = 100
+            Number of changes queued per worker
+
+        checkpoint_interval: float = 5.0
+            Seconds between checkpoints
+
+        checkpoint_every: int = 1000
+            Save checkpoint earlier if this number of changes is processed
+
+        follow: bool = True
+            Wait for new changes using continuous feed. Otherwise consumer
+            stops when all existing changes are processed
+
+        heartbeat: int = 2000
+            Heartbeat of continuous feed in milliseconds, should be less than
+            read timeout of http client
+
+        retry_delay: float = 1.0
+            Seconds to wait before reconnecting after network error
+
+        params
+            Changes feed parameters, same as for `changes_stream` except of
+            `feed` and `since`
+        """
+        self.client = client
+        self.db = db
+        self.handler = handler
+        self.checkpoint_id = checkpoint_id
+        self.workers = workers
+        self.queue_size = queue_size
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_every = checkpoint_every
+        self.follow = follow
+        self.heartbeat = heartbeat
+        self.retry_delay = retry_delay
+        self.params = params
+
+        self.seq: str | None = None
+        """Sequence below which all changes are processed"""
+
+        self.processed = 0
+        """Number of processed changes"""
+
+        self._pending: collections.deque[list] = collections.deque()
+        self._saved_seq: str | None = None
+        self._saved_at = 0
+        self._rev: str | None = None
+        self._checkpoint_due = anyio.Event()
+        self._error: Exception | None = None
+
+    @property
+    def checkpoint_doc_id(self) -> str:
+        return f"_local/{self.checkpoint_id}"
+
+    async def run(self):
+        """
+        Consume changes starting from saved checkpoint until all changes are
+        processed (if not `follow`), handler fails or task is cancelled.
+        Checkpoint is saved on exit in any case
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        since = await self.load_checkpoint()
+        self._error = None
+
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self._guard, tg, self._checkpoint_periodically)
+
+                async with anyio.create_task_group() as workers_tg:
+                    senders = []
+
+                    for _ in range(self.workers):
+                        send, receive = anyio.create_memory_object_stream(
+                            self.queue_size
+                        )
+                        senders.append(send)
+                        workers_tg.start_soon(
+                            self._guard, workers_tg, self._work, receive
+                        )
+
+                    workers_tg.start_soon(
+                        self._guard, workers_tg, self._dispatch, since, senders
+                    )
+
+                tg.cancel_scope.cancel()
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.save_checkpoint()
+
+        if self._error is not None:
+            raise self._error
+
+    async def load_checkpoint(self) -> str | None:
+        """
+        Read saved checkpoint
+
+        Returns
+        ----------
+        str | None
+            Saved sequence or None if consumer runs first time
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        response = await self.client.doc_get(self.db, self.checkpoint_doc_id)
+
+        if response.status_code == 404:
+            return None
+
+        if response.status_code != 200:
+            raise exc.CouchResponseError(response.status_code, response.data)
+
+        self._rev = response.model._rev
+        self.seq = self._saved_seq = response.model.doc.get("seq")
+        return self.seq
+
+    async def save_checkpoint(self):
+        """
+        Save sequence below which all changes are processed, if it changed
+        since last save
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred, e.g. checkpoint is updated by another
+            consumer
+        """
+        seq = self.seq
+
+        if seq is None or seq == self._saved_seq:
+            return
+
+        doc = {"seq": seq}
+
+        if self._rev is not None:
+            doc["_rev"] = self._rev
+
+        response = await self.client.doc_create_or_update(
+            self.db, self.checkpoint_doc_id, doc
+        )
+
+        if response.status_code not in (201, 202):
+            raise exc.CouchResponseError(response.status_code, response.data)
+
+        self._rev = response.model.rev
+        self._saved_seq = seq
+        self._saved_at = self.processed
+
+    async def _guard(self, task_group, func, *args):
+        # Errors stop all tasks and are raised by `run` as is, not wrapped
+        # into exception group
+        try:
+            await func(*args)
+        except Exception as error:
+            if self._error is None:
+                self._error = error
+
+            task_group.cancel_scope.cancel()
+
+    async def _dispatch(self, since: str | None, senders: list):
+        feed = "continuous" if self.follow else "normal"
+
+        try:
+            while True:
+                try:
+                    async with self.client.changes_stream(
+                        self.db,
+                        feed,
+                        since=since,
+                        heartbeat=self.heartbeat if self.follow else None,
+                        **self.params,
+                    ) as changes:
+                        async for change in changes:
+                            entry = [change.get("seq"), False]
+                            self._pending.append(entry)
+
+                            worker = hash(change["id"]) % len(senders)
+                            await senders[worker].send((change, entry))
+
+                        since = changes.last_seq or since
+
+                except self.client.http_client.transport_errors:
+                    # Feed is resumed after the last dispatched change
+                    since = next(
+                        (entry[0] for entry in reversed(self._pending) if entry[0]),
+                        self.seq or since,
+                    )
+                    await anyio.sleep(self.retry_delay)
+                    continue
+
+                if not self.follow:
+                    return
+        finally:
+            for send in senders:
+                send.close()
+
+    async def _work(self, receive):
+        with receive:
+            async for change, entry in receive:
+                await self.handler(change)
+                entry[1] = True
+                self._advance()
+
+    def _advance(self):
+        pending = self._pending
+
+        while pending and pending[0][1]:
+            seq = pending.popleft()[0]
+            self.processed += 1
+
+            if seq is not None:
+                self.seq = seq
+
+        if self.processed - self._saved_at >= self.checkpoint_every:
+            self._checkpoint_due.set()
+
+    async def _checkpoint_periodically(self):
+        while True:
+            with anyio.move_on_after(self.checkpoint_interval):
+                await self._checkpoint_due.wait()
+
+            self._checkpoint_due = anyio.Event()
+
+            # Interrupted request would leave checkpoint revision unknown
+            with anyio.CancelScope(shield=True):
+                await self.save_checkpoint()
@@ -0,0 +1,348 @@
+import contextlib
+import typing
+
+from async_couch import types
+from async_couch.clients.changes import responses as resp
+from async_couch.http_clients.base_client import BaseEndpoint
+
+
+feeds = ("normal", "longpoll", "continuous", "eventsource")
+"""Supported feed types"""
+
+
+def changes_query(
+    feed: str = "normal",
+    since: str | int = None,
+    limit: int = None,
+    descending: bool = False,
+    include_docs: bool = False,
+    conflicts: bool = False,
+    attachments: bool = False,
+    att_encoding_info: bool = False,
+    filter: str = None,
+    view: str = None,
+    style: str = None,
+    heartbeat: int = None,
+    timeout: int = None,
+    seq_interval: int = None,
+    filter_params: dict = None,
+) -> dict:
+    """
+    Collect changes feed query parameters which differ from CouchDB
+    defaults. See `ChangesEndpoint.changes` for parameters description
+
+    Returns
+    ----------
+    dict
+        Query parameters
+
+    Raises
+    ----------
+    ValueError:
+        If feed type is unknown
+    """
+    if feed not in feeds:
+        raise ValueError(f"Unknown feed: {feed}")
+
+    query = dict(filter_params or dict())
+
+    if feed != "normal":
+        query["feed"] = feed
+
+    if since is not None:
+        query["since"] = since
+
+    if limit is not None:
+        query["limit"] = limit
+
+    if descending:
+        query["descending"] = descending
+
+    if include_docs:
+        query["include_docs"] = include_docs
+
+    if conflicts:
+        query["conflicts"] = conflicts
+
+    if attachments:
+        query["attachments"] = attachments
+
+    if att_encoding_info:
+        query["att_encoding_info"] = att_encoding_info
+
+    if filter:
+        query["filter"] = filter
+
+    if view:
+        query["view"] = view
+
+    if style:
+        query["style"] = style
+
+    if heartbeat is not None:
+        query["heartbeat"] = heartbeat
+
+    if timeout is not None:
+        query["timeout"] = timeout
+
+    if seq_interval is not None:
+        query["seq_interval"] = seq_interval
+
+    return query
+
+
+def changes_body(
+    query: dict, doc_ids: typing.List[str] = None, selector: dict = None
+) -> dict | None:
+    """
+    Build request body for `_doc_ids` and `_selector` filters and set the
+    filter in query
+
+    Parameters
+    ----------
+    query: dict
+        Result of `changes_query`
+
+    doc_ids: typing.List[str] = None
+        Document IDs to filter by
+
+    selector: dict = None
+        Selector to filter by
+
+    Returns
+    ----------
+    dict | None
+        Request body or None if changes are not filtered by body
+    """
+    if doc_ids is not None:
+        query.setdefault("filter", "_doc_ids")
+        return {"doc_ids": doc_ids}
+
+    if selector is not None:
+        query.setdefault("filter", "_selector")
+        return {"selector": selector}
+
+    return None
+
+
+class ChangesEndpoint(BaseEndpoint):
+    """
+    Implement CouchDB changes feed API
+    """
+
+    __changes_endpoint__ = "/{db}/_changes"
+    """Changes feed endpoint"""
+
+    __changes_statuses__ = {
+        200: "Request completed successfully",
+        400: "Bad request",
+        401: "Read privilege required",
+        404: "Database not found",
+    }
+    """Changes feed response statuses"""
+
+    async def changes(
+        self,
+        db: str,
+        feed: str = "normal",
+        since: str | int = None,
+        limit: int = None,
+        descending: bool = False,
+        include_docs: bool = False,
+        conflicts: bool = False,
+        attachments: bool = False,
+        att_encoding_info: bool = False,
+        filter: str = None,
+        doc_ids: typing.List[str] = None,
+        selector: dict = None,
+        view: str = None,
+        style: str = None,
+        heartbeat: int = None,
+        timeout: int = None,
+        seq_interval: int = None,
+        filter_params: dict = None,
+    ) -> types.UniversalResponse:
+        """
+        Returns a sorted list of changes made to documents in the database.
+        Whole response is read, use `changes_stream` for continuous and
+        eventsource feeds or for large results.
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        feed: str = 'normal'
+            `normal` returns changes immediately, `longpoll` waits for at
+            least one change. `continuous` and `eventsource` are supported
+            by `changes_stream` only
+
+        since: str | int = None
+            Start the results from the change immediately after the given
+            update sequence. Can be `now`
+
+        limit: int = None
+            Limit number of result rows to the specified value
+
+        descending: bool = False
+            Return the change results in descending sequence order
+
+        include_docs: bool = False
+            Include the associated document with each result
+
+        conflicts: bool = False
+            Include conflicts information of documents, requires
+            `include_docs`
+
+        attachments: bool = False
+            Include attachments bodies, requires `include_docs`
+
+        att_encoding_info: bool = False
+            Include encoding information in attachment stubs, requires
+            `include_docs`
+
+        filter: str = None
+            Filter function as `ddoc/filter`, `_doc_ids`, `_selector`,
+            `_design` or `_view`
+
+        doc_ids: typing.List[str] = None
+            Return only changes of these documents, `_doc_ids` filter is
+            used
+
+        selector: dict = None
+            Return only changes of documents matching the selector,
+            `_selector` filter is used
+
+        view: str = None
+            View function as `ddoc/view` for `_view` filter
+
+        style: str = None
+            `all_docs` returns all leaf revisions, `main_only` (default)
+            returns only the winning revision
+
+        heartbeat: int = None
+            Period in milliseconds after which an empty line is sent to keep
+            the connection open. Should be less than read timeout of http
+            client for `longpoll`, `continuous` and `eventsource` feeds
+
+        timeout: int = None
+            Maximum period in milliseconds to wait for a change before the
+            response is sent
+
+        seq_interval: int = None
+            Calculate `seq` of only every Nth result, others are null.
+            Speeds up feeds with many changes
+
+        filter_params: dict = None
+            Query parameters for custom filter function
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result with `ChangesResponse` model
+
+        Raises
+        ----------
+        ValueError:
+            If feed type is unknown or not supported
+
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        if feed in ("continuous", "eventsource"):
+            raise ValueError(f"Use changes_stream for {feed} feed")
+
+        query = changes_query(
+            feed=feed,
+            since=since,
+            limit=limit,
+            descending=descending,
+            include_docs=include_docs,
+            conflicts=conflicts,
+            attachments=attachments,
+            att_encoding_info=att_encoding_info,
+            filter=filter,
+            view=view,
+            style=style,
+            heartbeat=heartbeat,
+            timeout=timeout,
+            seq_interval=seq_interval,
+            filter_params=filter_params,
+        )
+        json_data = changes_body(query, doc_ids, selector)
+
+        return await self.http_client.make_request(
+            endpoint=self.__changes_endpoint__,
+            method=types.HttpMethod.GET if json_data is None else types.HttpMethod.POST,
+            statuses=self.__changes_statuses__,
+            query=query,
+            path={"db": db},
+            json_data=json_data,
+            response_model=resp.ChangesResponse,
+        )
+
+    @contextlib.asynccontextmanager
+    async def changes_stream(
+        self,
+        db: str,
+        feed: str = "normal",
+        doc_ids: typing.List[str] = None,
+        selector: dict = None,
+        **params,
+    ) -> typing.AsyncIterator[resp.ChangesStream]:
+        """
+        Streams changes feed, changes are decoded one by one while the body
+        arrives. Normal and longpoll feeds end when the server finishes the
+        response, continuous and eventsource feeds run until `timeout` or
+        until the caller exits. Must be used as async context manager,
+        connection is released on exit.
+
+        .. code-block:: python
+
+            async with client.changes_stream(
+                db, "continuous", since="now", heartbeat=1000
+            ) as changes:
+                async for change in changes:
+                    ...
+
+            resume_from = changes.last_seq
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        feed: str = 'normal'
+            `normal`, `longpoll`, `continuous` or `eventsource`
+
+        doc_ids: typing.List[str] = None
+            Return only changes of these documents
+
+        selector: dict = None
+            Return only changes of documents matching the selector
+
+        params
+            Query parameters, same as for `changes`
+
+        Returns
+        ----------
+        `ChangesStream`
+            Async iterator over changes
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        query = changes_query(feed, **params)
+        json_data = changes_body(query, doc_ids, selector)
+
+        async with self.http_client.stream_request(
+            endpoint=self.__changes_endpoint__,
+            method=types.HttpMethod.GET if json_data is None else types.HttpMethod.POST,
+            statuses=self.__changes_statuses__,
+            query=query,
+            path={"db": db},
+            json_data=json_data,
+        ) as response:
+            yield resp.ChangesStream(response, feed, loads=self.http_client.codec.loads)
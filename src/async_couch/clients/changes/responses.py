@@ -0,0 +1,80 @@
+import typing
+
+from dataclasses import dataclass
+
+from async_couch.codecs import default_codec
+from async_couch.types import EmptyResponse
+from async_couch.utils.json_stream import (
+    EventStreamParser,
+    JsonArrayParser,
+    JsonLinesParser,
+)
+
+
+@dataclass
+class ChangesResponse(EmptyResponse):
+    results: typing.List[dict] = None
+    # Changes made to a database, `seq`, `id`, `changes` and optionally
+    # `doc` and `deleted`
+
+    last_seq: str = None
+    # Last change update sequence
+
+    pending: int = None
+    # Count of remaining items in the feed
+
+
+class ChangesStream:
+    """
+    Asynchronous iterator over changes of streamed feed. Changes are decoded
+    one by one while the body arrives, `last_seq` is updated with every
+    change, so it can be passed as `since` to resume the feed
+    """
+
+    def __init__(
+        self,
+        response,
+        feed: str = "normal",
+        loads: typing.Callable = default_codec.loads,
+    ):
+        self.response = response
+        """Streamed `UniversalResponse`, `data` is an async bytes iterator"""
+
+        self.feed = feed
+
+        self.last_seq: str | None = None
+        """Update sequence of the last received change"""
+
+        self.pending: int | None = None
+        """Count of remaining changes, if feed was finished by server"""
+
+        if feed == "continuous":
+            self._parser = JsonLinesParser(loads)
+        elif feed == "eventsource":
+            self._parser = EventStreamParser(loads)
+        else:
+            self._parser = JsonArrayParser(b"results", loads)
+
+    async def __aiter__(self) -> typing.AsyncIterator[dict]:
+        async for chunk in self.response.data:
+            for change in self._parser.feed(chunk):
+                if "last_seq" in change and "id" not in change:
+                    self._finish(change)
+                    continue
+
+                # With seq_interval most changes have null seq
+                if change.get("seq") is not None:
+                    self.last_seq = change["seq"]
+
+                yield change
+
+        if isinstance(self._parser, JsonArrayParser):
+            self._finish(self._parser.close())
+
+        elif isinstance(self._parser, JsonLinesParser):
+            for change in self._parser.close():
+                self._finish(change)
+
+    def _finish(self, meta: dict):
+        self.last_seq = meta.get("last_seq", self.last_seq)
+        self.pending = meta.get("pending", self.pending)
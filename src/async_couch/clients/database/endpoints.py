@@ -1,9 +1,150 @@
-from async_couch import types
-from async_couch.clients.designs.responses import ExecuteViewResponse
+import contextlib
+import typing
+
+import anyio
+
+from async_couch import exc, types
+from async_couch.codecs import JsonCodec
+from async_couch.clients.designs.endpoints import (
+    encode_view_query,
+    load_columns,
+    view_queries_body,
+    view_query,
+)
+from async_couch.clients.designs.responses import (
+    ColumnarViewResponse,
+    ExecuteViewQueriesResponse,
+    ExecuteViewResponse,
+)
 from async_couch.http_clients.base_client import BaseEndpoint
+from async_couch.utils.json_stream import JsonRowStream
+from async_couch.utils.streams import (
+    ProducerError,
+    gather_in_background,
+    iterate,
+    produce_in_background,
+)
 from . import responses as resp
 
 
+def encode_bulk_docs(
+    docs: typing.Iterable[dict | bytes], new_edits: bool, codec: JsonCodec
+) -> bytes:
+    """
+    Build `_bulk_docs` request body. Documents which are already encoded
+    are not encoded again
+
+    Parameters
+    ----------
+    docs: typing.Iterable[dict | bytes]
+        Documents or JSON encoded documents
+
+    new_edits: bool
+        If false, prevents the database from assigning new revision IDs
+
+    codec: JsonCodec
+        Codec for documents encoding
+
+    Returns
+    ----------
+    bytes
+        Request body
+    """
+    encoded = b",".join(
+        doc if isinstance(doc, bytes) else codec.dumps(doc) for doc in docs
+    )
+    options = b"" if new_edits else b',"new_edits":false'
+    return b'{"docs":[' + encoded + b"]" + options + b"}"
+
+
+def find_query(
+    selector: dict,
+    limit: int = None,
+    skip: int = None,
+    sort: list = None,
+    fields: list = None,
+    use_index: str | list = None,
+    r: int = None,
+    bookmark: str = None,
+    update: bool = True,
+    stable: bool = None,
+    stale: str = None,
+    execution_stats: bool = False,
+) -> dict:
+    """
+    Build `_find` request body. Options with CouchDB default values are
+    omitted
+
+    Returns
+    ----------
+    dict
+        Request body
+    """
+    body = {"selector": selector}
+
+    if limit is not None:
+        body["limit"] = limit
+    if skip:
+        body["skip"] = skip
+    if sort:
+        body["sort"] = sort
+    if fields:
+        body["fields"] = fields
+    if use_index:
+        body["use_index"] = use_index
+    if r is not None and r != 1:
+        body["r"] = r
+    if bookmark:
+        body["bookmark"] = bookmark
+    if update is not True:
+        body["update"] = update
+    if stable is not None:
+        body["stable"] = stable
+    if stale:
+        body["stale"] = stale
+    if execution_stats:
+        body["execution_stats"] = execution_stats
+
+    return body
+
+
+class FindDocsStream:
+    """
+    Documents of all `_find` pages. `bookmark` and `execution_stats` are
+    updated as pages are consumed, so after iteration they describe the
+    whole result set
+    """
+
+    def __init__(self, pages: typing.AsyncIterator[resp.FindResponse]):
+        self._pages = pages
+
+        self.bookmark: str | None = None
+        """Bookmark of the last consumed page, can be used to resume"""
+
+        self.execution_stats: typing.Dict[str, int | float] = dict()
+        """Sum of execution statistics of consumed pages"""
+
+        self.warnings: typing.List[str] = []
+        """Unique warnings of consumed pages"""
+
+        self.pages = 0
+        """Number of consumed pages"""
+
+    async def __aiter__(self) -> typing.AsyncIterator[dict]:
+        async for page in self._pages:
+            self.pages += 1
+            self.bookmark = page.bookmark
+
+            for name, value in (page.execution_stats or dict()).items():
+                self.execution_stats[name] = self.execution_stats.get(name, 0) + value
+
+            if page.warning and page.warning not in self.warnings:
+                self.warnings.append(page.warning)
+
+            for doc in page.docs or []:
+                yield doc
+
+
 class DatabaseEndpoint(BaseEndpoint):
     """
     Implement CouchDB database API
@@ -12,6 +153,36 @@ class DatabaseEndpoint(BaseEndpoint):
     __db_endpoint__ = "/{db}"
     """Database endpoint"""
 
+    __db_all_docs_endpoint__ = "/{db}/_all_docs"
+    """All documents endpoint"""
+
+    __db_all_docs_statuses__ = {
+        200: "Request completed successfully",
+        304: "Result wasn’t modified since specified ETag",
+        400: "Invalid request",
+        401: "Read privilege required",
+        404: "Specified database, design document or view is missed",
+    }
+    """All documents response statuses"""
+
+    __db_all_docs_queries_endpoint__ = "/{db}/_all_docs/queries"
+    """All documents multi-query endpoint"""
+
+    __db_design_docs_queries_endpoint__ = "/{db}/_design_docs/queries"
+    """Design documents multi-query endpoint"""
+
+    __db_find_endpoint__ = "/{db}/_find"
+    """Mango query endpoint"""
+
+    __db_find_statuses__ = {
+        200: "Request completed successfully",
+        400: "Invalid request",
+        401: "Read permission required",
+        404: "Requested database not found",
+        500: "Query execution error",
+    }
+    """Mango query response statuses"""
+
     async def db_exists(self, db: str) -> types.UniversalResponse:
         """
         Returns the HTTP Headers containing a minimal amount of information
@@ -229,6 +400,7 @@ class DatabaseEndpoint(BaseEndpoint):
         start_key_doc_id: str = None,
         update: bool = True,
         update_seq: bool = False,
+        if_none_match: str = None,
     ) -> types.UniversalResponse:
         """
         POST _all_docs functionality supports identical parameters and
@@ -325,6 +497,10 @@ class DatabaseEndpoint(BaseEndpoint):
             Whether to include in the response an update_seq value indicating
             the sequence id of the database the view reflects
 
+        if_none_match: str = None
+            ETag of previous result. If it's still actual, 304 is returned
+            without body
+
         Returns
         ----------
         `UniversalResponse`
@@ -335,88 +511,305 @@ class DatabaseEndpoint(BaseEndpoint):
         exc.CouchResponseError:
             If server error occurred
         """
-        query = dict()
+        query = view_query(
+            conflicts=conflicts,
+            descending=descending,
+            end_key=end_key,
+            end_key_doc_id=end_key_doc_id,
+            group=group,
+            group_level=group_level,
+            include_docs=include_docs,
+            attachments=attachments,
+            att_encoding_info=att_encoding_info,
+            inclusive_end=inclusive_end,
+            key=key,
+            keys=keys,
+            limit=limit,
+            reduce=reduce,
+            skip=skip,
+            sort=sort,
+            stable=stable,
+            stale=stale,
+            start_key=start_key,
+            start_key_doc_id=start_key_doc_id,
+            update=update,
+            update_seq=update_seq,
+        )
+        json_data = {name: query.pop(name) for name in ("key", "keys") if name in query}
 
-        if conflicts:
-            query["conflicts"] = conflicts
+        return await self.http_client.make_request(
+            endpoint=self.__db_all_docs_endpoint__,
+            method=types.HttpMethod.POST,
+            statuses=self.__db_all_docs_statuses__,
+            query=encode_view_query(query, self.http_client.codec),
+            path={"db": db},
+            headers={"If-None-Match": if_none_match} if if_none_match else None,
+            json_data=json_data,
+            response_model=ExecuteViewResponse,
+        )
 
-        if descending:
-            query["descending"] = descending
+    @contextlib.asynccontextmanager
+    async def db_all_docs_stream(
+        self, db: str, **params
+    ) -> typing.AsyncIterator[JsonRowStream]:
+        """
+        Same as `db_all_docs`, but rows are decoded one by one while the
+        response body arrives, so memory usage doesn't depend on the number
+        of documents. Must be used as async context manager, connection is
+        released on exit.
 
-        if end_key:
-            query["end_key"] = end_key
+        .. code-block:: python
 
-        if end_key_doc_id:
-            query["end_key_doc_id"] = end_key_doc_id
+            async with client.db_all_docs_stream(db, include_docs=True) as rows:
+                async for row in rows:
+                    ...
 
-        if group:
-            query["group"] = group
+        Parameters
+        ----------
+        db
+            Database name
 
-        if group_level:
-            query["group_level"] = group_level
+        params
+            Query parameters, same as for `db_all_docs`
 
-        if include_docs:
-            query["include_docs"] = include_docs
+        Returns
+        ----------
+        `JsonRowStream`
+            Async iterator over result rows
 
-        if attachments:
-            query["attachments"] = attachments
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        query = view_query(**params)
+        json_data = {name: query.pop(name) for name in ("key", "keys") if name in query}
 
-        if att_encoding_info:
-            query["att_encoding_info"] = att_encoding_info
+        async with self.http_client.stream_request(
+            endpoint=self.__db_all_docs_endpoint__,
+            method=types.HttpMethod.POST,
+            statuses=self.__db_all_docs_statuses__,
+            query=encode_view_query(query, self.http_client.codec),
+            path={"db": db},
+            json_data=json_data,
+        ) as response:
+            yield JsonRowStream(response, loads=self.http_client.codec.loads)
 
-        if not inclusive_end:
-            query["inclusive_end"] = inclusive_end
+    async def db_all_docs_columns(self, db: str, **params) -> ColumnarViewResponse:
+        """
+        Same as `db_all_docs`, but rows are decoded into columns while the
+        response body arrives. Document IDs are kept in a table of
+        distinct strings
 
-        if limit:
-            query["limit"] = limit
+        Parameters
+        ----------
+        db
+            Database name
 
-        if not reduce:
-            query["reduce"] = reduce
+        params
+            Query parameters, same as for `db_all_docs`
 
-        if skip:
-            query["skip"] = skip
+        Returns
+        ----------
+        `ColumnarViewResponse`
+            Columns of ids, keys and values
 
-        if not sort:
-            query["sorted"] = sort
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        async with self.db_all_docs_stream(db, **params) as rows:
+            return await load_columns(rows)
 
-        if stable:
-            query["stable"] = stable
+    @contextlib.asynccontextmanager
+    async def db_all_docs_lookup(
+        self,
+        db: str,
+        keys: typing.Sequence[str],
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        **params,
+    ) -> typing.AsyncIterator[typing.AsyncIterator[dict]]:
+        """
+        Looks up documents by many IDs. Keys are split into chunks which
+        are requested concurrently, rows are yielded in order of `keys` as
+        soon as their chunk is received. Only `concurrency` chunks are
+        requested ahead of the caller, so memory usage doesn't depend on
+        the number of keys. Must be used as async context manager.
 
-        if stale:
-            query["stale"] = stale
+        .. code-block:: python
 
-        if start_key:
-            query["start_key"] = start_key
+            async with client.db_all_docs_lookup(db, ids, include_docs=True) as rows:
+                async for row in rows:
+                    ...
 
-        if start_key_doc_id:
-            query["start_key_doc_id"] = start_key_doc_id
+        Parameters
+        ----------
+        db
+            Database name
 
-        if update != "true":
-            query["update"] = update
+        keys: typing.Sequence[str]
+            Documents IDs
 
-        if update_seq:
-            query["update_seq"] = update_seq
+        chunk_size: int = 1000
+            Number of keys per request
 
-        json_data = dict()
+        concurrency: int = 4
+            Maximum number of concurrent requests
 
-        if key:
-            json_data["key"] = f'"{key}"'
-        elif keys:
-            json_data["keys"] = keys
+        params
+            Query parameters, same as for `db_all_docs` except of `key`,
+            `keys`, `limit` and `skip`
+
+        Returns
+        ----------
+        typing.AsyncIterator[dict]
+            Row of every key. Rows of missing documents have `error` field
+
+        Raises
+        ----------
+        ValueError:
+            If `key`, `keys`, `limit` or `skip` is passed in params
+
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        if {"key", "keys", "limit", "skip"} & params.keys():
+            raise ValueError("key, keys, limit and skip are not supported by lookup")
+
+        async def fetch(chunk, send):
+            async with send:
+                try:
+                    response = await self.db_all_docs(db, keys=chunk, **params)
+                except Exception as error:
+                    response = ProducerError(error)
+
+                await send.send(response)
+
+        async def schedule(results):
+            # Every chunk gets own stream, streams are passed in order of
+            # keys. Chunk is requested when its stream fits into buffer of
+            # `results`, so the buffer limits number of chunks in progress
+            async with anyio.create_task_group() as tg:
+                for i in range(0, len(keys), chunk_size):
+                    send, receive = anyio.create_memory_object_stream(1)
+                    await results.send(receive)
+                    tg.start_soon(fetch, keys[i : i + chunk_size], send)
+
+        async def iterate_rows(results):
+            async for receive in results:
+                async with receive:
+                    response = await receive.receive()
+
+                if isinstance(response, ProducerError):
+                    raise response.error
+
+                if response.status_code > 299:
+                    raise exc.CouchResponseError(response.status_code, response.data)
+
+                for row in response.model.rows:
+                    yield row
+
+        async with produce_in_background(schedule, max(concurrency - 1, 0)) as results:
+            yield iterate_rows(results)
+
+    async def db_all_docs_lookup_dict(
+        self, db: str, keys: typing.Sequence[str], **params
+    ) -> typing.Dict[str, dict]:
+        """
+        Same as `db_all_docs_lookup`, but rows are collected into dict
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        keys: typing.Sequence[str]
+            Documents IDs
+
+        params
+            Parameters of `db_all_docs_lookup`
+
+        Returns
+        ----------
+        typing.Dict[str, dict]
+            Rows by requested IDs, in order of `keys`
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        async with self.db_all_docs_lookup(db, keys, **params) as rows:
+            return {row["key"]: row async for row in rows}
+
+    async def db_all_docs_queries(
+        self, db: str, queries: typing.Sequence[dict]
+    ) -> types.UniversalResponse:
+        """
+        Executes several `_all_docs` queries in one request
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        queries: typing.Sequence[dict]
+            Query parameters of every query, same as for `db_all_docs`
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result, model is `ExecuteViewQueriesResponse` with
+            result of every query in order of `queries`
 
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
         return await self.http_client.make_request(
-            endpoint="/{db}/_all_docs",
+            endpoint=self.__db_all_docs_queries_endpoint__,
             method=types.HttpMethod.POST,
-            statuses={
-                200: "Request completed successfully",
-                400: "Invalid request",
-                401: "Read privilege required",
-                404: "Specified database, design document or view is missed",
-            },
-            query=query,
+            statuses=self.__db_all_docs_statuses__,
             path={"db": db},
-            json_data=json_data,
-            response_model=ExecuteViewResponse,
+            json_data=view_queries_body(queries),
+            response_model=ExecuteViewQueriesResponse,
+        )
+
+    async def db_design_docs_queries(
+        self, db: str, queries: typing.Sequence[dict]
+    ) -> types.UniversalResponse:
+        """
+        Executes several `_design_docs` queries in one request
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        queries: typing.Sequence[dict]
+            Query parameters of every query, same as for `db_all_docs`
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result, model is `ExecuteViewQueriesResponse` with
+            result of every query in order of `queries`
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        return await self.http_client.make_request(
+            endpoint=self.__db_design_docs_queries_endpoint__,
+            method=types.HttpMethod.POST,
+            statuses=self.__db_all_docs_statuses__,
+            path={"db": db},
+            json_data=view_queries_body(queries),
+            response_model=ExecuteViewQueriesResponse,
         )
 
     async def db_design_docs(
@@ -615,7 +1008,8 @@ class DatabaseEndpoint(BaseEndpoint):
             Database name
 
         docs: list
-            List of document objects
+            List of document objects. Documents already encoded into JSON
+            bytes are sent as is
 
         new_edits: bool=True
             If false, prevents the database from assigning them new revision
@@ -624,34 +1018,129 @@ class DatabaseEndpoint(BaseEndpoint):
         Returns
         ----------
         `UniversalResponse`
-            Operating result
+            Operating result, model contains result for every document in
+            the same order
 
         Raises
         ----------
         exc.CouchResponseError:
             If server error occurred
         """
-
-        query = dict()
-
-        if docs:
-            query["docs"] = docs
-        if new_edits:
-            query["new_edits"] = new_edits
-
         return await self.http_client.make_request(
-            endpoint="/db/_bulk_docs",
+            endpoint="/{db}/_bulk_docs",
             method=types.HttpMethod.POST,
             statuses={
                 201: "Document(s) have been created or updated",
-                401: "The request provided invalid JSON data",
+                400: "The request provided invalid JSON data",
                 404: "Requested database not found",
+                417: "Document(s) rejected by validation function",
             },
-            query=query,
             path={"db": db},
-            response_model=ExecuteViewResponse,
+            headers={"Content-Type": "application/json"},
+            data=encode_bulk_docs(docs, new_edits, self.http_client.codec),
+            response_model=resp.BulkDocsResponse,
         )
 
+    @contextlib.asynccontextmanager
+    async def db_bulk_import(
+        self,
+        db: str,
+        docs: typing.Iterable[dict] | typing.AsyncIterable[dict],
+        batch_size: int = 1000,
+        max_batch_bytes: int = 16 * 1024 * 1024,
+        concurrency: int = 4,
+        new_edits: bool = True,
+    ) -> typing.AsyncIterator[typing.AsyncIterator[dict]]:
+        """
+        Imports documents from (async) iterable with `_bulk_docs` requests.
+        Documents are encoded and cut into batches by number and encoded
+        size, `concurrency` batches are sent simultaneously. Only batches in
+        flight are kept in memory. Must be used as async context manager,
+        import is cancelled on exit.
+
+        .. code-block:: python
+
+            async with client.db_bulk_import(db, docs) as results:
+                async for result in results:
+                    if "error" in result:
+                        ...
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        docs: typing.Iterable[dict] | typing.AsyncIterable[dict]
+            Documents to import
+
+        batch_size: int = 1000
+            Maximum number of documents per request
+
+        max_batch_bytes: int = 16 * 1024 * 1024
+            Maximum size of encoded documents per request. Must be less than
+            `max_http_request_size` of the server
+
+        concurrency: int = 4
+            Number of requests in flight
+
+        new_edits: bool=True
+            If false, prevents the database from assigning them new revision
+            IDs
+
+        Returns
+        ----------
+        typing.AsyncIterator[dict]
+            Result for every document in order of batches completion: `id`
+            and `rev` on success, `id`, `error` and `reason` if document was
+            rejected
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If batch request failed
+        """
+        batches_send, batches_receive = anyio.create_memory_object_stream(0)
+
+        async def produce(_):
+            async with batches_send:
+                batch, size = [], 0
+
+                async for doc in iterate(docs):
+                    encoded = self.http_client.codec.dumps(doc)
+
+                    if batch and (
+                        len(batch) >= batch_size
+                        or size + len(encoded) > max_batch_bytes
+                    ):
+                        await batches_send.send(batch)
+                        batch, size = [], 0
+
+                    batch.append(encoded)
+                    size += len(encoded) + 1
+
+                if batch:
+                    await batches_send.send(batch)
+
+        async def upload(results):
+            async for batch in batches_receive:
+                response = await self.db_bulk_docs(db, batch, new_edits)
+
+                if response.status_code > 299:
+                    raise exc.CouchResponseError(response.status_code, response.data)
+
+                await results.send(response.model.results)
+
+        async def iterate_results(batches_results):
+            async for results in batches_results:
+                for result in results:
+                    yield result
+
+        workers = [produce] + [upload] * concurrency
+
+        async with batches_receive:
+            async with gather_in_background(workers, concurrency) as batches_results:
+                yield iterate_results(batches_results)
+
     async def db_find(
         self,
         db: str,
@@ -667,7 +1156,7 @@ class DatabaseEndpoint(BaseEndpoint):
         stable: bool = None,
         stale: str = None,
         execution_stats: bool = False,
-    ) -> ExecuteViewResponse:
+    ) -> types.UniversalResponse:
         """
         Find documents using a declarative JSON querying syntax. Queries can
         use the built-in _all_docs index or custom indexes, specified using the
@@ -739,48 +1228,107 @@ class DatabaseEndpoint(BaseEndpoint):
             If server error occurred
         """
 
-        query = dict()
-
-        if limit:
-            query["limit"] = limit
-        if skip:
-            query["skip"] = skip
-        if sort:
-            query["sort"] = sort
-        if fields:
-            query["fields"] = fields
-        if use_index:
-            query["use_index"] = use_index
-        if r:
-            query["r"] = r
-        if bookmark:
-            query["bookmark"] = bookmark
-        if update:
-            query["update"] = update
-        if stable:
-            query["stable"] = stable
-        if stale:
-            query["stale"] = stale
-        if execution_stats:
-            query["execution_stats"] = execution_stats
-
-        json_data = dict()
-
-        if selector:
-            json_data["selector"] = selector
-
         return await self.http_client.make_request(
-            endpoint="/db/_find",
+            endpoint=self.__db_find_endpoint__,
             method=types.HttpMethod.POST,
-            statuses={
-                200: "Request completed successfully",
-                400: "Invalid request",
-                401: "Read permission required",
-                404: "Requested database not found",
-                500: "Query execution error",
-            },
-            query=query,
+            statuses=self.__db_find_statuses__,
             path={"db": db},
-            json_data=json_data,
-            response_model=ExecuteViewResponse,
+            json_data=find_query(
+                selector=selector,
+                limit=limit,
+                skip=skip,
+                sort=sort,
+                fields=fields,
+                use_index=use_index,
+                r=r,
+                bookmark=bookmark,
+                update=update,
+                stable=stable,
+                stale=stale,
+                execution_stats=execution_stats,
+            ),
+            response_model=resp.FindResponse,
         )
+
+    @contextlib.asynccontextmanager
+    async def db_find_iter(
+        self,
+        db: str,
+        selector: dict,
+        page_size: int = 100,
+        prefetch: int = 1,
+        bookmark: str = None,
+        **params,
+    ) -> typing.AsyncIterator[FindDocsStream]:
+        """
+        Iterates over all documents matching the selector, following
+        bookmarks page by page. Next pages are requested while the caller
+        processes the current one. Must be used as async context manager.
+
+        .. code-block:: python
+
+            async with client.db_find_iter(db, {"type": "user"}) as docs:
+                async for doc in docs:
+                    ...
+
+            print(docs.execution_stats)
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        selector: dict
+            JSON object describing criteria used to select documents
+
+        page_size: int = 100
+            Number of documents per request
+
+        prefetch: int = 1
+            Number of pages requested ahead of the caller
+
+        bookmark: str = None
+            Bookmark to resume iteration from
+
+        params
+            Query parameters, same as for `db_find` except of `limit` and
+            `skip`
+
+        Returns
+        ----------
+        FindDocsStream
+            Matching documents, bookmark of the last received page and
+            execution statistics totals
+
+        Raises
+        ----------
+        ValueError:
+            If `limit` or `skip` is passed
+
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        if {"limit", "skip"} & params.keys():
+            raise ValueError("limit and skip are not supported by bookmarks")
+
+        async def fetch_pages(pages):
+            page_bookmark = bookmark
+
+            while True:
+                response = await self.db_find(
+                    db, selector, limit=page_size, bookmark=page_bookmark, **params
+                )
+
+                if response.status_code > 299:
+                    raise exc.CouchResponseError(response.status_code, response.data)
+
+                page = response.model
+                await pages.send(page)
+
+                if len(page.docs or []) < page_size or not page.bookmark:
+                    return
+
+                page_bookmark = page.bookmark
+
+        async with produce_in_background(fetch_pages, max(prefetch - 1, 0)) as pages:
+            yield FindDocsStream(pages)
@@ -1,3 +1,5 @@
+import typing
+
 from dataclasses import dataclass
 
 from async_couch.types import EmptyResponse
@@ -53,3 +55,29 @@ class ServerResponse(EmptyResponse):
     # on this string for counting the number of updates
 
     props_partitioned: models.DatabaseProps
+
+
+@dataclass
+class BulkDocsResponse(EmptyResponse):
+    results: typing.List[dict] = None
+    # Result for every document: `id` and `rev` on success, `id`, `error`
+    # and `reason` if document was rejected
+
+    @classmethod
+    def load(cls, response):
+        return cls(results=response.json())
+
+
+@dataclass
+class FindResponse(EmptyResponse):
+    docs: typing.List[dict] = None
+    # Documents matching the selector
+
+    bookmark: str = None
+    # Opaque string for the next page of results
+
+    warning: str = None
+    # Execution warnings, e.g. if no index was used
+
+    execution_stats: dict = None
+    # Execution statistics, if requested
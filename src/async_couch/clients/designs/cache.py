@@ -0,0 +1,200 @@
+import json
+import time
+import typing
+
+from dataclasses import dataclass
+
+from async_couch import types
+from async_couch.clients.designs.endpoints import view_query
+from async_couch.clients.designs.responses import ExecuteViewResponse
+from async_couch.utils.lru import LRUCache
+from async_couch.utils.response_cache import CachedResponse, ResponseCache
+
+
+@dataclass
+class CachedView(CachedResponse):
+    updated_at: float
+    """Time of last confirmation by server with updated index"""
+
+
+class ViewCache(ResponseCache):
+    """
+    Keeps results of `view_exec` and `db_all_docs` queries with their
+    ETags. Queries are identified by their parameters, so equal queries
+    share entry regardless of arguments order. Entry is served without
+    request for `ttl` seconds, after that it's revalidated with conditional
+    request: 304 response is a cache hit, otherwise the new result is stored.
+
+    If `stale_budget` is set, revalidation requests don't wait for index
+    update (`update=lazy`) until the entry was confirmed with updated index
+    `stale_budget` seconds ago. Queries which specify `update` or `stale`
+    are sent as is.
+
+    .. code-block:: python
+
+        cache = ViewCache(client, ttl=1.0, stale_budget=30.0)
+        response = await cache.view_exec("db", "ddoc", "view", group_level=1)
+    """
+
+    def __init__(
+        self,
+        client,
+        max_entries: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: float = 0.0,
+        stale_budget: float = 0.0,
+    ):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+
+        max_entries: int = 1000
+            Maximum number of cached results
+
+        max_bytes: int = 16 * 1024 * 1024
+            Maximum total size of cached results
+
+        ttl: float = 0.0
+            Seconds entry is served without revalidation. Every read is
+            revalidated by default
+
+        stale_budget: float = 0.0
+            Seconds entry can be revalidated against not updated index
+        """
+        super().__init__(client)
+        self.ttl = ttl
+        self.stale_budget = stale_budget
+        self._cache = LRUCache(max_entries, max_bytes)
+
+    async def view_exec(
+        self, db: str, des_id: str, view_name: str, **params
+    ) -> types.UniversalResponse:
+        """
+        Executes view or gets its result from cache
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        des_id: str
+            Design document name
+
+        view_name: str
+            View function name
+
+        params
+            Query parameters, same as for `view_exec`
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result
+        """
+
+        async def fetch(**extra):
+            return await self.client.view_exec(db, des_id, view_name, **params, **extra)
+
+        return await self._get((db, des_id, view_name), params, fetch)
+
+    async def db_all_docs(self, db: str, **params) -> types.UniversalResponse:
+        """
+        Executes `_all_docs` query or gets its result from cache
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        params
+            Query parameters, same as for `db_all_docs`
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result
+        """
+
+        async def fetch(**extra):
+            return await self.client.db_all_docs(db, **params, **extra)
+
+        return await self._get((db, "_all_docs"), params, fetch)
+
+    def clear(self):
+        self._cache.clear()
+
+    async def _get(
+        self,
+        target: tuple,
+        params: dict,
+        fetch: typing.Callable[..., typing.Awaitable[types.UniversalResponse]],
+    ) -> types.UniversalResponse:
+        key = target + (self.query_key(params),)
+        entry: CachedView | None = self._cache.get(key)
+        now = time.monotonic()
+
+        if entry is not None and entry.is_fresh(self.ttl):
+            return self._hit(entry, ExecuteViewResponse)
+
+        extra = dict()
+
+        if entry is not None:
+            extra["if_none_match"] = entry.etag
+
+        lazy = (
+            entry is not None
+            and now - entry.updated_at < self.stale_budget
+            and not {"update", "stale"} & params.keys()
+        )
+
+        if lazy:
+            extra["update"] = "lazy"
+
+        response = await fetch(**extra)
+        now = time.monotonic()
+
+        if response.status_code == 304 and entry is not None:
+            entry.validated_at = now
+
+            if not lazy:
+                entry.updated_at = now
+
+            return self._hit(entry, ExecuteViewResponse)
+
+        self.misses += 1
+        etag = response.headers.get("etag")
+
+        if etag and self.is_cacheable(response):
+            updated_at = entry.updated_at if lazy else now
+            entry = CachedView(etag, response.data, now, updated_at)
+            self._cache.set(key, entry, len(response.data))
+        else:
+            self._cache.pop(key)
+
+        return response
+
+    def query_key(self, params: dict) -> str:
+        """
+        Canonical representation of query parameters. Defaults are
+        omitted and names are sorted
+
+        Parameters
+        ----------
+        params: dict
+            Query parameters
+
+        Returns
+        ----------
+        str
+            Cache key of query
+        """
+        query = view_query(
+            **{
+                name: value
+                for name, value in params.items()
+                if name not in ("keys_chunk_size", "concurrency")
+            }
+        )
+        return json.dumps(query, sort_keys=True, separators=(",", ":"), default=str)
@@ -1,6 +1,326 @@
-from async_couch import types
+import contextlib
+import dataclasses
+import typing
+
+import anyio
+
+from async_couch import exc, types
+from async_couch.codecs import JsonCodec, default_codec
 from async_couch.clients.designs import responses as resp
 from async_couch.http_clients.base_client import BaseEndpoint
+from async_couch.utils.json_stream import JsonArrayParser, JsonRowStream
+from async_couch.utils.streams import gather_in_background, produce_in_background
+
+
+json_query_params = ("key", "keys", "start_key", "end_key")
+"""View query parameters which values must be JSON encoded"""
+
+keys_post_threshold = 2048
+"""Size of JSON encoded `keys` after which they are sent in POST body"""
+
+
+def view_query(
+    conflicts: bool = False,
+    descending: bool = False,
+    end_key: typing.Any = None,
+    end_key_doc_id: str = None,
+    group: bool = False,
+    group_level: int = None,
+    include_docs: bool = False,
+    attachments: bool = False,
+    att_encoding_info: bool = False,
+    inclusive_end: bool = True,
+    key: typing.Any = None,
+    keys: list = None,
+    limit: int = None,
+    reduce: bool = True,
+    skip: int = 0,
+    sort: bool = True,
+    stable: bool = False,
+    stale: str = None,
+    start_key: typing.Any = None,
+    start_key_doc_id: str = None,
+    update: bool | str = True,
+    update_seq: bool = False,
+) -> dict:
+    """
+    Collect view query parameters which differ from CouchDB defaults. See
+    `DesignViewEndpoint.view_exec` for parameters description
+
+    Returns
+    ----------
+    dict
+        Query parameters with raw (not JSON encoded) values
+    """
+    query = dict()
+
+    if conflicts:
+        query["conflicts"] = conflicts
+
+    if descending:
+        query["descending"] = descending
+
+    if end_key is not None:
+        query["end_key"] = end_key
+
+    if end_key_doc_id:
+        query["end_key_doc_id"] = end_key_doc_id
+
+    if group:
+        query["group"] = group
+
+    if group_level is not None:
+        query["group_level"] = group_level
+
+    if include_docs:
+        query["include_docs"] = include_docs
+
+    if attachments:
+        query["attachments"] = attachments
+
+    if att_encoding_info:
+        query["att_encoding_info"] = att_encoding_info
+
+    if not inclusive_end:
+        query["inclusive_end"] = inclusive_end
+
+    if key is not None:
+        query["key"] = key
+
+    if keys is not None:
+        query["keys"] = keys
+
+    if limit is not None:
+        query["limit"] = limit
+
+    if not reduce:
+        query["reduce"] = reduce
+
+    if skip:
+        query["skip"] = skip
+
+    if not sort:
+        query["sorted"] = sort
+
+    if stable:
+        query["stable"] = stable
+
+    if stale:
+        query["stale"] = stale
+
+    if start_key is not None:
+        query["start_key"] = start_key
+
+    if start_key_doc_id:
+        query["start_key_doc_id"] = start_key_doc_id
+
+    if update is not True:
+        query["update"] = update
+
+    if update_seq:
+        query["update_seq"] = update_seq
+
+    return query
+
+
+def encode_view_query(query: dict, codec: JsonCodec = default_codec) -> dict:
+    """
+    Prepare view parameters for query string: keys are sent as JSON
+
+    Parameters
+    ----------
+    query: dict
+        Result of `view_query`
+
+    codec: JsonCodec = default_codec
+        Codec for keys encoding
+
+    Returns
+    ----------
+    dict
+        Query string parameters
+    """
+    encoded = dict(query)
+
+    for name in json_query_params:
+        if name in encoded:
+            encoded[name] = codec.dumps(encoded[name]).decode()
+
+    return encoded
+
+
+def view_queries_body(queries: typing.Iterable[dict]) -> dict:
+    """
+    Build body of multi-query request
+
+    Parameters
+    ----------
+    queries: typing.Iterable[dict]
+        Query parameters of every query, same as for `view_exec`
+
+    Returns
+    ----------
+    dict
+        Request body with raw keys
+    """
+    return {"queries": [view_query(**params) for params in queries]}
+
+
+def merge_view_responses(
+    responses: typing.Sequence[types.UniversalResponse],
+) -> types.UniversalResponse:
+    """
+    Join results of view queries made for consecutive chunks of `keys`
+
+    Parameters
+    ----------
+    responses: typing.Sequence[types.UniversalResponse]
+        Responses in order of keys chunks
+
+    Returns
+    ----------
+    types.UniversalResponse
+        First failed response or response with rows of all responses. Body
+        of joined response is not kept, only its model
+    """
+    for response in responses:
+        if response.status_code != 200:
+            return response
+
+    first = responses[0]
+
+    if len(responses) == 1:
+        return first
+
+    rows = [row for response in responses for row in response.model.rows]
+
+    return types.UniversalResponse(
+        status_code=first.status_code,
+        headers=first.headers,
+        data=None,
+        model=dataclasses.replace(first.model, rows=rows),
+        codec=first.codec,
+    )
+
+
+async def load_columns(rows: JsonRowStream) -> resp.ColumnarViewResponse:
+    """
+    Collect streamed view rows into columns
+
+    Parameters
+    ----------
+    rows: JsonRowStream
+        Rows of view or `_all_docs` response
+
+    Returns
+    ----------
+    resp.ColumnarViewResponse
+        Columns of ids, keys and values
+    """
+    result = resp.ColumnarViewResponse()
+
+    async for row in rows:
+        result.append(row)
+
+    result.total_rows = rows.meta.get("total_rows")
+    result.offset = rows.meta.get("offset")
+    result.update_seq = rows.meta.get("update_seq")
+    return result
+
+
+def group_split_points(
+    split_points: typing.Sequence[typing.Tuple[typing.Any, str | None]],
+    group_level: int,
+    descending: bool = False,
+) -> typing.List[typing.Tuple[typing.Any, str | None]]:
+    """
+    Move split points to bounds of `group_level` groups. Array keys are cut
+    to group prefix, in descending order the prefix is followed by `{}`
+    which sorts after any key of the group. Document IDs are dropped
+
+    Parameters
+    ----------
+    split_points: typing.Sequence[typing.Tuple[typing.Any, str | None]]
+        Keys and document IDs in order of view output
+
+    group_level: int
+        Number of key components which form a group
+
+    descending: bool = False
+        Whether view is read in descending order
+
+    Returns
+    ----------
+    typing.List[typing.Tuple[typing.Any, str | None]]
+        Unique group bounds in order of view output
+    """
+    points = []
+
+    for key, _ in split_points:
+        if isinstance(key, list):
+            key = key[:group_level] + [{}] if descending else key[:group_level]
+
+        if not points or points[-1][0] != key:
+            points.append((key, None))
+
+    return points
+
+
+def split_view_query(
+    query: dict, split_points: typing.Sequence[typing.Tuple[typing.Any, str | None]]
+) -> typing.List[dict]:
+    """
+    Split view key range into adjacent sub-ranges. Every split point starts
+    a sub-range and ends the previous one exclusively, so each row belongs
+    to exactly one sub-range. With `group_level` array keys of split points
+    are cut to group prefix, so every group belongs to one sub-range too
+
+    Parameters
+    ----------
+    query: dict
+        Result of `view_query`
+
+    split_points: typing.Sequence[typing.Tuple[typing.Any, str | None]]
+        Keys and document IDs in order of view output. Document ID splits
+        rows with equal keys, if it's None split is done by key only
+
+    Returns
+    ----------
+    typing.List[dict]
+        Query of every sub-range in order of view output
+    """
+    group_level = query.get("group_level")
+
+    if group_level is not None:
+        split_points = group_split_points(
+            split_points, group_level, query.get("descending", False)
+        )
+
+    bounds = [None, *split_points, None]
+    queries = []
+
+    for lower, upper in zip(bounds, bounds[1:]):
+        # Keys may be null, so they are set directly instead of view_query
+        part = dict(query)
+
+        if lower is not None:
+            part["start_key"] = lower[0]
+            part.pop("start_key_doc_id", None)
+
+            if lower[1] is not None:
+                part["start_key_doc_id"] = lower[1]
+
+        if upper is not None:
+            part["end_key"] = upper[0]
+            part["inclusive_end"] = False
+            part.pop("end_key_doc_id", None)
+
+            if upper[1] is not None:
+                part["end_key_doc_id"] = upper[1]
+
+        queries.append(part)
+
+    return queries
 
 
 class DesignDocEndpoint(BaseEndpoint):
@@ -56,6 +376,18 @@ class DesignViewEndpoint(BaseEndpoint):
     __des_view_endpoint__ = "/{db}/_design/{des_id}/_view/{view_name}"
     """Design view endpoint"""
 
+    __des_view_statuses__ = {
+        200: "Request completed successfully",
+        304: "View result wasn’t modified since specified ETag",
+        400: "Invalid request",
+        401: "Read privilege required",
+        404: "Specified database, design document or view is missed",
+    }
+    """Design view response statuses"""
+
+    __des_view_queries_endpoint__ = "/{db}/_design/{des_id}/_view/{view_name}/queries"
+    """Design view multi-query endpoint"""
+
     async def view_exec(
         self,
         db: str,
@@ -83,11 +415,19 @@ class DesignViewEndpoint(BaseEndpoint):
         start_key_doc_id: str = None,
         update: bool = True,
         update_seq: bool = False,
+        keys_chunk_size: int = 10000,
+        concurrency: int = 4,
+        if_none_match: str = None,
     ) -> types.UniversalResponse:
         """
         Executes the specified view function from the specified
         design document.
 
+        Long `keys` lists are sent in POST body instead of query string.
+        Lists longer than `keys_chunk_size` are split into chunks queried
+        concurrently, rows are joined in order of keys. Chunking is not
+        used with `limit` or `skip`
+
         Parameters
         ----------
         db
@@ -184,6 +524,16 @@ class DesignViewEndpoint(BaseEndpoint):
             Whether to include in the response an update_seq value indicating
             the sequence id of the database the view reflects
 
+        keys_chunk_size: int = 10000
+            Maximum number of keys per request
+
+        concurrency: int = 4
+            Maximum number of concurrent requests for keys chunks
+
+        if_none_match: str = None
+            ETag of previous result. If it's still actual, 304 is returned
+            without body. Not sent if keys are split into chunks
+
         Returns
         ----------
         `UniversalResponse`
@@ -194,84 +544,558 @@ class DesignViewEndpoint(BaseEndpoint):
         exc.CouchResponseError:
             If server error occurred
         """
-        query = dict()
-
-        if conflicts:
-            query["conflicts"] = conflicts
+        query = view_query(
+            conflicts=conflicts,
+            descending=descending,
+            end_key=end_key,
+            end_key_doc_id=end_key_doc_id,
+            group=group,
+            group_level=group_level,
+            include_docs=include_docs,
+            attachments=attachments,
+            att_encoding_info=att_encoding_info,
+            inclusive_end=inclusive_end,
+            key=key,
+            keys=keys,
+            limit=limit,
+            reduce=reduce,
+            skip=skip,
+            sort=sort,
+            stable=stable,
+            stale=stale,
+            start_key=start_key,
+            start_key_doc_id=start_key_doc_id,
+            update=update,
+            update_seq=update_seq,
+        )
 
-        if descending:
-            query["descending"] = descending
+        path = {"db": db, "des_id": des_id, "view_name": view_name}
+        encoded = encode_view_query(query, self.http_client.codec)
 
-        if end_key:
-            query["end_key"] = end_key
+        headers = {"If-None-Match": if_none_match} if if_none_match else None
 
-        if end_key_doc_id:
-            query["end_key_doc_id"] = end_key_doc_id
+        if len(encoded.get("keys", "")) <= keys_post_threshold:
+            return await self.http_client.make_request(
+                endpoint=self.__des_view_endpoint__,
+                method=types.HttpMethod.GET,
+                statuses=self.__des_view_statuses__,
+                query=encoded,
+                path=path,
+                headers=headers,
+                response_model=resp.ExecuteViewResponse,
+            )
 
-        if group:
-            query["group"] = group
+        del encoded["keys"]
+        keys = query["keys"]
 
-        if group_level:
-            query["group_level"] = group_level
+        if limit is not None or skip:
+            chunks = [keys]
+        else:
+            chunks = [
+                keys[i : i + keys_chunk_size]
+                for i in range(0, len(keys), keys_chunk_size)
+            ]
 
-        if include_docs:
-            query["include_docs"] = include_docs
+        if len(chunks) > 1:
+            headers = None
 
-        if attachments:
-            query["attachments"] = attachments
+        limiter = anyio.CapacityLimiter(concurrency)
 
-        if att_encoding_info:
-            query["att_encoding_info"] = att_encoding_info
+        def fetch_chunk(chunk):
+            async def fetch(send):
+                async with limiter:
+                    response = await self.http_client.make_request(
+                        endpoint=self.__des_view_endpoint__,
+                        method=types.HttpMethod.POST,
+                        statuses=self.__des_view_statuses__,
+                        query=encoded,
+                        path=path,
+                        headers=headers,
+                        json_data={"keys": chunk},
+                        response_model=resp.ExecuteViewResponse,
+                    )
 
-        if not inclusive_end:
-            query["inclusive_end"] = inclusive_end
+                await send.send(response)
 
-        if key:
-            query["key"] = f'"{key}"'
+            return fetch
 
-        if keys:
-            query["keys"] = keys
+        producers = [fetch_chunk(chunk) for chunk in chunks]
 
-        if limit:
-            query["limit"] = limit
+        async with gather_in_background(producers, 1, ordered=True) as responses:
+            return merge_view_responses([response async for response in responses])
 
-        if not reduce:
-            query["reduce"] = reduce
+    async def view_queries(
+        self,
+        db: str,
+        des_id: str,
+        view_name: str,
+        queries: typing.Sequence[dict],
+    ) -> types.UniversalResponse:
+        """
+        Executes several queries of the same view in one request
 
-        if skip:
-            query["skip"] = skip
+        .. code-block:: python
 
-        if not sort:
-            query["sorted"] = sort
+            response = await client.view_queries(
+                db, "ddoc", "view", [dict(key=1), dict(keys=[2, 3], limit=10)]
+            )
 
-        if stable:
-            query["stable"] = stable
+            for result in response.model.results:
+                ...
 
-        if stale:
-            query["stale"] = stale
+        Parameters
+        ----------
+        db
+            Database name
 
-        if start_key:
-            query["start_key"] = start_key
+        des_id
+            Design document name
 
-        if start_key_doc_id:
-            query["start_key_doc_id"] = start_key_doc_id
+        view_name
+            View function name
 
-        if update != "true":
-            query["update"] = update
+        queries: typing.Sequence[dict]
+            Query parameters of every query, same as for `view_exec`
 
-        if update_seq:
-            query["update_seq"] = update_seq
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result, model is `ExecuteViewQueriesResponse` with
+            result of every query in order of `queries`
 
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
         return await self.http_client.make_request(
+            endpoint=self.__des_view_queries_endpoint__,
+            method=types.HttpMethod.POST,
+            statuses=self.__des_view_statuses__,
+            path={"db": db, "des_id": des_id, "view_name": view_name},
+            json_data=view_queries_body(queries),
+            response_model=resp.ExecuteViewQueriesResponse,
+        )
+
+    @contextlib.asynccontextmanager
+    async def view_stream(
+        self, db: str, des_id: str, view_name: str, **params
+    ) -> typing.AsyncIterator[JsonRowStream]:
+        """
+        Executes the specified view function and decodes rows one by one
+        while the response body arrives, so memory usage doesn't depend on
+        the view size. Must be used as async context manager, connection is
+        released on exit.
+
+        .. code-block:: python
+
+            async with client.view_stream(db, "ddoc", "view") as rows:
+                async for row in rows:
+                    ...
+
+            total_rows = rows.meta.get("total_rows")
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        des_id
+            Design document name
+
+        view_name
+            View function name
+
+        params
+            Query parameters, same as for `view_exec`. Long `keys` lists are
+            sent in POST body
+
+        Returns
+        ----------
+        `JsonRowStream`
+            Async iterator over view rows
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        query = encode_view_query(view_query(**params), self.http_client.codec)
+        method, json_data = types.HttpMethod.GET, None
+
+        if len(query.get("keys", "")) > keys_post_threshold:
+            method, json_data = types.HttpMethod.POST, {"keys": params["keys"]}
+            del query["keys"]
+
+        async with self.http_client.stream_request(
             endpoint=self.__des_view_endpoint__,
-            method=types.HttpMethod.GET,
-            statuses={
-                200: "Request completed successfully",
-                400: "Invalid request",
-                401: "Read privilege required",
-                404: "Specified database, design document or view is missed",
-            },
+            method=method,
+            statuses=self.__des_view_statuses__,
             query=query,
             path={"db": db, "des_id": des_id, "view_name": view_name},
-            response_model=resp.ExecuteViewResponse,
+            json_data=json_data,
+        ) as response:
+            yield JsonRowStream(response, loads=self.http_client.codec.loads)
+
+    async def view_columns(
+        self, db: str, des_id: str, view_name: str, **params
+    ) -> resp.ColumnarViewResponse:
+        """
+        Executes the specified view function and decodes rows into
+        columns while the response body arrives. Numeric keys and values
+        are kept in compact arrays, array keys are split into column per
+        component, document IDs are kept in a table of distinct strings, so
+        memory usage is a fraction of `view_exec` rows. Suits reduce
+        queries with many numeric rows.
+
+        .. code-block:: python
+
+            result = await client.view_columns(db, "ddoc", "view", group_level=2)
+            years = result.keys.components[0].numpy()
+            totals = result.values.numpy()
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        des_id
+            Design document name
+
+        view_name
+            View function name
+
+        params
+            Query parameters, same as for `view_exec`
+
+        Returns
+        ----------
+        `ColumnarViewResponse`
+            Columns of ids, keys and values
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        async with self.view_stream(db, des_id, view_name, **params) as rows:
+            return await load_columns(rows)
+
+    @contextlib.asynccontextmanager
+    async def view_paginate(
+        self,
+        db: str,
+        des_id: str,
+        view_name: str,
+        page_size: int = 1000,
+        prefetch: int = 1,
+        **params,
+    ) -> typing.AsyncIterator[typing.AsyncIterator[dict]]:
+        """
+        Iterates over view rows page by page. Pages are requested by seeking
+        with `start_key` and `start_key_doc_id` of the first row of the next
+        page instead of `skip`, so every page costs the same regardless of
+        its depth. Next pages are requested while the caller processes the
+        current one. Must be used as async context manager.
+
+        .. code-block:: python
+
+            async with client.view_paginate(db, "ddoc", "view") as rows:
+                async for row in rows:
+                    ...
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        des_id
+            Design document name
+
+        view_name
+            View function name
+
+        page_size: int = 1000
+            Number of rows per request
+
+        prefetch: int = 1
+            Number of pages requested ahead of the caller
+
+        params
+            Query parameters, same as for `view_exec` except of `skip`,
+            `limit` and `keys`
+
+        Returns
+        ----------
+        typing.AsyncIterator[dict]
+            View rows
+
+        Raises
+        ----------
+        ValueError:
+            If `skip`, `limit` or `keys` is passed
+
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        if {"skip", "limit", "keys"} & params.keys():
+            raise ValueError("skip, limit and keys are not supported by pagination")
+
+        async def fetch_pages(pages):
+            query = view_query(limit=page_size + 1, **params)
+
+            while True:
+                response = await self.http_client.make_request(
+                    endpoint=self.__des_view_endpoint__,
+                    method=types.HttpMethod.GET,
+                    statuses=self.__des_view_statuses__,
+                    query=encode_view_query(query, self.http_client.codec),
+                    path={"db": db, "des_id": des_id, "view_name": view_name},
+                    response_model=resp.ExecuteViewResponse,
+                )
+
+                if response.status_code > 299:
+                    raise exc.CouchResponseError(response.status_code, response.data)
+
+                rows = response.model.rows or []
+
+                if len(rows) <= page_size:
+                    await pages.send(rows)
+                    return
+
+                await pages.send(rows[:page_size])
+
+                # Key may be null, so it's set directly instead of view_query
+                next_row = rows[page_size]
+                query["start_key"] = next_row["key"]
+                query.pop("start_key_doc_id", None)
+
+                if next_row.get("id") is not None:
+                    query["start_key_doc_id"] = next_row["id"]
+
+        async with produce_in_background(fetch_pages, max(prefetch - 1, 0)) as pages:
+            yield (row async for page in pages for row in page)
+
+    @contextlib.asynccontextmanager
+    async def view_scan(
+        self,
+        db: str,
+        des_id: str,
+        view_name: str,
+        partitions: int = 4,
+        split_keys: typing.Sequence[typing.Any] = None,
+        ordered: bool = False,
+        buffer: int = 16,
+        **params,
+    ) -> typing.AsyncIterator[typing.AsyncIterator[dict]]:
+        """
+        Scans the view with several concurrent requests. Key range is split
+        into sub-ranges by `split_keys` or by keys sampled from the view,
+        every sub-range is streamed by its own request. With cluster http
+        client requests are spread across nodes by its balancer. Must be
+        used as async context manager.
+
+        .. code-block:: python
+
+            async with client.view_scan(db, "ddoc", "view", 8, reduce=False) as rows:
+                async for row in rows:
+                    ...
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        des_id
+            Design document name
+
+        view_name
+            View function name
+
+        partitions: int = 4
+            Number of sub-ranges if `split_keys` are not passed. Split
+            points are taken at equal offsets of the view, which costs one
+            request per point
+
+        split_keys: typing.Sequence[typing.Any] = None
+            Keys which start sub-ranges, in order of view output
+
+        ordered: bool = False
+            Yield rows in view order. Sub-ranges are still requested
+            concurrently, rows of next sub-ranges are buffered. Otherwise
+            rows are yielded as soon as they are received
+
+        buffer: int = 16
+            Number of received chunks of rows buffered per sub-range if
+            `ordered`, in total otherwise
+
+        params
+            Query parameters, same as for `view_exec` except of `skip`,
+            `limit`, `key` and `keys`. One of `reduce=False`, `group=True`
+            or `group_level` is required, so no reduction spans several
+            sub-ranges. Sampled split points split rows with equal keys by
+            document ID only if `reduce=False` is passed
+
+        Returns
+        ----------
+        typing.AsyncIterator[dict]
+            View rows
+
+        Raises
+        ----------
+        ValueError:
+            If `skip`, `limit`, `key` or `keys` is passed, or if the scan
+            would reduce across sub-ranges
+
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        if {"skip", "limit", "key", "keys"} & params.keys():
+            raise ValueError("skip, limit, key and keys are not supported by scan")
+
+        query = view_query(**params)
+
+        # group_level=0 reduces all rows, like no grouping
+        grouped = query.get("group") or query.get("group_level")
+
+        if query.get("reduce", True) and not grouped:
+            raise ValueError("Scan requires reduce=False, group=True or group_level")
+
+        path = {"db": db, "des_id": des_id, "view_name": view_name}
+        codec = self.http_client.codec
+
+        if split_keys is not None:
+            split_points = [(key, None) for key in split_keys]
+        else:
+            split_points = await self.view_split_points(
+                db, des_id, view_name, partitions, **params
+            )
+
+        def scan_partition(partition_query):
+            async def scan(send):
+                async with self.http_client.stream_request(
+                    endpoint=self.__des_view_endpoint__,
+                    method=types.HttpMethod.GET,
+                    statuses=self.__des_view_statuses__,
+                    query=encode_view_query(partition_query, codec),
+                    path=path,
+                ) as response:
+                    parser = JsonArrayParser(loads=codec.loads)
+
+                    async for chunk in response.data:
+                        rows = parser.feed(chunk)
+
+                        if rows:
+                            await send.send(rows)
+
+            return scan
+
+        producers = [
+            scan_partition(part) for part in split_view_query(query, split_points)
+        ]
+
+        async with gather_in_background(producers, buffer, ordered) as chunks:
+            yield (row async for rows in chunks for row in rows)
+
+    async def view_split_points(
+        self, db: str, des_id: str, view_name: str, partitions: int, **params
+    ) -> typing.List[typing.Tuple[typing.Any, str | None]]:
+        """
+        Sample keys which split view range into parts of about equal size.
+        Size of the range is calculated from offsets of its bounds, split
+        rows are requested concurrently with `skip`
+
+        Parameters
+        ----------
+        db
+            Database name
+
+        des_id
+            Design document name
+
+        view_name
+            View function name
+
+        partitions: int
+            Number of parts
+
+        params
+            Query parameters of the scan, only range parameters are used
+
+        Returns
+        ----------
+        typing.List[typing.Tuple[typing.Any, str | None]]
+            Unique keys and document IDs in order of view output. Document
+            ID is None unless `reduce=False` is passed
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        range_params = (
+            "descending",
+            "start_key",
+            "start_key_doc_id",
+            "stable",
+            "stale",
+            "update",
         )
+        query = view_query(**params)
+        sample_query = {name: query[name] for name in range_params if name in query}
+        sample_query["reduce"] = False
+        by_doc_id = query.get("reduce") is False
+
+        async def fetch(fetch_query: dict) -> dict:
+            response = await self.http_client.make_request(
+                endpoint=self.__des_view_endpoint__,
+                method=types.HttpMethod.GET,
+                statuses=self.__des_view_statuses__,
+                query=encode_view_query(fetch_query, self.http_client.codec),
+                path={"db": db, "des_id": des_id, "view_name": view_name},
+            )
+
+            if response.status_code > 299:
+                raise exc.CouchResponseError(response.status_code, response.data)
+
+            return response.json()
+
+        first = await fetch({**sample_query, "limit": 0})
+        start, end = first.get("offset") or 0, first.get("total_rows") or 0
+
+        if "end_key" in query:
+            bound = {**sample_query, "start_key": query["end_key"], "limit": 0}
+            bound.pop("start_key_doc_id", None)
+
+            if "end_key_doc_id" in query:
+                bound["start_key_doc_id"] = query["end_key_doc_id"]
+
+            end = (await fetch(bound)).get("offset") or start
+
+        span = end - start
+
+        def sample(offset):
+            async def fetch_row(send):
+                row_query = {**sample_query, "skip": offset, "limit": 1}
+                rows = (await fetch(row_query))["rows"]
+
+                if rows:
+                    await send.send((offset, rows[0]))
+
+            return fetch_row
+
+        offsets = [span * i // partitions for i in range(1, partitions)]
+        offsets = sorted({offset for offset in offsets if offset > 0})
+
+        async with gather_in_background([sample(offset) for offset in offsets]) as rows:
+            samples = sorted([item async for item in rows], key=lambda item: item[0])
+
+        split_points = []
+
+        for _, row in samples:
+            point = (row["key"], row["id"] if by_doc_id else None)
+
+            if not split_points or split_points[-1] != point:
+                split_points.append(point)
+
+        return split_points
@@ -1,7 +1,8 @@
 import typing
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from async_couch.types import EmptyResponse
+from async_couch.utils.columnar import Column, KeyColumn, StringTable
 
 
 @dataclass
@@ -79,3 +80,70 @@ class ExecuteViewResponse(EmptyResponse):
 
     update_seq: dict = None
     """Current update sequence for the database."""
+
+
+@dataclass
+class ExecuteViewQueriesResponse(EmptyResponse):
+    results: typing.List[ExecuteViewResponse] = None
+    """Result of every query in order of request"""
+
+    @classmethod
+    def load(cls, response):
+        results = response.json()["results"]
+        return cls(results=[ExecuteViewResponse(**result) for result in results])
+
+
+@dataclass
+class ColumnarViewResponse:
+    ids: StringTable = field(default_factory=StringTable)
+    """Document ID of every row, None for reduced rows"""
+
+    keys: KeyColumn = field(default_factory=KeyColumn)
+    """Key of every row, array keys are split into components"""
+
+    values: Column = field(default_factory=Column)
+    """Value of every row, compact array for numeric values"""
+
+    total_rows: int = None
+    """Number of documents in the database/view"""
+
+    offset: int = None
+    """Offset where the document list started"""
+
+    update_seq: dict = None
+    """Current update sequence for the database."""
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def append(self, row: dict):
+        self.ids.append(row.get("id"))
+        self.keys.append(row.get("key"))
+        self.values.append(row.get("value"))
+
+    def columns(self) -> typing.Dict[str, Column | StringTable]:
+        """
+        Columns by name: `id`, `key` or `key_0`, `key_1`... for components
+        of array keys, and `value`
+
+        .. code-block:: python
+
+            frame = pandas.DataFrame(
+                {name: column.numpy() for name, column in result.columns().items()}
+            )
+
+        Returns
+        ----------
+        typing.Dict[str, Column | StringTable]
+            Columns in order of row fields
+        """
+        columns = {"id": self.ids}
+
+        if self.keys.split:
+            for index, component in enumerate(self.keys.components):
+                columns[f"key_{index}"] = component
+        else:
+            columns["key"] = self.keys.column
+
+        columns["value"] = self.values
+        return columns
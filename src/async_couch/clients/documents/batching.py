@@ -0,0 +1,192 @@
+import typing
+
+from async_couch import exc, types
+from async_couch.clients.database.responses import DocumentCreated
+from async_couch.clients.documents.responses import DocumentDetailedResponse
+from async_couch.utils.batching import BatchCollector
+
+
+class DocReadCoalescer:
+    """
+    Collects concurrent `doc_get` calls and fetches documents of the same
+    database with a single `_all_docs?include_docs=true` request. Every
+    caller receives own `UniversalResponse` with `DocumentDetailedResponse`
+    model, or 404 with `CouchDbError` model if document is missing or
+    deleted. Response body isn't kept, `data` is None.
+
+    .. code-block:: python
+
+        loader = DocReadCoalescer(client)
+        response = await loader.doc_get("db", "doc_id")
+    """
+
+    def __init__(self, client, window: float = 0.002, max_batch: int = 100):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+
+        window: float = 0.002
+            Seconds to collect doc ids before request is sent
+
+        max_batch: int = 100
+            Maximum number of doc ids per request
+        """
+        self.client = client
+        self._collector = BatchCollector(
+            self._fetch, window=window, max_items=max_batch
+        )
+
+    async def doc_get(self, db: str, doc_id: str) -> types.UniversalResponse:
+        """
+        Gets document, batched with concurrent calls
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc_id: str
+            Document id
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result
+        """
+        return await self._collector.submit(db, doc_id)
+
+    async def _fetch(
+        self, db: str, doc_ids: typing.List[str]
+    ) -> typing.List[types.UniversalResponse]:
+        response = await self.client.db_all_docs(
+            db, keys=list(dict.fromkeys(doc_ids)), include_docs=True
+        )
+
+        if response.status_code != 200:
+            return [response] * len(doc_ids)
+
+        rows = {row.get("key"): row for row in response.model.rows}
+        return [self._to_response(rows.get(doc_id)) for doc_id in doc_ids]
+
+    @staticmethod
+    def _to_response(row: dict | None) -> types.UniversalResponse:
+        doc = row.get("doc") if row else None
+
+        if not doc:
+            reason = "deleted" if row and row.get("value") else "missing"
+            return types.UniversalResponse(
+                status_code=404,
+                headers=dict(),
+                data=None,
+                model=types.CouchDbError(error="not_found", reason=reason),
+            )
+
+        return types.UniversalResponse(
+            status_code=200,
+            headers={"etag": f'"{doc.get("_rev")}"'},
+            data=None,
+            model=DocumentDetailedResponse.from_dict(doc),
+        )
+
+
+class DocWriteBatcher:
+    """
+    Buffers single document writes per database and stores them with one
+    `_bulk_docs` request when `max_docs`, `max_bytes` or `flush_interval`
+    is reached. Every caller receives `DocumentCreated` with id and rev of
+    own document or `exc.BulkDocumentError` if it was rejected (conflict,
+    forbidden, etc.)
+
+    .. code-block:: python
+
+        writer = DocWriteBatcher(client)
+        result = await writer.save("db", {"_id": "doc_id", "val": 1})
+    """
+
+    def __init__(
+        self,
+        client,
+        flush_interval: float = 0.05,
+        max_docs: int = 500,
+        max_bytes: int = 4 * 1024 * 1024,
+    ):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+
+        flush_interval: float = 0.05
+            Seconds to collect documents before request is sent
+
+        max_docs: int = 500
+            Maximum number of documents per request
+
+        max_bytes: int = 4 * 1024 * 1024
+            Maximum size of encoded documents per request. Should be less
+            than `max_http_request_size` of the server
+        """
+        self.client = client
+        self._collector = BatchCollector(
+            self._flush,
+            window=flush_interval,
+            max_items=max_docs,
+            max_size=max_bytes,
+            size_of=len,
+        )
+
+    async def save(self, db: str, doc: dict, doc_id: str = None) -> DocumentCreated:
+        """
+        Creates or updates document, batched with concurrent calls
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc: dict
+            Document data. Must contain `_rev` to update existing document
+
+        doc_id: str = None
+            Document id, `_id` of document or generated id is used if not set
+
+        Returns
+        ----------
+        `DocumentCreated`
+            Document id and new revision
+
+        Raises
+        ----------
+        exc.BulkDocumentError:
+            If document was rejected
+
+        exc.CouchResponseError:
+            If whole request failed
+        """
+        if doc_id is not None:
+            doc = {**doc, "_id": doc_id}
+
+        return await self._collector.submit(
+            db, self.client.http_client.codec.dumps(doc)
+        )
+
+    async def _flush(
+        self, db: str, docs: typing.List[bytes]
+    ) -> typing.List[DocumentCreated | exc.BulkDocumentError]:
+        response = await self.client.db_bulk_docs(db, docs)
+
+        if response.status_code > 299:
+            raise exc.CouchResponseError(response.status_code, response.data)
+
+        return [self._to_result(result) for result in response.model.results]
+
+    @staticmethod
+    def _to_result(result: dict) -> DocumentCreated | exc.BulkDocumentError:
+        if "error" in result:
+            return exc.BulkDocumentError(
+                result.get("id"), result["error"], result.get("reason")
+            )
+
+        return DocumentCreated(id=result["id"], ok=True, rev=result.get("rev"))
@@ -0,0 +1,137 @@
+import inspect
+import time
+
+from async_couch import types
+from async_couch.clients.documents.responses import DocumentDetailedResponse
+from async_couch.utils.lru import LRUCache
+from async_couch.utils.response_cache import CachedResponse, ResponseCache
+
+
+class DocCache(ResponseCache):
+    """
+    Keeps last received version of documents with their ETags. Entry is
+    served without request for `ttl` seconds, after that it's revalidated
+    with conditional GET: 304 response is a cache hit, otherwise the new
+    version is stored. Entries are kept encoded, every caller receives own
+    decoded `DocumentDetailedResponse`.
+
+    .. code-block:: python
+
+        cache = DocCache(client, max_entries=10000, ttl=1.0)
+        response = await cache.doc_get("db", "doc_id")
+    """
+
+    def __init__(
+        self,
+        client,
+        max_entries: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: float = 0.0,
+    ):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+
+        max_entries: int = 1000
+            Maximum number of cached documents
+
+        max_bytes: int = 16 * 1024 * 1024
+            Maximum total size of cached documents
+
+        ttl: float = 0.0
+            Seconds entry is served without revalidation. Every read is
+            revalidated by default
+        """
+        super().__init__(client)
+        self.ttl = ttl
+        self._cache = LRUCache(max_entries, max_bytes)
+
+    async def doc_get(self, db: str, doc_id: str, **params) -> types.UniversalResponse:
+        """
+        Gets document from cache or server. Requests with parameters other
+        than defaults of `doc_get` are not cached
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc_id: str
+            Document id
+
+        params
+            Query parameters, same as for `doc_get`
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Operating result
+        """
+        if self.changed_params(params):
+            return await self.client.doc_get(db, doc_id, **params)
+
+        key = (db, doc_id)
+        entry: CachedResponse | None = self._cache.get(key)
+
+        if entry is not None and entry.is_fresh(self.ttl):
+            return self._hit(entry, DocumentDetailedResponse)
+
+        response = await self.client.doc_get(
+            db, doc_id, if_none_match=entry.etag if entry else None
+        )
+
+        if response.status_code == 304 and entry is not None:
+            entry.validated_at = time.monotonic()
+            return self._hit(entry, DocumentDetailedResponse)
+
+        self.misses += 1
+        etag = response.headers.get("etag")
+
+        if etag and self.is_cacheable(response):
+            entry = CachedResponse(etag, response.data, time.monotonic())
+            self._cache.set(key, entry, len(response.data))
+        else:
+            self._cache.pop(key)
+
+        return response
+
+    def changed_params(self, params: dict) -> dict:
+        """
+        Drop parameters which are equal to defaults of `doc_get`
+
+        Parameters
+        ----------
+        params: dict
+            Parameters of `doc_get`
+
+        Returns
+        ----------
+        dict
+            Parameters which change the request
+        """
+        defaults = inspect.signature(self.client.doc_get).parameters
+
+        return {
+            name: value
+            for name, value in params.items()
+            if name not in defaults or value != defaults[name].default
+        }
+
+    def invalidate(self, db: str, doc_id: str):
+        """
+        Remove document from cache, e.g. after it's updated by this client
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc_id: str
+            Document id
+        """
+        self._cache.pop((db, doc_id))
+
+    def clear(self):
+        self._cache.clear()
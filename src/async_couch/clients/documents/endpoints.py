@@ -1,10 +1,11 @@
-try:
-    import orjson as json
-except ImportError:
-    import json
+import base64
+import contextlib
+import os
 import typing
 
-from async_couch import types
+import anyio
+
+from async_couch import exc, types
 from async_couch.http_clients.base_client import BaseEndpoint
 from async_couch.clients.database.responses import DocumentCreated
 from async_couch.clients.documents import responses as resp
@@ -13,6 +14,39 @@ from async_couch.utils.content_types import (
     MultipartRelatedAttachment,
     multipart_boundary,
 )
+from async_couch.utils.streams import (
+    ByteSource,
+    OffsetWriter,
+    byte_source,
+    iterate,
+    split_chunks,
+    track_progress,
+    write_chunks,
+)
+
+
+def range_headers(start: int, end: int = None) -> typing.Dict[str, str]:
+    """
+    Headers to request part of attachment. Compression is disabled, since
+    ranges refer to positions of uncompressed data
+
+    Parameters
+    ----------
+    start: int
+        First byte position
+
+    end: int = None
+        Last byte position, inclusive. Till the end of attachment if None
+
+    Returns
+    ----------
+    typing.Dict[str, str]
+        Request headers
+    """
+    return {
+        "Range": f"bytes={start}-{'' if end is None else end}",
+        "Accept-Encoding": "identity",
+    }
 
 
 class DocEndpoint(BaseEndpoint):
@@ -75,10 +109,12 @@ class DocEndpoint(BaseEndpoint):
         latest: bool = False,
         local_seq: bool = False,
         meta: bool = False,
-        open_revs: str = None,
+        open_revs: str | typing.List[str] = None,
         rev: str = None,
         revs: bool = False,
         revs_info: bool = False,
+        if_none_match: str = None,
+        multipart: bool = True,
     ) -> types.UniversalResponse:
         """
         Gets information about the specified database.
@@ -120,9 +156,10 @@ class DocEndpoint(BaseEndpoint):
             Acts same as specifying all conflicts, deleted_conflicts
             and revs_info query parameters
 
-        open_revs: str = None
+        open_revs: str | typing.List[str] = None
             Retrieves documents of specified leaf revisions.
-            Additionally, it accepts value as all to return all leaf revisions
+            Additionally, it accepts value as all to return all leaf revisions.
+            Response model is `DocumentRevisionsResponse`
 
         rev: str = None
             Retrieves document of specified revision
@@ -132,8 +169,31 @@ class DocEndpoint(BaseEndpoint):
 
         revs_info: bool = False
             Includes detailed information for all known document revisions
+
+        if_none_match: str = None
+            Document’s revision token (ETag). If it's still actual, 304 is
+            returned without body
+
+        multipart: bool = True
+            Receive attachments as binary parts of multipart response
+            instead of base64 strings inside JSON. Parts are placed into
+            `_files` of response model
         """
         query = dict()
+        headers = dict()
+        response_model = resp.DocumentDetailedResponse
+
+        if if_none_match:
+            headers["If-None-Match"] = if_none_match
+
+        if open_revs:
+            response_model = resp.DocumentRevisionsResponse
+
+            if multipart:
+                headers["Accept"] = "multipart/mixed"
+
+        elif multipart and (attachments or attributes_since):
+            headers["Accept"] = "multipart/related"
 
         if attachments:
             query["attachments"] = attachments
@@ -157,19 +217,22 @@ class DocEndpoint(BaseEndpoint):
             query["local_seq"] = local_seq
 
         if meta:
-            query["local_seq"] = local_seq
+            query["meta"] = meta
 
         if open_revs:
-            query["open_revs"] = local_seq
+            if not isinstance(open_revs, str):
+                open_revs = self.http_client.codec.dumps(list(open_revs)).decode()
+
+            query["open_revs"] = open_revs
 
         if rev:
-            query["rev"] = local_seq
+            query["rev"] = rev
 
         if revs:
-            query["revs"] = local_seq
+            query["revs"] = revs
 
         if revs_info:
-            query["revs_info"] = local_seq
+            query["revs_info"] = revs_info
 
         return await self.http_client.make_request(
             endpoint=self.__doc_endpoint__,
@@ -183,7 +246,8 @@ class DocEndpoint(BaseEndpoint):
             },
             query=query,
             path={"db": db, "doc_id": doc_id},
-            response_model=resp.DocumentDetailedResponse,
+            headers=headers,
+            response_model=response_model,
         )
 
     async def doc_create_or_update(
@@ -195,6 +259,8 @@ class DocEndpoint(BaseEndpoint):
         batch: str = None,
         new_edits: bool = True,
         attachments: typing.List[MultipartRelatedAttachment] = None,
+        chunk_size: int = 64 * 1024,
+        use_mmap: bool = False,
     ) -> types.UniversalResponse:
         """
         The PUT method creates a new named document, or creates a new
@@ -209,7 +275,9 @@ class DocEndpoint(BaseEndpoint):
         ----------
         attachments: List[Attachment]
             For bulk upload. In this case it should be sent as multipart
-            related
+            related. Attachments data can be bytes, path of local file,
+            file object or (async) iterable of chunks with `length` set,
+            body is streamed part by part
 
         db: str
             Database name
@@ -234,6 +302,13 @@ class DocEndpoint(BaseEndpoint):
             into the target database even if that leads to the creation
             of conflicts. Optional
 
+        chunk_size: int = 64 * 1024
+            Size of chunks read from attachment files
+
+        use_mmap: bool = False
+            Map attachment files into memory instead of reading them in a
+            worker thread
+
         Returns
         ----------
         `UniversalResponse`
@@ -243,6 +318,9 @@ class DocEndpoint(BaseEndpoint):
         ----------
         exc.CouchResponseError:
             If server error occurred
+
+        ValueError:
+            If size of some attachment is unknown
         """
         query = dict()
 
@@ -286,13 +364,16 @@ class DocEndpoint(BaseEndpoint):
             attachment_name = attachment.name.decode()
             json_data["_attachments"][attachment_name] = attachment.as_dict
 
-        json_part.data = json.dumps(json_data)
-        if isinstance(json_part.data, str):
-            json_part.data = json_part.data.encode()
+        json_part.data = self.http_client.codec.dumps(json_data)
+
+        parts = [json_part] + attachments
 
         content_type = f'multipart/related;boundary="{multipart_boundary[2:].decode()}"'
-        kwargs["data"] = MultipartRelated.dump([json_part] + attachments)
-        kwargs["headers"] = {"Content-Type": content_type}
+        kwargs["data"] = MultipartRelated.iter_dump(parts, chunk_size, use_mmap)
+        kwargs["headers"] = {
+            "Content-Type": content_type,
+            "Content-Length": str(MultipartRelated.dump_length(parts)),
+        }
 
         return await self.http_client.make_request(**kwargs)
 
@@ -429,6 +510,16 @@ class DocAttachmentEndpoint(BaseEndpoint):
     __doc_attachment_endpoint__: str = "/{db}/{doc_id}/{att_id}"
     """Attachments endpoint"""
 
+    __attachment_get_statuses__ = {
+        200: "Attachment exists",
+        206: "Requested part of attachment",
+        304: "Attachment wasn’t modified if ETag equals specified If-None-Match",
+        401: "Read privilege required",
+        404: "Specified database, document or attachment was not found",
+        416: "Requested range can’t be satisfied",
+    }
+    """Attachment reading response statuses"""
+
     async def attachment_exists(
         self, db: str, doc_id: str, attachment_id: str, rev: str = None
     ) -> types.UniversalResponse:
@@ -482,7 +573,12 @@ class DocAttachmentEndpoint(BaseEndpoint):
         )
 
     async def attachment_get(
-        self, db: str, doc_id: str, attachment_id: str, rev: str = None
+        self,
+        db: str,
+        doc_id: str,
+        attachment_id: str,
+        rev: str = None,
+        byte_range: typing.Tuple[int, int | None] = None,
     ) -> types.UniversalResponse:
         """
         Returns the file attachment associated with the document. The raw
@@ -506,6 +602,11 @@ class DocAttachmentEndpoint(BaseEndpoint):
         rev: str = None
             Actual document’s revision
 
+        byte_range: typing.Tuple[int, int | None] = None
+            First and last (inclusive) byte positions to read. Last position
+            may be None to read until the end. Attachment is requested
+            without compression, 206 is returned with requested part
+
         Returns
         ----------
         `UniversalResponse`
@@ -517,30 +618,311 @@ class DocAttachmentEndpoint(BaseEndpoint):
             If server error occurred
         """
         query = dict()
+        headers = dict()
 
         if rev:
             query["rev"] = rev
 
+        if byte_range is not None:
+            headers.update(range_headers(*byte_range))
+
         return await self.http_client.make_request(
             endpoint=self.__doc_attachment_endpoint__,
             method=types.HttpMethod.GET,
-            statuses={
-                200: "Attachment exists",
-                401: "Read privilege required",
-                404: "Specified database, document or attachment was not found",
-            },
+            statuses=self.__attachment_get_statuses__,
+            path={"db": db, "doc_id": doc_id, "att_id": attachment_id},
+            query=query,
+            headers=headers,
+        )
+
+    @contextlib.asynccontextmanager
+    async def attachment_stream(
+        self, db: str, doc_id: str, attachment_id: str, rev: str = None
+    ) -> typing.AsyncIterator[types.UniversalResponse]:
+        """
+        Same as `attachment_get`, but the attachment isn't buffered: `data`
+        of yielded response is an async iterator over its chunks, already
+        decompressed if the server sent it with `Content-Encoding`. Must be
+        used as async context manager, connection is released on exit.
+
+        .. code-block:: python
+
+            async with client.attachment_stream(db, doc_id, "video") as response:
+                async for chunk in response.data:
+                    ...
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc_id: str
+            Document id
+
+        attachment_id: str
+            Attachment name
+
+        rev: str = None
+            Actual document’s revision
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Response with async iterator over attachment chunks
+
+        Raises
+        ----------
+        exc.UnexpectedStatusCode:
+            If response status is not expected
+
+        exc.CouchResponseError:
+            If attachment or document is not found or server error occurred
+        """
+        query = dict()
+
+        if rev:
+            query["rev"] = rev
+
+        async with self.http_client.stream_request(
+            endpoint=self.__doc_attachment_endpoint__,
+            method=types.HttpMethod.GET,
+            statuses=self.__attachment_get_statuses__,
             path={"db": db, "doc_id": doc_id, "att_id": attachment_id},
             query=query,
+        ) as response:
+            yield response
+
+    async def attachment_download(
+        self,
+        db: str,
+        doc_id: str,
+        attachment_id: str,
+        destination: str | os.PathLike | typing.BinaryIO,
+        rev: str = None,
+        progress: typing.Callable[[int, int | None], typing.Any] = None,
+    ) -> types.UniversalResponse:
+        """
+        Writes attachment into local file or file object while it's
+        received, so memory usage doesn't depend on its size
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc_id: str
+            Document id
+
+        attachment_id: str
+            Attachment name
+
+        destination: str | os.PathLike | typing.BinaryIO
+            File path (file is created or truncated) or binary file object,
+            sync or async
+
+        rev: str = None
+            Actual document’s revision
+
+        progress: typing.Callable[[int, int | None], typing.Any] = None
+            Called with number of written bytes and total size (None if
+            it's unknown) after every chunk
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Response headers, `data` is number of written bytes
+
+        Raises
+        ----------
+        exc.UnexpectedStatusCode:
+            If response status is not expected
+
+        exc.CouchResponseError:
+            If attachment or document is not found or server error occurred
+        """
+        async with self.attachment_stream(db, doc_id, attachment_id, rev) as response:
+            chunks = response.data
+
+            if progress is not None:
+                length = response.headers.get("content-length")
+
+                # Size of compressed body doesn't match decompressed chunks
+                if length is None or response.headers.get("content-encoding"):
+                    total = None
+                else:
+                    total = int(length)
+
+                chunks = track_progress(chunks, progress, total)
+
+            response.data = await write_chunks(chunks, destination)
+
+        return response
+
+    async def attachment_download_ranges(
+        self,
+        db: str,
+        doc_id: str,
+        attachment_id: str,
+        destination: str | os.PathLike | typing.BinaryIO | bytearray | memoryview,
+        rev: str = None,
+        part_size: int = 8 * 1024 * 1024,
+        concurrency: int = 4,
+        verify: bool = True,
+    ) -> types.UniversalResponse:
+        """
+        Downloads large attachment by byte ranges requested concurrently.
+        Parts are written at their positions as they arrive, with cluster
+        http client they are requested from different nodes. Attachment is
+        requested without compression, if server doesn't accept ranges or
+        attachment is not larger than `part_size` it's downloaded with
+        single request. If server doesn't report attachment size, it's
+        downloaded by `attachment_download`, buffer destination and
+        `verify` are not supported in this case
+
+        Parameters
+        ----------
+        db: str
+            Database name
+
+        doc_id: str
+            Document id
+
+        attachment_id: str
+            Attachment name
+
+        destination: str | os.PathLike | typing.BinaryIO | bytearray | memoryview
+            File path (file is created or truncated), seekable binary file
+            object or writable buffer of attachment size
+
+        rev: str = None
+            Actual document’s revision. Should be passed, so parts can't
+            belong to different revisions
+
+        part_size: int = 8 * 1024 * 1024
+            Size of range requested at once
+
+        concurrency: int = 4
+            Number of concurrent requests
+
+        verify: bool = True
+            Compare MD5 digest of downloaded data with `Content-MD5` of the
+            attachment. Destination has to be readable
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Attachment headers, `data` is its size
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If attachment or document is not found or server error occurred
+
+        exc.DigestMismatch:
+            If downloaded data doesn't match attachment digest
+        """
+        query = dict()
+
+        if rev:
+            query["rev"] = rev
+
+        path = {"db": db, "doc_id": doc_id, "att_id": attachment_id}
+        response = await self.http_client.make_request(
+            endpoint=self.__doc_attachment_endpoint__,
+            method=types.HttpMethod.HEAD,
+            statuses=self.__attachment_get_statuses__,
+            path=path,
+            query=query,
+            headers={"Accept-Encoding": "identity"},
         )
 
+        if response.status_code != 200:
+            raise exc.CouchResponseError(response.status_code, response.data)
+
+        length = response.headers.get("content-length")
+
+        if length is None:
+            return await self.attachment_download(
+                db, doc_id, attachment_id, destination, rev
+            )
+
+        size = int(length)
+        ranges = [
+            (start, min(start + part_size, size) - 1)
+            for start in range(0, size, part_size)
+        ]
+
+        if response.headers.get("accept-ranges") != "bytes" or len(ranges) < 2:
+            ranges = [(0, None)]
+
+        writer = OffsetWriter(destination, size)
+        await writer.prepare()
+
+        # Workers take ranges from shared queue, so there are never more
+        # than `concurrency` requests in progress
+        send, parts = anyio.create_memory_object_stream(len(ranges))
+
+        with send:
+            for part in ranges:
+                send.send_nowait(part)
+
+        # The first error is raised after task group exit to avoid its
+        # wrapping into exception group
+        errors = []
+
+        async def fetch_parts(cancel_scope: anyio.CancelScope):
+            try:
+                async for start, end in parts:
+                    headers = {"Accept-Encoding": "identity"}
+
+                    if end is None:
+                        statuses = {200: "Attachment exists"}
+                    else:
+                        headers.update(range_headers(start, end))
+                        statuses = {206: "Requested part of attachment"}
+
+                    async with self.http_client.stream_request(
+                        endpoint=self.__doc_attachment_endpoint__,
+                        method=types.HttpMethod.GET,
+                        statuses=statuses,
+                        path=path,
+                        query=query,
+                        headers=headers,
+                    ) as part:
+                        await writer.write(part.data, start)
+            except Exception as error:
+                errors.append(error)
+                cancel_scope.cancel()
+
+        with parts:
+            async with anyio.create_task_group() as tg:
+                for _ in range(concurrency):
+                    tg.start_soon(fetch_parts, tg.cancel_scope)
+
+        if errors:
+            raise errors[0]
+
+        if verify:
+            expected = response.headers.get("content-md5")
+            actual = base64.b64encode(await writer.md5()).decode()
+
+            if expected and expected != actual:
+                raise exc.DigestMismatch(expected, actual)
+
+        response.data = size
+        return response
+
     async def attachment_upload(
         self,
         db: str,
         doc_id: str,
         attachment_id: str,
         content_type: str,
-        data: bytes,
-        rev: str,
+        data: ByteSource,
+        rev: str = None,
+        chunk_size: int = 64 * 1024,
+        use_mmap: bool = False,
+        progress: typing.Callable[[int, int | None], typing.Any] = None,
     ) -> types.UniversalResponse:
         """
         Uploads the supplied content as an attachment to the specified
@@ -571,12 +953,26 @@ class DocAttachmentEndpoint(BaseEndpoint):
         content_type: str
             Attachment MIME type
 
-        data: bytes
-            Uploading file data
+        data: ByteSource
+            Uploading file data: bytes, path of local file, file object
+            (sync or async) or (async) iterable of chunks. Files are read
+            chunk by chunk while they are sent, with Content-Length of their
+            size. Iterables are sent with chunked transfer encoding
 
         rev: str = None
             Actual document’s revision
 
+        chunk_size: int = 64 * 1024
+            Size of chunks read from files
+
+        use_mmap: bool = False
+            Map local file into memory instead of reading it in a worker
+            thread
+
+        progress: typing.Callable[[int, int | None], typing.Any] = None
+            Called with number of sent bytes and total size (None if it's
+            unknown) after every chunk
+
         Returns
         ----------
         `UniversalResponse`
@@ -595,6 +991,17 @@ class DocAttachmentEndpoint(BaseEndpoint):
         if rev:
             query["rev"] = rev
 
+        data, length = byte_source(data, chunk_size, use_mmap)
+
+        if length is not None:
+            headers["Content-Length"] = str(length)
+
+        if progress is not None:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                data = iterate(split_chunks(data, chunk_size))
+
+            data = track_progress(data, progress, length)
+
         return await self.http_client.make_request(
             endpoint=self.__doc_attachment_endpoint__,
             method=types.HttpMethod.PUT,
@@ -608,6 +1015,7 @@ class DocAttachmentEndpoint(BaseEndpoint):
             },
             path={"db": db, "doc_id": doc_id, "att_id": attachment_id},
             query=query,
+            headers=headers,
             data=data,
             response_model=DocumentCreated,
         )
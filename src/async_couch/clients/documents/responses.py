@@ -3,6 +3,11 @@ import typing
 from dataclasses import dataclass
 
 from async_couch.types import EmptyResponse
+from async_couch.utils.content_types import (
+    MultipartRelated,
+    MultipartRelatedAttachment,
+    content_type_boundary,
+)
 
 
 @dataclass
@@ -52,22 +57,89 @@ class DocumentDetailedResponse(EmptyResponse):
 
     @classmethod
     def load(cls, response):
+        return cls.from_dict(response.json())
+
+    @classmethod
+    def from_dict(cls, data: dict):
         fields = cls.__dataclass_fields__.keys()
-        data = response.json()
 
         params = dict()
 
         for field in fields:
-            value = data.pop(field, None)
+            value = data.get(field)
 
             if value:
                 params[field] = value
 
-        params["doc"] = data
+        params["doc"] = {
+            name: value for name, value in data.items() if name not in fields
+        }
 
         return cls(**params)
 
 
+@dataclass
+class DocumentRevisionsResponse(EmptyResponse):
+    docs: typing.List[DocumentDetailedResponse] = None
+    # Documents of found revisions
+
+    missing: typing.List[str] = None
+    # Requested revisions which don't exist
+
+    @classmethod
+    def load(cls, response):
+        result = cls(docs=[], missing=[])
+
+        for item in response.json():
+            if "ok" in item:
+                result.docs.append(DocumentDetailedResponse.from_dict(item["ok"]))
+            else:
+                result.missing.append(item["missing"])
+
+        return result
+
+    @classmethod
+    def load_parts(cls, parts: typing.List[MultipartRelatedAttachment]):
+        """
+        Load multipart/mixed response. Every part is a JSON document or
+        multipart/related document with attachments
+
+        Parameters
+        ----------
+        parts: typing.List[MultipartRelatedAttachment]
+            Parts of response body
+
+        Returns
+        ----------
+        DocumentRevisionsResponse
+            Documents and missing revisions
+        """
+        result = cls(docs=[], missing=[])
+
+        for part in parts:
+            if (part.mime_type or b"").startswith(b"multipart/related"):
+                files = MultipartRelated.load(
+                    part.data, content_type_boundary(part.mime_type)
+                )
+
+                for file in files:
+                    file.codec = part.codec
+
+                doc = DocumentDetailedResponse.from_dict(files[0].json())
+                doc._files = files
+                result.docs.append(doc)
+                continue
+
+            data = part.json()
+
+            if "missing" in data and "_id" not in data:
+                result.missing.append(data["missing"])
+            else:
+                result.docs.append(DocumentDetailedResponse.from_dict(data))
+
+        return result
+
+
 @dataclass
 class DocumentUpdatingResponse(EmptyResponse):
     id: str = None
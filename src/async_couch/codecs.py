@@ -0,0 +1,174 @@
+import abc
+import datetime
+import decimal
+import json
+import typing
+import uuid
+
+
+def encode_default(obj: typing.Any) -> typing.Any:
+    """
+    Convert objects unsupported by JSON. Dates and times are written in ISO
+    8601 format, UUID and Decimal as strings to keep precision
+
+    Parameters
+    ----------
+    obj: typing.Any
+        Object to convert
+
+    Returns
+    ----------
+    typing.Any
+        JSON serializable representation
+
+    Raises
+    ----------
+    TypeError
+        If object type is not supported
+    """
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+
+    if isinstance(obj, (uuid.UUID, decimal.Decimal)):
+        return str(obj)
+
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class JsonCodec(metaclass=abc.ABCMeta):
+    """
+    JSON encoder/decoder used for request bodies and response models
+    """
+
+    name: str = None
+    """Name of codec in registry"""
+
+    @abc.abstractmethod
+    def dumps(self, obj: typing.Any) -> bytes:
+        return NotImplemented
+
+    @abc.abstractmethod
+    def loads(self, data: bytes | memoryview | str) -> typing.Any:
+        return NotImplemented
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "json"
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return json.dumps(
+            obj, default=encode_default, separators=(",", ":"), ensure_ascii=False
+        ).encode()
+
+    def loads(self, data: bytes | memoryview | str) -> typing.Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        # datetime and UUID are supported natively, Decimal goes to default
+        return self._dumps(obj, default=encode_default)
+
+    def loads(self, data: bytes | memoryview | str) -> typing.Any:
+        return self._loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder(
+            enc_hook=encode_default, decimal_format="string"
+        )
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes | memoryview | str) -> typing.Any:
+        return self._decoder.decode(data)
+
+
+codecs: typing.Dict[str, typing.Type[JsonCodec]] = dict()
+"""Registry of available codecs"""
+
+codecs_priority = ("orjson", "msgspec", "json")
+"""Codecs lookup order if codec is not specified"""
+
+
+def register_codec(codec: typing.Type[JsonCodec]) -> typing.Type[JsonCodec]:
+    """
+    Add codec into registry. Can be used as class decorator
+
+    Parameters
+    ----------
+    codec: typing.Type[JsonCodec]
+        Codec class
+
+    Returns
+    ----------
+    typing.Type[JsonCodec]
+        Registered codec class
+    """
+    codecs[codec.name] = codec
+    return codec
+
+
+def get_codec(codec: str | JsonCodec = None) -> JsonCodec:
+    """
+    Initialize codec by name. If name is not specified the fastest
+    installed codec is used
+
+    Parameters
+    ----------
+    codec: str | JsonCodec = None
+        Codec name from registry or codec instance
+
+    Returns
+    ----------
+    JsonCodec
+        Codec instance
+
+    Raises
+    ----------
+    ValueError
+        If codec is unknown
+    ImportError
+        If codec library is not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec is not None:
+        if codec not in codecs:
+            raise ValueError(f"Unknown JSON codec: {codec}")
+
+        return codecs[codec]()
+
+    for name in codecs_priority:
+        try:
+            return codecs[name]()
+        except ImportError:
+            continue
+
+    return StdlibJsonCodec()
+
+
+for codec_class in (StdlibJsonCodec, OrjsonCodec, MsgspecCodec):
+    register_codec(codec_class)
+
+default_codec = get_codec()
+"""Codec used when http client has no own codec"""
@@ -14,3 +14,35 @@ class HttpError(Exception):
 class UnexpectedStatusCode(HttpError):
     def __str__(self):
         return f"Unexpected status code {self.code} with message:" f" {self.message}"
+
+
+class CouchResponseError(HttpError):
+    def __str__(self):
+        return f"CouchDB responded with {self.code}: {self.message}"
+
+
+@dataclasses.dataclass
+class BulkDocumentError(Exception):
+    """
+    Document rejected in bulk request
+    """
+
+    id: str
+    error: str
+    reason: str
+
+    def __str__(self):
+        return f"Document {self.id} was rejected: {self.error} ({self.reason})"
+
+
+@dataclasses.dataclass
+class DigestMismatch(Exception):
+    """
+    Downloaded data doesn't match its digest
+    """
+
+    expected: str
+    actual: str
+
+    def __str__(self):
+        return f"Digest mismatch: expected {self.expected}, got {self.actual}"
@@ -1,3 +1,14 @@
+from .auth import BasicAuth, CouchAuth, JWTAuth, ProxyAuth, SessionAuth
 from .httpx_client import HttpxCouchClient, BaseHttpClient
+from .cluster import ClusterHttpClient
 
-__all__ = ["HttpxCouchClient", "BaseHttpClient"]
+__all__ = [
+    "HttpxCouchClient",
+    "BaseHttpClient",
+    "ClusterHttpClient",
+    "CouchAuth",
+    "BasicAuth",
+    "SessionAuth",
+    "JWTAuth",
+    "ProxyAuth",
+]
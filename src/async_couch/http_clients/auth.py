@@ -0,0 +1,255 @@
+import abc
+import base64
+import hashlib
+import hmac
+import http.cookies
+import inspect
+import time
+import typing
+
+import anyio
+
+from async_couch import exc, types
+
+
+class CouchAuth(metaclass=abc.ABCMeta):
+    """
+    Authentication strategy. Http client asks it for headers before every
+    request and reports every response back, so credentials can be
+    refreshed
+    """
+
+    @abc.abstractmethod
+    async def auth_headers(self, client) -> typing.Dict[str, str]:
+        """
+        Headers to add into request
+
+        Parameters
+        ----------
+        client: BaseHttpClient
+            Http client which sends the request
+
+        Returns
+        ----------
+        typing.Dict[str, str]
+            Authentication headers
+        """
+        return NotImplemented
+
+    async def on_response(self, client, response: types.UniversalResponse) -> bool:
+        """
+        Inspect response headers
+
+        Parameters
+        ----------
+        client: BaseHttpClient
+            Http client which sent the request
+
+        response: types.UniversalResponse
+            Received response, body may be not read yet
+
+        Returns
+        ----------
+        bool
+            True if request has to be repeated with fresh credentials
+        """
+        return False
+
+
+class BasicAuth(CouchAuth):
+    """
+    Basic authentication. CouchDB checks the password on every request,
+    prefer `SessionAuth` for high request rate
+    """
+
+    def __init__(self, user: str, password: str):
+        credentials = base64.b64encode(f"{user}:{password}".encode()).decode()
+        self._headers = {"Authorization": f"Basic {credentials}"}
+
+    async def auth_headers(self, client) -> typing.Dict[str, str]:
+        return self._headers
+
+
+class SessionAuth(CouchAuth):
+    """
+    Cookie authentication. Logs in once through `/_session` and reuses
+    `AuthSession` cookie. Cookie is renewed `refresh_margin` seconds before
+    expiration, cookies refreshed by CouchDB itself are picked up from
+    responses
+    """
+
+    cookie_name = "AuthSession"
+
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        lifetime: float = 600,
+        refresh_margin: float = 60,
+    ):
+        """
+        Parameters
+        ----------
+        user: str
+            Username
+
+        password: str
+            Password
+
+        lifetime: float = 600
+            Cookie lifetime in seconds if server doesn't send Max-Age.
+            Should match `[chttpd_auth] timeout` of the server
+
+        refresh_margin: float = 60
+            Renew cookie this number of seconds before expiration
+        """
+        self.user = user
+        self.password = password
+        self.lifetime = lifetime
+        self.refresh_margin = refresh_margin
+
+        self._cookie: str | None = None
+        self._expires_at = 0.0
+        self._lock = anyio.Lock()
+
+    @property
+    def expired(self) -> bool:
+        return (
+            self._cookie is None
+            or time.monotonic() >= self._expires_at - self.refresh_margin
+        )
+
+    async def auth_headers(self, client) -> typing.Dict[str, str]:
+        if self.expired:
+            async with self._lock:
+                if self.expired:
+                    await self.login(client)
+
+        return {"Cookie": f"{self.cookie_name}={self._cookie}"}
+
+    async def login(self, client):
+        """
+        Open new session
+
+        Parameters
+        ----------
+        client: BaseHttpClient
+            Http client to send login request with
+
+        Raises
+        ----------
+        exc.CouchResponseError:
+            If credentials are rejected
+        """
+        headers, data = client.encode_json(
+            None, None, {"name": self.user, "password": self.password}
+        )
+        func_kwargs = client.prepare_request(
+            "/_session", types.HttpMethod.POST, dict(), None, headers, data
+        )
+        result = await client.request_method(**func_kwargs)
+        response = client.to_universal_response(
+            client.validate_response(
+                result, {200: "Successfully authenticated", 401: "Invalid credentials"}
+            )
+        )
+
+        if response.status_code != 200 or not self.update_cookie(response):
+            raise exc.CouchResponseError(response.status_code, response.data)
+
+    def update_cookie(self, response: types.UniversalResponse) -> bool:
+        """
+        Save session cookie from `Set-Cookie` header
+
+        Parameters
+        ----------
+        response: types.UniversalResponse
+            Any CouchDB response
+
+        Returns
+        ----------
+        bool
+            True if response contains session cookie
+        """
+        header = response.headers.get("set-cookie")
+
+        if not header:
+            return False
+
+        cookies = http.cookies.SimpleCookie()
+        cookies.load(header)
+        morsel = cookies.get(self.cookie_name)
+
+        if morsel is None:
+            return False
+
+        max_age = morsel["max-age"]
+
+        self._cookie = morsel.value
+        self._expires_at = time.monotonic() + (
+            float(max_age) if max_age else self.lifetime
+        )
+        return True
+
+    async def on_response(self, client, response: types.UniversalResponse) -> bool:
+        if response.status_code == 401:
+            self._cookie = None
+            return True
+
+        self.update_cookie(response)
+        return False
+
+
+class JWTAuth(CouchAuth):
+    """
+    JWT bearer authentication. Token can be a string or a (async) callable
+    which returns actual token, it's called again if token is rejected
+    """
+
+    def __init__(self, token: str | typing.Callable[[], str | typing.Awaitable[str]]):
+        self.token = token
+        self._token: str | None = None
+
+    async def auth_headers(self, client) -> typing.Dict[str, str]:
+        if self._token is None:
+            if callable(self.token):
+                token = self.token()
+                self._token = await token if inspect.isawaitable(token) else token
+            else:
+                self._token = self.token
+
+        return {"Authorization": f"Bearer {self._token}"}
+
+    async def on_response(self, client, response: types.UniversalResponse) -> bool:
+        if response.status_code == 401 and callable(self.token):
+            self._token = None
+            return True
+
+        return False
+
+
+class ProxyAuth(CouchAuth):
+    """
+    Proxy authentication. Trusted proxy passes username and roles in
+    headers, token is HMAC of username signed with `[chttpd_auth] secret`
+    """
+
+    def __init__(
+        self,
+        user: str,
+        roles: typing.Iterable[str] = (),
+        secret: str = None,
+        digest: str = "sha256",
+    ):
+        self._headers = {
+            "X-Auth-CouchDB-UserName": user,
+            "X-Auth-CouchDB-Roles": ",".join(roles),
+        }
+
+        if secret:
+            self._headers["X-Auth-CouchDB-Token"] = hmac.new(
+                secret.encode(), user.encode(), getattr(hashlib, digest)
+            ).hexdigest()
+
+    async def auth_headers(self, client) -> typing.Dict[str, str]:
+        return self._headers
@@ -1,13 +1,28 @@
 import abc
+import contextlib
 
 from dataclasses import dataclass
-from typing import Callable, Dict, Any
+from typing import AsyncContextManager, AsyncIterator, Callable, Dict, Any
 
 from async_couch import exc, types
-from async_couch.utils.content_types import MultipartRelated
+from async_couch.codecs import JsonCodec, default_codec
+from async_couch.http_clients.auth import CouchAuth
+from async_couch.utils.content_types import MultipartRelated, content_type_boundary
 
 
 class BaseHttpClient(metaclass=abc.ABCMeta):
+    codec: JsonCodec = default_codec
+    """JSON codec for request bodies and response models"""
+
+    couch_auth: CouchAuth = None
+    """Authentication strategy. If not set, http client's own auth is used"""
+
+    connect_errors: tuple = (ConnectionError,)
+    """Errors raised if request wasn't sent, it's safe to repeat it"""
+
+    transport_errors: tuple = (OSError,)
+    """Network errors of http client"""
+
     @classmethod
     @abc.abstractmethod
     def get_client(cls, url: str, **kwargs):
@@ -17,6 +32,15 @@ class BaseHttpClient(metaclass=abc.ABCMeta):
     async def request_method(self, *_, **__) -> Callable:
         return NotImplemented
 
+    @abc.abstractmethod
+    def stream_method(self, *_, **__) -> AsyncContextManager:
+        return NotImplemented
+
+    @staticmethod
+    @abc.abstractmethod
+    def iter_bytes(response: Any) -> AsyncIterator[bytes]:
+        return NotImplemented
+
     @staticmethod
     @abc.abstractmethod
     def prepare_request(
@@ -32,7 +56,7 @@ class BaseHttpClient(metaclass=abc.ABCMeta):
 
     @staticmethod
     @abc.abstractmethod
-    def to_universal_response(response: Any):
+    def to_universal_response(response: Any, stream: bool = False):
         return NotImplemented
 
     async def make_request(
@@ -47,12 +71,23 @@ class BaseHttpClient(metaclass=abc.ABCMeta):
         json_data: dict = None,
         response_model: Any = None,
     ):
-        func_kwargs = self.prepare_request(
-            endpoint, method, path, query, headers, data, json_data
-        )
-        result = await self.request_method(**func_kwargs)
+        headers, data = self.encode_json(headers, data, json_data)
+        retries = 1 if self.is_replayable(data) else 0
+
+        while True:
+            func_kwargs = self.prepare_request(
+                endpoint, method, path, query, await self.authorize(headers), data
+            )
+            result = await self.request_method(**func_kwargs)
+
+            if await self.reauthorize(result) and retries:
+                retries -= 1
+                continue
+
+            break
 
         response = self.to_universal_response(self.validate_response(result, statuses))
+        response.codec = self.codec
         content_type = response.headers.get("content-type")
 
         if response.status_code > 299:
@@ -63,13 +98,160 @@ class BaseHttpClient(metaclass=abc.ABCMeta):
             if content_type == "application/json":
                 response.model = response_model.load(response)
 
-            elif content_type.startswith("multipart/related"):
-                decoded_attachments = list(MultipartRelated.load(response.data))
-                response.model = response_model.load(decoded_attachments[0])
-                response.model._files = decoded_attachments
+            elif content_type.startswith("multipart/"):
+                decoded_attachments = MultipartRelated.load(
+                    response.data, content_type_boundary(content_type)
+                )
+
+                for attachment in decoded_attachments:
+                    attachment.codec = self.codec
+
+                if content_type.startswith("multipart/mixed"):
+                    response.model = response_model.load_parts(decoded_attachments)
+                else:
+                    response.model = response_model.load(decoded_attachments[0])
+                    response.model._files = decoded_attachments
 
         return response
 
+    @contextlib.asynccontextmanager
+    async def stream_request(
+        self,
+        endpoint: str,
+        method: str,
+        statuses: Dict[int, str],
+        path: Dict[str, Any] = None,
+        query: Dict[str, Any] = None,
+        headers: Dict[str, Any] = None,
+        data: bytes = None,
+        json_data: dict = None,
+    ) -> AsyncIterator[types.UniversalResponse]:
+        """
+        Same as `make_request`, but response body is not read. `data` of
+        yielded `UniversalResponse` is an async iterator over body chunks,
+        the connection is released on exit from context
+
+        Raises
+        ----------
+        exc.UnexpectedStatusCode:
+            If response status is not listed in `statuses`
+
+        exc.CouchResponseError:
+            If server error occurred
+        """
+        headers, data = self.encode_json(headers, data, json_data)
+        retries = 1 if self.is_replayable(data) else 0
+
+        while True:
+            func_kwargs = self.prepare_request(
+                endpoint, method, path, query, await self.authorize(headers), data
+            )
+
+            async with self.stream_method(**func_kwargs) as result:
+                if await self.reauthorize(result) and retries:
+                    retries -= 1
+                    continue
+
+                response = self.to_universal_response(result, stream=True)
+                response.codec = self.codec
+
+                if response.status_code > 299 or response.status_code not in statuses:
+                    body = b"".join([chunk async for chunk in self.iter_bytes(result)])
+
+                    if response.status_code not in statuses:
+                        raise exc.UnexpectedStatusCode(response.status_code, body)
+
+                    raise exc.CouchResponseError(response.status_code, body)
+
+                response.data = self.iter_bytes(result)
+                yield response
+                return
+
+    async def authorize(self, headers: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add authentication headers of `couch_auth` strategy
+
+        Parameters
+        ----------
+        headers: Dict[str, Any]
+            Request headers
+
+        Returns
+        ----------
+        Dict[str, Any]
+            Request headers with credentials
+        """
+        if self.couch_auth is None:
+            return headers
+
+        return {**(headers or dict()), **await self.couch_auth.auth_headers(self)}
+
+    async def reauthorize(self, result: Any) -> bool:
+        """
+        Report response to `couch_auth` strategy
+
+        Parameters
+        ----------
+        result: Any
+            Response of http client, body may be not read yet
+
+        Returns
+        ----------
+        bool
+            True if request has to be repeated with fresh credentials
+        """
+        if self.couch_auth is None:
+            return False
+
+        response = self.to_universal_response(result, stream=True)
+        return await self.couch_auth.on_response(self, response)
+
+    @staticmethod
+    def is_replayable(data: Any) -> bool:
+        """
+        Check whether request body can be sent one more time
+
+        Parameters
+        ----------
+        data: Any
+            Request body
+
+        Returns
+        ----------
+        bool
+            True for empty and in-memory bodies
+        """
+        return data is None or isinstance(data, (bytes, bytearray, memoryview))
+
+    def encode_json(
+        self, headers: Dict[str, Any], data: bytes, json_data: Any
+    ) -> tuple[Dict[str, Any], bytes]:
+        """
+        Encode JSON request body with client codec, so http client sends
+        already prepared bytes
+
+        Parameters
+        ----------
+        headers: Dict[str, Any]
+            Request headers
+
+        data: bytes
+            Raw request body. Used if `json_data` is None
+
+        json_data: Any
+            Request body to encode
+
+        Returns
+        ----------
+        tuple[Dict[str, Any], bytes]
+            Request headers and body
+        """
+        if json_data is None:
+            return headers, data
+
+        headers = {"Content-Type": "application/json", **(headers or dict())}
+        return headers, self.codec.dumps(json_data)
+
     @staticmethod
     def validate_response(response: types.UniversalResponse, statutes: dict):
         status = statutes.get(response.status_code)
@@ -0,0 +1,410 @@
+import contextlib
+import itertools
+import random
+import time
+import typing
+import urllib.parse
+
+from dataclasses import dataclass
+
+import anyio
+
+from anyio.abc import TaskGroup
+
+from async_couch import types
+from async_couch.http_clients.base_client import BaseHttpClient
+from async_couch.http_clients.httpx_client import HttpxCouchClient
+
+
+def node_url(node: str, port: int = 5984, schema: str = "http") -> str:
+    """
+    Build url of cluster node
+
+    Parameters
+    ----------
+    node: str
+        Node as `host`, `host:port`, IPv6 address or `[address]:port`
+
+    port: int = 5984
+        Port if node doesn't specify it
+
+    schema: str = 'http'
+        Url schema
+
+    Returns
+    ----------
+    str
+        Node url
+    """
+    # Bare IPv6 address has no port, its colons separate address groups
+    if node.count(":") > 1 and not node.startswith("["):
+        node = f"[{node}]"
+
+    if urllib.parse.urlsplit(f"//{node}").port is None:
+        node = f"{node}:{port}"
+
+    return f"{schema}://{node}"
+
+
+@dataclass
+class ClusterNode:
+    """
+    State of single CouchDB node
+    """
+
+    client: BaseHttpClient
+    """Http client bound to node url"""
+
+    url: str = None
+    """Node url"""
+
+    outstanding: int = 0
+    """Number of requests in progress"""
+
+    latency: float = None
+    """Exponentially weighted average of response time, in seconds"""
+
+    healthy: bool = True
+    """False if node is ejected from balancing"""
+
+    ejected_at: float = 0.0
+    """Time of last failure"""
+
+    def observe(self, latency: float, weight: float = 0.3):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += weight * (latency - self.latency)
+
+        self.healthy = True
+
+
+class ClusterHttpClient(BaseHttpClient):
+    """
+    Spreads requests across CouchDB cluster nodes. Nodes which fail with
+    network errors, or answer GET and HEAD requests with 5xx status, are
+    ejected and re-probed, failed request is repeated on the next node if
+    it's safe
+
+    Balancers:
+
+        * `round_robin` - nodes are used in turn
+        * `least_outstanding` - node with less requests in progress
+        * `latency_weighted` - random node, weighted by inverted latency
+
+    Ejected nodes are probed in background while client is used as async
+    context manager, otherwise only live requests re-check them after
+    `retry_interval`
+
+    .. code-block:: python
+
+        async with ClusterHttpClient.get_client(urls) as http_client:
+            ...
+    """
+
+    balancers = ("round_robin", "least_outstanding", "latency_weighted")
+
+    idempotent_methods = (types.HttpMethod.GET, types.HttpMethod.HEAD)
+    """Requests which are repeated on another node after any network error"""
+
+    def __init__(
+        self,
+        nodes: typing.Sequence[BaseHttpClient],
+        balancer: str = "round_robin",
+        retry_interval: float = 5.0,
+        probe_endpoint: str = "/_up",
+        urls: typing.Sequence[str] = None,
+    ):
+        """
+        Parameters
+        ----------
+        nodes: typing.Sequence[BaseHttpClient]
+            Http clients of cluster nodes, all of the same adapter
+
+        balancer: str = 'round_robin'
+            Balancing strategy
+
+        retry_interval: float = 5.0
+            Seconds after which ejected node is probed again
+
+        probe_endpoint: str = '/_up'
+            Health check endpoint
+
+        urls: typing.Sequence[str] = None
+            Nodes urls, informational
+        """
+        if not nodes:
+            raise ValueError("At least one cluster node is required")
+
+        if balancer not in self.balancers:
+            raise ValueError(f"Unknown balancer: {balancer}")
+
+        urls = urls or [None] * len(nodes)
+
+        self.nodes = [ClusterNode(client, url) for client, url in zip(nodes, urls)]
+        self.balancer = balancer
+        self.retry_interval = retry_interval
+        self.probe_endpoint = probe_endpoint
+
+        adapter = self.nodes[0].client
+        self.connect_errors = adapter.connect_errors
+        self.transport_errors = adapter.transport_errors
+
+        self._counter = itertools.count()
+        self._health_checks: TaskGroup | None = None
+
+    @classmethod
+    def get_client(
+        cls,
+        urls: typing.Sequence[str],
+        request_adapter: typing.Type[BaseHttpClient] = HttpxCouchClient,
+        balancer: str = "round_robin",
+        retry_interval: float = 5.0,
+        **kwargs,
+    ):
+        nodes = [request_adapter.get_client(url, **kwargs) for url in urls]
+        return cls(nodes, balancer, retry_interval, urls=urls)
+
+    def prepare_request(self, *args, **kwargs) -> dict:
+        return self.nodes[0].client.prepare_request(*args, **kwargs)
+
+    def to_universal_response(self, response: typing.Any, stream: bool = False):
+        return self.nodes[0].client.to_universal_response(response, stream)
+
+    def iter_bytes(self, response: typing.Any) -> typing.AsyncIterator[bytes]:
+        return self.nodes[0].client.iter_bytes(response)
+
+    async def request_method(self, **kwargs):
+        last_error = None
+        candidates = self.candidates()
+
+        for node in candidates:
+            node.outstanding += 1
+            started = time.monotonic()
+
+            try:
+                result = await node.client.request_method(**kwargs)
+            except self.transport_errors as error:
+                self.eject(node)
+
+                if not self.is_retryable(error, kwargs):
+                    raise
+
+                last_error = error
+                continue
+            finally:
+                node.outstanding -= 1
+
+            if self.is_unavailable(result, kwargs):
+                self.eject(node)
+
+                if node is not candidates[-1]:
+                    continue
+            else:
+                node.observe(time.monotonic() - started)
+
+            return result
+
+        raise last_error
+
+    @contextlib.asynccontextmanager
+    async def stream_method(self, **kwargs):
+        last_error = None
+        candidates = self.candidates()
+
+        for node in candidates:
+            async with contextlib.AsyncExitStack() as stack:
+                node.outstanding += 1
+                stack.callback(self.release, node)
+                started = time.monotonic()
+
+                try:
+                    result = await stack.enter_async_context(
+                        node.client.stream_method(**kwargs)
+                    )
+                except self.transport_errors as error:
+                    self.eject(node)
+
+                    if not self.is_retryable(error, kwargs):
+                        raise
+
+                    last_error = error
+                    continue
+
+                if self.is_unavailable(result, kwargs):
+                    self.eject(node)
+
+                    if node is not candidates[-1]:
+                        continue
+                else:
+                    node.observe(time.monotonic() - started)
+
+                yield result
+                return
+
+        raise last_error
+
+    @staticmethod
+    def release(node: ClusterNode):
+        node.outstanding -= 1
+
+    def is_retryable(self, error: Exception, request: dict) -> bool:
+        """
+        Check whether failed request can be sent to another node
+
+        Parameters
+        ----------
+        error: Exception
+            Network error
+
+        request: dict
+            Prepared request
+
+        Returns
+        ----------
+        bool
+            True if request wasn't sent or it's idempotent
+        """
+        if isinstance(error, self.connect_errors):
+            return True
+
+        return request.get("method") in self.idempotent_methods
+
+    def is_unavailable(self, result: typing.Any, request: dict) -> bool:
+        """
+        Check whether node failed idempotent request with server error,
+        e.g. while it restarts or is in maintenance mode
+
+        Parameters
+        ----------
+        result: typing.Any
+            Response of http client, body may be not read yet
+
+        request: dict
+            Prepared request
+
+        Returns
+        ----------
+        bool
+            True if request can be repeated on another node
+        """
+        if request.get("method") not in self.idempotent_methods:
+            return False
+
+        return self.to_universal_response(result, stream=True).status_code >= 500
+
+    def eject(self, node: ClusterNode):
+        node.healthy = False
+        node.ejected_at = time.monotonic()
+
+    def candidates(self) -> typing.List[ClusterNode]:
+        """
+        Nodes in order of preference. Ejected nodes are used only after
+        `retry_interval` or if there is no healthy nodes
+
+        Returns
+        ----------
+        typing.List[ClusterNode]
+            Nodes to try one by one
+        """
+        now = time.monotonic()
+        healthy, ejected = [], []
+
+        for node in self.nodes:
+            if node.healthy or now - node.ejected_at >= self.retry_interval:
+                healthy.append(node)
+            else:
+                ejected.append(node)
+
+        if not healthy:
+            return ejected
+
+        offset = next(self._counter) % len(healthy)
+        healthy = healthy[offset:] + healthy[:offset]
+
+        if self.balancer == "least_outstanding":
+            healthy.sort(key=lambda node: node.outstanding)
+
+        elif self.balancer == "latency_weighted":
+            known = [node.latency for node in healthy if node.latency is not None]
+            default = sum(known) / len(known) if known else 1.0
+            weights = [1 / max(node.latency or default, 1e-6) for node in healthy]
+
+            first = random.choices(range(len(healthy)), weights)[0]
+            healthy.insert(0, healthy.pop(first))
+
+        return healthy + ejected
+
+    async def probe(self, node: ClusterNode) -> bool:
+        """
+        Check node health
+
+        Parameters
+        ----------
+        node: ClusterNode
+            Node to check
+
+        Returns
+        ----------
+        bool
+            True if node is healthy
+        """
+        func_kwargs = self.prepare_request(
+            self.probe_endpoint, types.HttpMethod.GET, dict()
+        )
+        started = time.monotonic()
+
+        try:
+            result = await node.client.request_method(**func_kwargs)
+        except self.transport_errors:
+            self.eject(node)
+            return False
+
+        if self.to_universal_response(result).status_code != 200:
+            self.eject(node)
+            return False
+
+        node.observe(time.monotonic() - started)
+        return True
+
+    async def run_health_checks(self, interval: float = None):
+        """
+        Probe ejected nodes until cancelled. Started automatically by
+        `async with` client, or start it in your own task group
+
+        Parameters
+        ----------
+        interval: float = None
+            Seconds between checks, `retry_interval` by default
+        """
+        interval = interval or self.retry_interval
+
+        while True:
+            async with anyio.create_task_group() as tg:
+                for node in self.nodes:
+                    if not node.healthy:
+                        tg.start_soon(self.probe, node)
+
+            await anyio.sleep(interval)
+
+    async def __aenter__(self):
+        self._health_checks = anyio.create_task_group()
+        await self._health_checks.__aenter__()
+        self._health_checks.start_soon(self.run_health_checks)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        health_checks, self._health_checks = self._health_checks, None
+        health_checks.cancel_scope.cancel()
+
+        try:
+            await health_checks.__aexit__(None, None, None)
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        for node in self.nodes:
+            close = getattr(node.client, "aclose", None)
+
+            if close is not None:
+                await close()
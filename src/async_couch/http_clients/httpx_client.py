@@ -8,11 +8,18 @@ from async_couch.http_clients.base_client import BaseHttpClient
 
 class HttpxCouchClient(BaseHttpClient, httpx.AsyncClient):
     request_method = httpx.AsyncClient.request
+    stream_method = httpx.AsyncClient.stream
+    connect_errors = (httpx.ConnectError, httpx.ConnectTimeout)
+    transport_errors = (httpx.TransportError,)
 
     @classmethod
     def get_client(cls, couch_endpoint_url, **kwargs):
         return cls(base_url=couch_endpoint_url, **kwargs)
 
+    @staticmethod
+    def iter_bytes(response: httpx.Response):
+        return response.aiter_bytes()
+
     @staticmethod
     def prepare_request(
         endpoint: str,
@@ -27,8 +34,11 @@ class HttpxCouchClient(BaseHttpClient, httpx.AsyncClient):
 
         if isinstance(json_data, dict):
             request["json"] = json_data
-        elif data:
-            request["data"] = data
+        elif isinstance(data, (bytearray, memoryview)):
+            # httpx treats bytes-like objects other than bytes as iterables
+            request["content"] = bytes(data)
+        elif data is not None:
+            request["content"] = data
 
         if headers:
             request["headers"] = headers
@@ -36,10 +46,10 @@ class HttpxCouchClient(BaseHttpClient, httpx.AsyncClient):
         return request
 
     @staticmethod
-    def to_universal_response(response: httpx.Response):
+    def to_universal_response(response: httpx.Response, stream: bool = False):
         # response = response.raise_for_status()
         return types.UniversalResponse(
             status_code=response.status_code,
             headers=response.headers,
-            data=response.content,
+            data=None if stream else response.content,
         )
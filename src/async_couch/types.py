@@ -1,12 +1,10 @@
-try:
-    import orjson as json
-except ImportError:
-    import json
 import enum
 
 from dataclasses import dataclass
 from typing import Dict, Iterable
 
+from async_couch.codecs import JsonCodec, default_codec
+
 
 class HttpMethod(enum.StrEnum):
     HEAD: str = "head"
@@ -24,9 +22,10 @@ class UniversalResponse:
     headers: Dict[str, str]
     data: Iterable
     model: dict = None
+    codec: JsonCodec = default_codec
 
     def json(self) -> dict:
-        return json.loads(self.data)
+        return self.codec.loads(self.data)
 
 
 class EmptyResponse:
@@ -35,7 +34,7 @@ class EmptyResponse:
         if not response.data:
             return response
 
-        return cls(**json.loads(response.data))
+        return cls(**response.json())
 
 
 @dataclass
@@ -0,0 +1,134 @@
+import typing
+
+import anyio
+
+
+class Batch:
+    """
+    Items collected from concurrent callers
+    """
+
+    def __init__(self):
+        self.items: typing.List[typing.Any] = []
+        self.size: int = 0
+        self.results: typing.List[typing.Any] = []
+        self.error: Exception | None = None
+        self.full = anyio.Event()
+        self.done = anyio.Event()
+
+
+class BatchCollector:
+    """
+    Groups concurrent calls into batches per key. First caller of a batch
+    waits for `window` seconds (or until batch is full) and flushes it for
+    everybody, every caller receives result of own item.
+
+    `flush` receives key and list of items and must return list of results
+    in the same order. Exception instance as a result is raised to the
+    caller of corresponding item, exception raised by `flush` is raised to
+    every caller of the batch
+    """
+
+    def __init__(
+        self,
+        flush: typing.Callable[
+            [typing.Hashable, typing.List[typing.Any]],
+            typing.Awaitable[typing.List[typing.Any]],
+        ],
+        window: float = 0.005,
+        max_items: int = 100,
+        max_size: int = None,
+        size_of: typing.Callable[[typing.Any], int] = None,
+    ):
+        """
+        Parameters
+        ----------
+        flush: typing.Callable
+            Coroutine function which processes whole batch
+
+        window: float = 0.005
+            Seconds to wait for other callers
+
+        max_items: int = 100
+            Flush batch immediately when it contains this number of items
+
+        max_size: int = None
+            Flush batch immediately when total size of items reaches this
+            value
+
+        size_of: typing.Callable[[typing.Any], int] = None
+            Item size function, required for `max_size`
+        """
+        self.flush = flush
+        self.window = window
+        self.max_items = max_items
+        self.max_size = max_size
+        self.size_of = size_of
+
+        self._batches: typing.Dict[typing.Hashable, Batch] = dict()
+
+    async def submit(self, key: typing.Hashable, item: typing.Any) -> typing.Any:
+        """
+        Add item into current batch of `key` and wait for its result
+
+        Parameters
+        ----------
+        key: typing.Hashable
+            Batch key, e.g. database name
+
+        item: typing.Any
+            Item to process
+
+        Returns
+        ----------
+        typing.Any
+            Result of item processing
+        """
+        batch = self._batches.get(key)
+        leader = batch is None
+
+        if leader:
+            batch = self._batches[key] = Batch()
+
+        index = len(batch.items)
+        batch.items.append(item)
+
+        if self.size_of is not None:
+            batch.size += self.size_of(item)
+
+        if len(batch.items) >= self.max_items or (
+            self.max_size is not None and batch.size >= self.max_size
+        ):
+            self._detach(key, batch)
+            batch.full.set()
+
+        if leader:
+            # Batch has to be flushed even if leader is cancelled
+            with anyio.CancelScope(shield=True):
+                with anyio.move_on_after(self.window):
+                    await batch.full.wait()
+
+                self._detach(key, batch)
+
+                try:
+                    batch.results = await self.flush(key, batch.items)
+                except Exception as error:
+                    batch.error = error
+                finally:
+                    batch.done.set()
+        else:
+            await batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        result = batch.results[index]
+
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    def _detach(self, key: typing.Hashable, batch: Batch):
+        if self._batches.get(key) is batch:
+            del self._batches[key]
@@ -0,0 +1,255 @@
+import array
+import typing
+
+
+int_typecode = "q"
+float_typecode = "d"
+
+int_range = (-(2**63), 2**63 - 1)
+"""Integers outside of this range are stored as floats"""
+
+
+class Column:
+    """
+    Column of JSON values. Numbers are kept in compact `array.array`:
+    integers as int64 until the first float appears, then all values as
+    float64. Column falls back to list on the first value of other type
+    """
+
+    def __init__(self):
+        self.data: array.array | list = array.array(int_typecode)
+        """Values, `array.array` if all of them are numbers"""
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> typing.Any:
+        return self.data[index]
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        return iter(self.data)
+
+    @property
+    def numeric(self) -> bool:
+        return isinstance(self.data, array.array)
+
+    def append(self, value: typing.Any):
+        data = self.data
+
+        if not isinstance(data, array.array):
+            data.append(value)
+            return
+
+        value_type = type(value)
+
+        if value_type is int and data.typecode == int_typecode:
+            if int_range[0] <= value <= int_range[1]:
+                data.append(value)
+                return
+
+        if value_type is int or value_type is float:
+            if data.typecode == int_typecode:
+                self.data = data = array.array(float_typecode, data)
+
+            data.append(value)
+            return
+
+        self.data = data = data.tolist()
+        data.append(value)
+
+    def numpy(self):
+        """
+        Convert column into NumPy array. Data is copied, since array which
+        shares buffer of the column would prevent further appends
+
+        Returns
+        ----------
+        numpy.ndarray
+            int64 or float64 array for numbers, object array otherwise
+
+        Raises
+        ----------
+        ImportError
+            If NumPy is not installed
+        """
+        import numpy
+
+        if not self.numeric:
+            return object_array(self.data)
+
+        dtype = numpy.int64 if self.data.typecode == int_typecode else numpy.float64
+        return numpy.array(self.data, dtype=dtype)
+
+
+class KeyColumn:
+    """
+    Column of view keys. While all keys are arrays, e.g. keys of grouped
+    view, every key component is kept in its own `Column`, so components
+    of the same type stay compact. Otherwise all keys are kept in single
+    column
+    """
+
+    def __init__(self):
+        self.components: typing.List[Column] = []
+        """Column of every key component, missing components are None"""
+
+        self.lengths = array.array("I")
+        """Number of components of every key"""
+
+        self.column: Column | None = None
+        """All keys, if some of them are not arrays"""
+
+    def __len__(self) -> int:
+        if self.column is not None:
+            return len(self.column)
+
+        return len(self.lengths)
+
+    def __getitem__(self, index: int) -> typing.Any:
+        if self.column is not None:
+            return self.column[index]
+
+        length = self.lengths[index]
+        return [component[index] for component in self.components[:length]]
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        if self.column is not None:
+            return iter(self.column)
+
+        return (self[index] for index in range(len(self.lengths)))
+
+    @property
+    def split(self) -> bool:
+        """True if keys are kept by components"""
+        return self.column is None
+
+    def append(self, key: typing.Any):
+        if self.column is not None:
+            self.column.append(key)
+            return
+
+        if not isinstance(key, list):
+            column = Column()
+
+            for item in self:
+                column.append(item)
+
+            column.append(key)
+            self.column, self.components = column, []
+            self.lengths = array.array("I")
+            return
+
+        rows = len(self.lengths)
+
+        while len(self.components) < len(key):
+            component = Column()
+
+            for _ in range(rows):
+                component.append(None)
+
+            self.components.append(component)
+
+        for index, component in enumerate(self.components):
+            component.append(key[index] if index < len(key) else None)
+
+        self.lengths.append(len(key))
+
+    def numpy(self):
+        """
+        Convert keys into NumPy object array, use `components` to get
+        typed array of every component
+
+        Returns
+        ----------
+        numpy.ndarray
+            Key of every row
+
+        Raises
+        ----------
+        ImportError
+            If NumPy is not installed
+        """
+        if self.column is not None:
+            return self.column.numpy()
+
+        return object_array(list(self))
+
+
+class StringTable:
+    """
+    Column of repeated strings. Every distinct string is stored once,
+    rows refer to it by index
+    """
+
+    def __init__(self):
+        self.strings: typing.List[str | None] = []
+        """Distinct values in order of appearance"""
+
+        self.indexes = array.array("I")
+        """Index in `strings` of every row"""
+
+        self._lookup: typing.Dict[str | None, int] = dict()
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def __getitem__(self, index: int) -> str | None:
+        return self.strings[self.indexes[index]]
+
+    def __iter__(self) -> typing.Iterator[str | None]:
+        strings = self.strings
+        return (strings[index] for index in self.indexes)
+
+    def append(self, value: str | None):
+        index = self._lookup.get(value)
+
+        if index is None:
+            index = self._lookup[value] = len(self.strings)
+            self.strings.append(value)
+
+        self.indexes.append(index)
+
+    def numpy(self):
+        """
+        Convert column into NumPy object array
+
+        Returns
+        ----------
+        numpy.ndarray
+            Strings of every row
+
+        Raises
+        ----------
+        ImportError
+            If NumPy is not installed
+        """
+        import numpy
+
+        strings = object_array(self.strings)
+        dtype = numpy.dtype(f"u{self.indexes.itemsize}")
+        return strings[numpy.array(self.indexes, dtype=dtype)]
+
+
+def object_array(items: typing.Sequence[typing.Any]):
+    """
+    Convert items into one-dimensional NumPy object array. Unlike
+    `numpy.array`, lists of equal length are not turned into extra dimension
+
+    Parameters
+    ----------
+    items: typing.Sequence[typing.Any]
+        Items of array
+
+    Returns
+    ----------
+    numpy.ndarray
+        Object array of items
+    """
+    import numpy
+
+    result = numpy.empty(len(items), dtype=object)
+
+    for index, item in enumerate(items):
+        result[index] = item
+
+    return result
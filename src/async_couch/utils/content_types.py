@@ -1,18 +1,19 @@
-try:
-    import orjson as json
-except ImportError:
-    import json
 import re
 import gzip
 import typing
 
 from dataclasses import dataclass
 
+from async_couch.codecs import default_codec
+from async_couch.utils.streams import ByteSource, byte_source, iterate, source_size
+
 
 new_line = b"\r\n"
 
 multipart_boundary = b"--XFKYLGSHYCAFWJGY"
 
+closing_boundary = new_line + multipart_boundary + b"--"
+
 
 @dataclass
 class MultipartRelatedAttachment:
@@ -29,12 +30,20 @@ class MultipartRelatedAttachment:
     encoding: bytes = None
     """Content encoding"""
 
-    data: bytes = None
-    """Binary content"""
+    data: ByteSource = None
+    """Binary content. For request bodies it also can be a path of local
+    file, file object or (async) iterable of chunks, they are read while
+    request is sent"""
+
+    length: int = None
+    """Size of `data`. Required if `data` is an iterable"""
 
     decoding_callbacks = {b"gzip": gzip.decompress}
     """Callbacks for data decoding"""
 
+    codec = default_codec
+    """JSON codec for `json` method"""
+
     def decode(self) -> bytes:
         """
         Decode content with specified callbacks or rise error
@@ -59,14 +68,39 @@ class MultipartRelatedAttachment:
 
         return encoder(self.data)
 
-    def encode(self) -> bytes:
+    @property
+    def size(self) -> int:
+        """
+        Size of data without reading it
+
+        Returns
+        ----------
+        int
+            Data size in bytes
+
+        Raises
+        ----------
+        ValueError
+            If data is an iterable and `length` is not set
+        """
+        if self.length is not None:
+            return self.length
+
+        size = source_size(self.data)
+
+        if size is None:
+            raise ValueError(f"Length of attachment is unknown: {self.name}")
+
+        return size
+
+    def headers(self) -> bytes:
         """
-        Convert MultipartRelatedAttachment into request body part
+        Boundary and headers of request body part, which precede data
 
         Returns
         ---------
         bytes
-            Encoded part of request body
+            Encoded part headers
         """
         if self.mime_type == b"application/json":
             return b"".join(
@@ -78,7 +112,6 @@ class MultipartRelatedAttachment:
                     self.mime_type,
                     new_line,
                     new_line,
-                    self.data,
                 ]
             )
 
@@ -95,13 +128,24 @@ class MultipartRelatedAttachment:
                 self.mime_type,
                 new_line,
                 b"Content-Length: ",
-                str(len(self.data)).encode(),
+                str(self.size).encode(),
                 new_line,
                 new_line,
-                self.data,
             ]
         )
 
+    def encode(self) -> bytes:
+        """
+        Convert MultipartRelatedAttachment into request body part. Data has
+        to be in memory, use `MultipartRelated.iter_dump` for streamed data
+
+        Returns
+        ---------
+        bytes
+            Encoded part of request body
+        """
+        return self.headers() + self.data
+
     @property
     def as_dict(self) -> dict:
         """
@@ -114,7 +158,7 @@ class MultipartRelatedAttachment:
             Short attachment description
         """
         return dict(
-            follows=True, content_type=self.mime_type.decode(), length=len(self.data)
+            follows=True, content_type=self.mime_type.decode(), length=self.size
         )
 
     def json(self) -> dict:
@@ -126,7 +170,250 @@ class MultipartRelatedAttachment:
         dict
             Json loaded data
         """
-        return json.loads(self.data)
+        return self.codec.loads(self.data)
+
+
+def content_type_boundary(content_type: str | bytes) -> bytes:
+    """
+    Read boundary parameter of multipart Content-Type header
+
+    Parameters
+    ----------
+    content_type: str | bytes
+        Header value, e.g. `multipart/related; boundary="abc"`
+
+    Returns
+    ----------
+    bytes
+        Boundary without leading dashes
+
+    Raises
+    ----------
+    ValueError
+        If header has no boundary
+    """
+    if isinstance(content_type, str):
+        content_type = content_type.encode()
+
+    for param in content_type.split(b";")[1:]:
+        name, _, value = param.strip().partition(b"=")
+
+        if name.lower() == b"boundary" and value:
+            return value.strip(b'"')
+
+    raise ValueError(f"Boundary is not specified: {content_type}")
+
+
+class MultipartParser:
+    """
+    Incremental multipart body parser. Body is fed chunk by chunk, parts
+    are returned as soon as their closing boundary is received, so memory
+    usage is limited by the biggest part. Every byte is scanned once, parts
+    with Content-Length header are not scanned at all. Data of parts are
+    memoryviews of received chunks, parts which don't cross chunk borders
+    are not copied
+    """
+
+    def __init__(self, boundary: bytes):
+        """
+        Parameters
+        ----------
+        boundary: bytes
+            Boundary without leading dashes, see `content_type_boundary`
+        """
+        self.delimiter = new_line + b"--" + boundary
+        self.finished = False
+        """True when closing boundary is received"""
+
+        # Unprocessed data is concatenation of `_chunks` starting from
+        # `_start`, pattern can't be found before `_scanned`
+        self._chunks: typing.List[bytes | memoryview] = []
+        self._size = 0
+        self._start = 0
+        self._scanned = 0
+
+        self._state = self._preamble
+        self._part: MultipartRelatedAttachment = None
+
+    def feed(
+        self, chunk: bytes | memoryview
+    ) -> typing.List[MultipartRelatedAttachment]:
+        """
+        Parse next chunk of body
+
+        Parameters
+        ----------
+        chunk: bytes | memoryview
+            Body chunk
+
+        Returns
+        ----------
+        typing.List[MultipartRelatedAttachment]
+            Parts completed by this chunk
+        """
+        parts = []
+
+        if not isinstance(chunk, bytes):
+            chunk = bytes(chunk)
+
+        if chunk and not self.finished:
+            self._chunks.append(chunk)
+            self._size += len(chunk)
+
+        while not self.finished and self._state(parts):
+            pass
+
+        return parts
+
+    def close(self):
+        """
+        Check that whole body was received
+
+        Raises
+        ----------
+        ValueError
+            If body is truncated
+        """
+        if not self.finished:
+            raise ValueError("Multipart body is incomplete")
+
+    def _preamble(self, parts: list) -> bool:
+        # First boundary may be not preceded by new line
+        position = self._find(self.delimiter[2:])
+
+        if position is None:
+            return False
+
+        self._consume(position + len(self.delimiter) - 2)
+        self._state = self._boundary_end
+        return True
+
+    def _boundary_end(self, parts: list) -> bool:
+        if self._size - self._start < 2:
+            return False
+
+        if self._slice(self._start, self._start + 2) == b"--":
+            self.finished = True
+            self._chunks = []
+            return False
+
+        self._state = self._headers
+        return True
+
+    def _headers(self, parts: list) -> bool:
+        # Rest of boundary line, headers and blank line
+        position = self._find(new_line * 2)
+
+        if position is None:
+            return False
+
+        lines = self._slice(self._start, position).split(new_line)[1:]
+        self._consume(position + 4)
+        self._part = part = MultipartRelatedAttachment()
+
+        for line in lines:
+            name, _, value = line.partition(b":")
+            name, value = name.strip().lower(), value.strip()
+
+            if name == b"content-type":
+                part.mime_type = value
+
+            elif name == b"content-disposition":
+                filename = MultipartRelated.pattern_filename.findall(value)
+                part.name = filename[0] if filename else None
+
+            elif name == b"content-encoding":
+                part.encoding = value
+
+            elif name == b"content-length" and value.isdigit():
+                part.length = int(value)
+
+        self._state = self._body
+        return True
+
+    def _body(self, parts: list) -> bool:
+        position = None
+        length = self._part.length
+
+        if length is not None:
+            # Boundary position is known, no need to scan the data
+            end = self._start + length
+
+            if self._size < end + len(self.delimiter):
+                return False
+
+            if self._slice(end, end + len(self.delimiter)) == self.delimiter:
+                position = end
+
+        if position is None:
+            position = self._find(self.delimiter)
+
+            if position is None:
+                return False
+
+        self._part.data = self._take(position, len(self.delimiter))
+        parts.append(self._part)
+        self._state = self._boundary_end
+        return True
+
+    def _find(self, pattern: bytes) -> int | None:
+        # Only data received after the last unsuccessful search is scanned
+        if len(self._chunks) == 1:
+            position = self._chunks[0].find(pattern, self._scanned)
+        else:
+            window = self._slice(self._scanned, self._size)
+            position = window.find(pattern)
+            position = position if position < 0 else position + self._scanned
+
+        if position < 0:
+            self._scanned = max(self._scanned, self._size - len(pattern) + 1)
+            return None
+
+        return position
+
+    def _slice(self, start: int, end: int) -> bytes:
+        # Bytes between absolute positions. Slices are taken near the end
+        # of received data, so chunks are walked backwards
+        result, chunk_end = [], self._size
+
+        for chunk in reversed(self._chunks):
+            chunk_start = chunk_end - len(chunk)
+
+            if chunk_start < end and chunk_end > start:
+                result.append(chunk[max(start - chunk_start, 0) : end - chunk_start])
+
+            if chunk_start <= start:
+                break
+
+            chunk_end = chunk_start
+
+        return b"".join(reversed(result))
+
+    def _take(self, end: int, skip: int) -> memoryview:
+        # Data up to `end` position, `skip` bytes after it are dropped too
+        if len(self._chunks) > 1:
+            # Part crosses chunks borders, processed data is not copied
+            self._chunks[0] = memoryview(self._chunks[0])[self._start :]
+            joined = b"".join(self._chunks)
+            self._chunks = [joined]
+            self._size -= self._start
+            self._scanned -= self._start
+            end -= self._start
+            self._start = 0
+
+        data = memoryview(self._chunks[0])[self._start : end]
+        self._consume(end + skip)
+        return data
+
+    def _consume(self, end: int):
+        # Processed chunks are released
+        while self._chunks and len(self._chunks[0]) <= end:
+            length = len(self._chunks.pop(0))
+            self._size -= length
+            end -= length
+
+        self._start = end
+        self._scanned = end
 
 
 class MultipartRelated:
@@ -134,47 +421,66 @@ class MultipartRelated:
     CouchDb MultipartRelated Content-Type. Parse and made request body
     """
 
-    pattern = re.compile(
-        b"\\n(?P<name>[\w-]*?):\s(?P<value>.*?)" b"\\r|\\n\\r\\n(?P<content>.*?)\\r\\n"
-    )
-    # Parse request body
-
     pattern_filename = re.compile(b'.*filename="(.*)"')
     # Find name of attachment in Content-Disposition header
 
     @classmethod
-    def load(cls, data: bytes) -> typing.List[MultipartRelatedAttachment]:
+    def load(
+        cls, data: bytes | memoryview, boundary: bytes = multipart_boundary[2:]
+    ) -> typing.List[MultipartRelatedAttachment]:
         """
-        Parse binary data
+        Parse binary data. Data of parts are memoryviews of `data`
 
         Parameters
         ----------
-        data: bytes
+        data: bytes | memoryview
             Request body
 
+        boundary: bytes = multipart_boundary[2:]
+            Boundary from Content-Type header, see `content_type_boundary`
+
         Returns
         ----------
         typing.List[MultipartRelatedAttachment]
             List of parsed attachments
         """
-        result = re.findall(cls.pattern, data)
-        multipart_related_obj = MultipartRelatedAttachment()
+        parser = MultipartParser(boundary)
+        return parser.feed(data)
 
-        for header_name, header_value, content in result:
-            if header_name == b"Content-Type":
-                multipart_related_obj.mime_type = header_value
+    @classmethod
+    async def iter_load(
+        cls,
+        chunks: typing.AsyncIterable[bytes] | typing.Iterable[bytes],
+        boundary: bytes = multipart_boundary[2:],
+    ) -> typing.AsyncIterator[MultipartRelatedAttachment]:
+        """
+        Parse body while it's received
+
+        Parameters
+        ----------
+        chunks: typing.AsyncIterable[bytes] | typing.Iterable[bytes]
+            Body chunks, e.g. `data` of streamed response
+
+        boundary: bytes = multipart_boundary[2:]
+            Boundary from Content-Type header, see `content_type_boundary`
+
+        Returns
+        ----------
+        typing.AsyncIterator[MultipartRelatedAttachment]
+            Parts in order of appearance
 
-            elif header_name == b"Content-Disposition":
-                name = re.findall(cls.pattern_filename, header_value)[0]
-                multipart_related_obj.name = name
+        Raises
+        ----------
+        ValueError
+            If body is truncated
+        """
+        parser = MultipartParser(boundary)
 
-            elif header_name == b"Content-Encoding":
-                multipart_related_obj.encoding = header_value
+        async for chunk in iterate(chunks):
+            for part in parser.feed(chunk):
+                yield part
 
-            elif content:
-                multipart_related_obj.data = content
-                yield multipart_related_obj
-                multipart_related_obj = MultipartRelatedAttachment()
+        parser.close()
 
     @classmethod
     def dump(cls, attachments=typing.List[MultipartRelatedAttachment]) -> bytes:
@@ -192,4 +498,69 @@ class MultipartRelated:
             Bytes of encoded attachments
         """
         result = b"".join(list(map(lambda x: x.encode(), attachments)))
-        return result + new_line + multipart_boundary + b"--"
+        return result + closing_boundary
+
+    @classmethod
+    async def iter_dump(
+        cls,
+        attachments: typing.List[MultipartRelatedAttachment],
+        chunk_size: int = 64 * 1024,
+        use_mmap: bool = False,
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Same as `dump`, but body is produced part by part. Attachments data
+        is read from files and iterables chunk by chunk, in-memory data is
+        not copied
+
+        Parameters
+        ----------
+        attachments: typing.List[MultipartRelatedAttachment]
+            List of attachments to encode
+
+        chunk_size: int = 64 * 1024
+            Size of chunks read from files
+
+        use_mmap: bool = False
+            Map local files into memory instead of reading them in a worker
+            thread
+
+        Returns
+        ----------
+        typing.AsyncIterator[bytes]
+            Chunks of request body
+        """
+        for attachment in attachments:
+            yield attachment.headers()
+            data, _ = byte_source(attachment.data, chunk_size, use_mmap)
+
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                yield data
+                continue
+
+            async for chunk in data:
+                yield chunk
+
+        yield closing_boundary
+
+    @classmethod
+    def dump_length(cls, attachments: typing.List[MultipartRelatedAttachment]) -> int:
+        """
+        Size of body made by `dump` or `iter_dump`, without encoding it
+
+        Parameters
+        ----------
+        attachments: typing.List[MultipartRelatedAttachment]
+            List of attachments to encode
+
+        Returns
+        ----------
+        int
+            Body size in bytes
+
+        Raises
+        ----------
+        ValueError
+            If size of some attachment is unknown
+        """
+        parts = sum(len(x.headers()) + x.size for x in attachments)
+        return parts + len(closing_boundary)
@@ -0,0 +1,322 @@
+import re
+import typing
+
+from async_couch.codecs import default_codec
+
+
+token_pattern = re.compile(b'["\\[\\]{}]')
+# Structural characters which change the parser state
+
+string_end_pattern = re.compile(b'["\\\\]')
+# Closing quote or escape sequence inside of a string
+
+
+class JsonArrayParser:
+    """
+    Incremental parser for CouchDB list responses. Items of the top level
+    array stored under `key` (`rows` for views, `docs` for mango queries,
+    `results` for changes) are decoded one by one while the body arrives,
+    everything else is collected into `meta`
+    """
+
+    BEFORE, INSIDE, AFTER = range(3)
+
+    def __init__(
+        self, key: bytes = b"rows", loads: typing.Callable = default_codec.loads
+    ):
+        self.key = key
+        self.loads = loads
+
+        self.meta: dict = dict()
+        """Top level fields of response except of parsed array"""
+
+        self._buffer = bytearray()
+        self._head = b""
+        self._state = self.BEFORE
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._last_string = None
+        self._last_string_end = 0
+        self._item_start = None
+        self._tail_start = 0
+
+    def feed(self, chunk: bytes) -> typing.List[typing.Any]:
+        """
+        Parse next part of response body
+
+        Parameters
+        ----------
+        chunk: bytes
+            Next part of response body
+
+        Returns
+        ----------
+        typing.List[typing.Any]
+            Array items completed by this chunk
+        """
+        buffer = self._buffer
+        buffer += chunk
+
+        if self._state == self.AFTER:
+            return []
+
+        items = []
+        pos = self._pos
+
+        while pos < len(buffer):
+            if self._in_string:
+                match = string_end_pattern.search(buffer, pos)
+
+                if not match:
+                    pos = len(buffer)
+                    break
+
+                if buffer[match.start()] == 0x5C:  # backslash
+                    if match.end() == len(buffer):
+                        pos = match.start()
+                        break
+
+                    pos = match.end() + 1
+                    continue
+
+                self._in_string = False
+                pos = match.end()
+
+                if self._depth == 1:
+                    self._last_string = bytes(
+                        buffer[self._string_start : match.start()]
+                    )
+                    self._last_string_end = pos
+
+                continue
+
+            match = token_pattern.search(buffer, pos)
+
+            if not match:
+                pos = len(buffer)
+                break
+
+            char = buffer[match.start()]
+            pos = match.end()
+
+            if char == 0x22:  # quote
+                self._in_string = True
+                self._string_start = pos
+
+            elif char in b"[{":
+                if (
+                    self._state == self.BEFORE
+                    and self._depth == 1
+                    and char == 0x5B
+                    and self._last_string == self.key
+                    and self._is_key_value(buffer, match.start())
+                ):
+                    self._state = self.INSIDE
+                    self._head = bytes(buffer[:pos])
+                    del buffer[:pos]
+                    pos = 0
+
+                elif self._state == self.INSIDE and self._depth == 2:
+                    self._item_start = match.start()
+
+                self._depth += 1
+
+            else:
+                self._depth -= 1
+
+                if self._state != self.INSIDE:
+                    continue
+
+                if self._depth == 2 and self._item_start is not None:
+                    items.append(self.loads(bytes(buffer[self._item_start : pos])))
+                    self._item_start = None
+
+                elif self._depth == 1:
+                    self._state = self.AFTER
+                    self._tail_start = match.start()
+                    break
+
+        if self._state == self.INSIDE:
+            # Drop parsed items, keep only unfinished one
+            keep_from = pos if self._item_start is None else self._item_start
+            del buffer[:keep_from]
+            pos -= keep_from
+
+            if self._item_start is not None:
+                self._item_start = 0
+
+        self._pos = pos
+        return items
+
+    def _is_key_value(self, buffer: bytearray, start: int) -> bool:
+        # Only a colon separates object key from its value, a string value
+        # equal to the key is followed by a comma or bracket
+        return buffer[self._last_string_end : start].strip() == b":"
+
+    def close(self) -> dict:
+        """
+        Finish parsing and decode response fields around of the array
+
+        Returns
+        ----------
+        dict
+            Response fields except of the array
+        """
+        if self._state == self.BEFORE:
+            body = bytes(self._buffer)
+        else:
+            body = self._head + bytes(self._buffer[self._tail_start :])
+
+        self.meta = self.loads(body) if body.strip() else dict()
+        self.meta.pop(self.key.decode(), None)
+        self._buffer = bytearray()
+        return self.meta
+
+
+class JsonLinesParser:
+    """
+    Incremental parser for newline delimited JSON, e.g. continuous changes
+    feed. Empty lines (heartbeats) are skipped
+    """
+
+    def __init__(self, loads: typing.Callable = default_codec.loads):
+        self.loads = loads
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> typing.List[typing.Any]:
+        """
+        Parse next part of response body
+
+        Parameters
+        ----------
+        chunk: bytes
+            Next part of response body
+
+        Returns
+        ----------
+        typing.List[typing.Any]
+            Objects of lines completed by this chunk
+        """
+        buffer = self._buffer
+        start = len(buffer)
+        buffer += chunk
+        end = buffer.rfind(b"\n", start)
+
+        if end < 0:
+            return []
+
+        items = [self.loads(line) for line in buffer[:end].split(b"\n") if line.strip()]
+        del buffer[: end + 1]
+        return items
+
+    def close(self) -> typing.List[typing.Any]:
+        """
+        Decode last line if it isn't terminated
+
+        Returns
+        ----------
+        typing.List[typing.Any]
+            Object of the last line, if any
+        """
+        rest, self._buffer = self._buffer, bytearray()
+        return [self.loads(rest)] if rest.strip() else []
+
+
+class EventStreamParser:
+    """
+    Incremental parser for `text/event-stream` with JSON data, e.g.
+    eventsource changes feed. Events without data (heartbeats) are skipped
+    """
+
+    def __init__(self, loads: typing.Callable = default_codec.loads):
+        self.loads = loads
+
+        self.last_event_id: str | None = None
+        """Value of the last `id` field"""
+
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> typing.List[typing.Any]:
+        """
+        Parse next part of response body
+
+        Parameters
+        ----------
+        chunk: bytes
+            Next part of response body
+
+        Returns
+        ----------
+        typing.List[typing.Any]
+            Data of events completed by this chunk
+        """
+        buffer = self._buffer
+        # Event separator may be split between chunks
+        search_from = max(len(buffer) - 1, 0)
+        buffer += chunk
+        events, pos = [], 0
+
+        while True:
+            end = buffer.find(b"\n\n", max(pos, search_from))
+
+            if end < 0:
+                break
+
+            event = self.parse_event(buffer[pos:end])
+
+            if event is not None:
+                events.append(event)
+
+            pos = end + 2
+
+        del buffer[:pos]
+        return events
+
+    def parse_event(self, block: bytes) -> typing.Any:
+        data = []
+
+        for line in block.split(b"\n"):
+            name, _, value = line.rstrip(b"\r").partition(b":")
+
+            if value.startswith(b" "):
+                value = value[1:]
+
+            if name == b"data":
+                data.append(value)
+            elif name == b"id":
+                self.last_event_id = value.decode()
+
+        data = b"\n".join(data)
+        return self.loads(data) if data.strip() else None
+
+
+class JsonRowStream:
+    """
+    Asynchronous iterator over items of streamed CouchDB list response.
+    Response fields outside of the array (`total_rows`, `offset`,
+    `update_seq`, `bookmark`, etc.) are available in `meta` once iteration
+    is finished
+    """
+
+    def __init__(
+        self,
+        response,
+        key: bytes = b"rows",
+        loads: typing.Callable = default_codec.loads,
+    ):
+        self.response = response
+        """Streamed `UniversalResponse`, `data` is an async bytes iterator"""
+
+        self.meta: dict = dict()
+        """Top level fields of response except of parsed array"""
+
+        self._parser = JsonArrayParser(key, loads)
+
+    async def __aiter__(self) -> typing.AsyncIterator[typing.Any]:
+        async for chunk in self.response.data:
+            for item in self._parser.feed(chunk):
+                yield item
+
+        self.meta = self._parser.close()
@@ -0,0 +1,131 @@
+import collections
+import time
+import typing
+
+
+class LRUCache:
+    """
+    Mapping bounded by number of entries and total size of their values.
+    Least recently used entries are evicted first, entries older than `ttl`
+    are dropped on access
+    """
+
+    def __init__(
+        self, max_entries: int = 1000, max_bytes: int = None, ttl: float = None
+    ):
+        """
+        Parameters
+        ----------
+        max_entries: int = 1000
+            Maximum number of entries
+
+        max_bytes: int = None
+            Maximum total size of entries, sizes are passed to `set`
+
+        ttl: float = None
+            Seconds after which entry expires. Entries don't expire if None
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self.size = 0
+        """Total size of entries"""
+
+        self._entries: collections.OrderedDict[
+            typing.Hashable, typing.Tuple[typing.Any, int, float]
+        ] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """
+        Get value and mark entry as recently used
+
+        Parameters
+        ----------
+        key: typing.Hashable
+            Entry key
+
+        default: typing.Any = None
+            Value returned if entry is missing or expired
+
+        Returns
+        ----------
+        typing.Any
+            Entry value
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return default
+
+        if self.ttl is not None and time.monotonic() - entry[2] >= self.ttl:
+            self.pop(key)
+            return default
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: typing.Hashable, value: typing.Any, size: int = 0):
+        """
+        Add or replace entry, evicting least recently used entries if limits
+        are exceeded. Value larger than `max_bytes` isn't stored
+
+        Parameters
+        ----------
+        key: typing.Hashable
+            Entry key
+
+        value: typing.Any
+            Entry value
+
+        size: int = 0
+            Entry size
+        """
+        self.pop(key)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        self._entries[key] = (value, size, time.monotonic())
+        self.size += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.size > self.max_bytes
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def pop(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """
+        Remove entry
+
+        Parameters
+        ----------
+        key: typing.Hashable
+            Entry key
+
+        default: typing.Any = None
+            Value returned if entry is missing
+
+        Returns
+        ----------
+        typing.Any
+            Removed value
+        """
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return default
+
+        self.size -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
@@ -0,0 +1,90 @@
+import time
+import typing
+
+from dataclasses import dataclass
+
+from async_couch import types
+from async_couch.codecs import JsonCodec
+
+
+@dataclass
+class CachedResponse:
+    """
+    Encoded JSON body of cached response
+    """
+
+    etag: str | None
+    """Response version token"""
+
+    data: bytes
+    """Encoded response body"""
+
+    validated_at: float
+    """Time of last confirmation by server"""
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.validated_at < ttl
+
+    def to_response(
+        self, model: typing.Any, codec: JsonCodec
+    ) -> types.UniversalResponse:
+        """
+        Build response as if it was received from server. Every call decodes
+        the body again, so callers don't share mutable models
+
+        Parameters
+        ----------
+        model: typing.Any
+            Response model class with `load` method
+
+        codec: JsonCodec
+            Codec to decode the body with
+
+        Returns
+        ----------
+        `UniversalResponse`
+            Response with status 200
+        """
+        headers = {"content-type": "application/json"}
+
+        if self.etag:
+            headers["etag"] = self.etag
+
+        response = types.UniversalResponse(
+            status_code=200, headers=headers, data=self.data, codec=codec
+        )
+        response.model = model.load(response)
+        return response
+
+
+class ResponseCache:
+    """
+    Base of caches which keep `CachedResponse` entries and count reads
+    """
+
+    def __init__(self, client):
+        """
+        Parameters
+        ----------
+        client: CouchClient
+            Client to send requests with
+        """
+        self.client = client
+
+        self.hits = 0
+        """Reads served from cache, including revalidated ones"""
+
+        self.misses = 0
+        """Reads which received response body"""
+
+    @staticmethod
+    def is_cacheable(response: types.UniversalResponse) -> bool:
+        return (
+            response.status_code == 200
+            and response.data is not None
+            and response.headers.get("content-type") == "application/json"
+        )
+
+    def _hit(self, entry: CachedResponse, model: typing.Any) -> types.UniversalResponse:
+        self.hits += 1
+        return entry.to_response(model, self.client.http_client.codec)
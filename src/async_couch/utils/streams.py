@@ -0,0 +1,570 @@
+import contextlib
+import hashlib
+import inspect
+import io
+import mmap
+import os
+import typing
+
+import anyio
+
+from anyio.streams.memory import MemoryObjectSendStream
+
+
+async def iterate(
+    items: typing.Iterable[typing.Any] | typing.AsyncIterable[typing.Any],
+) -> typing.AsyncIterator[typing.Any]:
+    """
+    Iterate over sync or async iterable in the same way
+
+    Parameters
+    ----------
+    items: typing.Iterable | typing.AsyncIterable
+        Items source
+
+    Returns
+    ----------
+    typing.AsyncIterator[typing.Any]
+        Async iterator over items
+    """
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+ByteSource = typing.Union[
+    bytes,
+    bytearray,
+    memoryview,
+    str,
+    os.PathLike,
+    typing.BinaryIO,
+    typing.AsyncIterable[bytes],
+    typing.Iterable[bytes],
+]
+"""Request body: bytes, file path, file object or (async) iterable of chunks"""
+
+
+def byte_source(
+    data: ByteSource, chunk_size: int = 64 * 1024, use_mmap: bool = False
+) -> typing.Tuple[bytes | typing.AsyncIterator[bytes], int | None]:
+    """
+    Prepare request body which is read chunk by chunk while it's sent, so
+    memory usage doesn't depend on its size. In-memory data is returned as
+    is
+
+    Parameters
+    ----------
+    data: ByteSource
+        Bytes, path of local file, file object (sync or async) or iterable
+        of chunks
+
+    chunk_size: int = 64 * 1024
+        Size of chunks read from files
+
+    use_mmap: bool = False
+        Map local file into memory instead of reading it in a worker thread.
+        Chunks are memoryviews of the mapping, they are valid until next
+        chunk is requested
+
+    Returns
+    ----------
+    typing.Tuple[bytes | typing.AsyncIterator[bytes], int | None]
+        Body and its size, if it's known
+
+    Raises
+    ----------
+    TypeError:
+        If data type is not supported
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data, len(data)
+
+    if isinstance(data, (str, os.PathLike)):
+        return read_file(data, chunk_size, use_mmap), os.stat(data).st_size
+
+    if hasattr(data, "read"):
+        return read_file_object(data, chunk_size), file_object_size(data)
+
+    if hasattr(data, "__aiter__") or hasattr(data, "__iter__"):
+        return iterate(data), None
+
+    raise TypeError(f"Unsupported body type: {type(data).__name__}")
+
+
+def source_size(data: ByteSource) -> int | None:
+    """
+    Size of request body without reading it
+
+    Parameters
+    ----------
+    data: ByteSource
+        Bytes, path of local file, file object or iterable of chunks
+
+    Returns
+    ----------
+    int | None
+        Size in bytes, None for iterables and unseekable files
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return len(data)
+
+    if isinstance(data, (str, os.PathLike)):
+        return os.stat(data).st_size
+
+    if hasattr(data, "read"):
+        return file_object_size(data)
+
+    return None
+
+
+async def read_file(
+    path: str | os.PathLike, chunk_size: int = 64 * 1024, use_mmap: bool = False
+) -> typing.AsyncIterator[bytes | memoryview]:
+    """
+    Read local file chunk by chunk without blocking event loop
+
+    Parameters
+    ----------
+    path: str | os.PathLike
+        File path
+
+    chunk_size: int = 64 * 1024
+        Size of chunks
+
+    use_mmap: bool = False
+        Yield memoryviews of memory mapped file, valid until next chunk is
+        requested
+
+    Returns
+    ----------
+    typing.AsyncIterator[bytes | memoryview]
+        File chunks
+    """
+    if not use_mmap:
+        async with await anyio.open_file(path, "rb") as file:
+            while chunk := await file.read(chunk_size):
+                yield chunk
+
+        return
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        if not size:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, size, chunk_size):
+                # Mapping can't be closed while its views exist
+                with memoryview(mapped)[start : start + chunk_size] as chunk:
+                    yield chunk
+
+
+async def read_file_object(
+    file: typing.Any, chunk_size: int = 64 * 1024
+) -> typing.AsyncIterator[bytes]:
+    """
+    Read file object chunk by chunk. Blocking `read` is called in worker
+    thread, async `read` is awaited
+
+    Parameters
+    ----------
+    file: typing.Any
+        Binary file object, sync or async
+
+    chunk_size: int = 64 * 1024
+        Size of chunks
+
+    Returns
+    ----------
+    typing.AsyncIterator[bytes]
+        File chunks
+    """
+    if inspect.iscoroutinefunction(file.read):
+        while chunk := await file.read(chunk_size):
+            yield chunk
+    else:
+        while chunk := await anyio.to_thread.run_sync(file.read, chunk_size):
+            yield chunk
+
+
+def file_object_size(file: typing.Any) -> int | None:
+    """
+    Size of file object data from current position to the end
+
+    Parameters
+    ----------
+    file: typing.Any
+        File object
+
+    Returns
+    ----------
+    int | None
+        Size or None if file isn't a regular file
+    """
+    try:
+        return os.fstat(file.fileno()).st_size - file.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+
+    if isinstance(file, io.BytesIO):
+        return file.getbuffer().nbytes - file.tell()
+
+    return None
+
+
+def split_chunks(
+    data: bytes | bytearray | memoryview, chunk_size: int = 64 * 1024
+) -> typing.Iterator[memoryview]:
+    """
+    Split in-memory data into chunks without copying
+
+    Parameters
+    ----------
+    data: bytes | bytearray | memoryview
+        Data to split
+
+    chunk_size: int = 64 * 1024
+        Size of chunks
+
+    Returns
+    ----------
+    typing.Iterator[memoryview]
+        Chunks
+    """
+    view = memoryview(data)
+
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
+
+
+async def track_progress(
+    chunks: typing.AsyncIterable[bytes],
+    callback: typing.Callable[[int, int | None], typing.Any],
+    total: int = None,
+) -> typing.AsyncIterator[bytes]:
+    """
+    Report number of passed bytes after every chunk is consumed
+
+    Parameters
+    ----------
+    chunks: typing.AsyncIterable[bytes]
+        Source chunks
+
+    callback: typing.Callable[[int, int | None], typing.Any]
+        Function which receives number of passed bytes and total size.
+        Coroutine functions are awaited
+
+    total: int = None
+        Total size, if it's known
+
+    Returns
+    ----------
+    typing.AsyncIterator[bytes]
+        Same chunks
+    """
+    passed = 0
+
+    async for chunk in chunks:
+        size = len(chunk)
+        yield chunk
+
+        passed += size
+        result = callback(passed, total)
+
+        if inspect.isawaitable(result):
+            await result
+
+
+async def write_chunks(
+    chunks: typing.AsyncIterable[bytes],
+    destination: str | os.PathLike | typing.BinaryIO,
+) -> int:
+    """
+    Write chunks into local file or file object without blocking event
+    loop. Blocking `write` of file object is called in worker thread,
+    async `write` is awaited
+
+    Parameters
+    ----------
+    chunks: typing.AsyncIterable[bytes]
+        Data chunks
+
+    destination: str | os.PathLike | typing.BinaryIO
+        File path (file is created or truncated) or binary file object,
+        sync or async
+
+    Returns
+    ----------
+    int
+        Number of written bytes
+    """
+    written = 0
+
+    if isinstance(destination, (str, os.PathLike)):
+        async with await anyio.open_file(destination, "wb") as file:
+            async for chunk in chunks:
+                await file.write(chunk)
+                written += len(chunk)
+
+        return written
+
+    if inspect.iscoroutinefunction(destination.write):
+        write = destination.write
+    else:
+
+        async def write(chunk: bytes):
+            await anyio.to_thread.run_sync(destination.write, chunk)
+
+    async for chunk in chunks:
+        await write(chunk)
+        written += len(chunk)
+
+    return written
+
+
+class OffsetWriter:
+    """
+    Writes chunks at given offsets of local file, file object or
+    preallocated buffer, so parts of data can be received concurrently and
+    in any order. Local file is created with full size beforehand
+    """
+
+    def __init__(
+        self,
+        destination: str | os.PathLike | typing.BinaryIO | bytearray | memoryview,
+        size: int,
+    ):
+        """
+        Parameters
+        ----------
+        destination: str | os.PathLike | typing.BinaryIO | bytearray | memoryview
+            File path, seekable binary file object or writable buffer of at
+            least `size` bytes
+
+        size: int
+            Total size of data
+
+        Raises
+        ----------
+        ValueError:
+            If buffer is smaller than `size`
+        """
+        self.destination = destination
+        self.size = size
+        self._lock = anyio.Lock()
+        self._buffer: memoryview | None = None
+
+        if isinstance(destination, (bytearray, memoryview)):
+            self._buffer = memoryview(destination).cast("B")
+
+            if len(self._buffer) < size:
+                raise ValueError("Buffer is smaller than data")
+
+    @property
+    def is_path(self) -> bool:
+        return isinstance(self.destination, (str, os.PathLike))
+
+    async def prepare(self):
+        """
+        Create local file of full size
+        """
+        if self.is_path:
+            async with await anyio.open_file(self.destination, "wb") as file:
+                await file.truncate(self.size)
+
+    async def write(self, chunks: typing.AsyncIterable[bytes], offset: int) -> int:
+        """
+        Write chunks one after another starting from `offset`
+
+        Parameters
+        ----------
+        chunks: typing.AsyncIterable[bytes]
+            Data chunks
+
+        offset: int
+            Position of the first chunk
+
+        Returns
+        ----------
+        int
+            Number of written bytes
+        """
+        position = offset
+
+        if self._buffer is not None:
+            async for chunk in chunks:
+                self._buffer[position : position + len(chunk)] = chunk
+                position += len(chunk)
+
+        elif self.is_path:
+            async with await anyio.open_file(self.destination, "r+b") as file:
+                await file.seek(offset)
+
+                async for chunk in chunks:
+                    await file.write(chunk)
+                    position += len(chunk)
+
+        else:
+            async for chunk in chunks:
+                async with self._lock:
+                    await anyio.to_thread.run_sync(self._write_at, position, chunk)
+
+                position += len(chunk)
+
+        return position - offset
+
+    async def md5(self, chunk_size: int = 1024 * 1024) -> bytes:
+        """
+        Calculate MD5 digest of written data
+
+        Parameters
+        ----------
+        chunk_size: int = 1024 * 1024
+            Size of chunks to read file by
+
+        Returns
+        ----------
+        bytes
+            Binary digest
+        """
+        if self._buffer is not None:
+            data = self._buffer[: self.size]
+            return await anyio.to_thread.run_sync(lambda: hashlib.md5(data).digest())
+
+        digest = hashlib.md5()
+
+        if self.is_path:
+            async for chunk in read_file(self.destination, chunk_size):
+                digest.update(chunk)
+
+            return digest.digest()
+
+        async with self._lock:
+            await anyio.to_thread.run_sync(self.destination.seek, 0)
+
+            async for chunk in read_file_object(self.destination, chunk_size):
+                digest.update(chunk)
+
+        return digest.digest()
+
+    def _write_at(self, position: int, chunk: bytes):
+        self.destination.seek(position)
+        self.destination.write(chunk)
+
+
+class ProducerError:
+    """
+    Exception raised by background producer, passed to consumer
+    """
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+@contextlib.asynccontextmanager
+async def produce_in_background(
+    producer: typing.Callable[[MemoryObjectSendStream], typing.Awaitable[None]],
+    buffer: int = 0,
+) -> typing.AsyncIterator[typing.AsyncIterator[typing.Any]]:
+    """
+    Run producer in background task and iterate over items it sends.
+    Producer's exception is raised to consumer, producer is cancelled on
+    exit from context
+
+    Parameters
+    ----------
+    producer: typing.Callable[[MemoryObjectSendStream], typing.Awaitable]
+        Coroutine function which sends items into given stream
+
+    buffer: int = 0
+        Number of items producer can send ahead of consumer
+
+    Returns
+    ----------
+    typing.AsyncIterator[typing.Any]
+        Items sent by producer
+    """
+    async with gather_in_background([producer], buffer) as items:
+        yield items
+
+
+@contextlib.asynccontextmanager
+async def gather_in_background(
+    producers: typing.Sequence[
+        typing.Callable[[MemoryObjectSendStream], typing.Awaitable[None]]
+    ],
+    buffer: int = 0,
+    ordered: bool = False,
+) -> typing.AsyncIterator[typing.AsyncIterator[typing.Any]]:
+    """
+    Run producers concurrently in background tasks and iterate over items
+    they send. First exception of producers is raised to consumer,
+    producers are cancelled on exit from context
+
+    Parameters
+    ----------
+    producers: typing.Sequence[typing.Callable]
+        Coroutine functions which send items into given stream
+
+    buffer: int = 0
+        Number of items producers can send ahead of consumer. If `ordered`,
+        every producer has its own buffer
+
+    ordered: bool = False
+        Yield all items of the first producer, then of the second and so
+        on. Otherwise items are yielded as soon as they are sent
+
+    Returns
+    ----------
+    typing.AsyncIterator[typing.Any]
+        Items sent by producers
+    """
+    if ordered:
+        streams = [anyio.create_memory_object_stream(buffer) for _ in producers]
+        receivers = [receive for _, receive in streams]
+        senders = [send for send, _ in streams]
+    else:
+        send, receive = anyio.create_memory_object_stream(buffer)
+        receivers = [receive]
+
+        with send:
+            senders = [send.clone() for _ in producers]
+
+    async def run(producer, send):
+        async with send:
+            try:
+                await producer(send)
+            except Exception as error:
+                await send.send(ProducerError(error))
+
+    async def consume():
+        for receive in receivers:
+            async with receive:
+                async for item in receive:
+                    if isinstance(item, ProducerError):
+                        raise item.error
+
+                    yield item
+
+    # Consumer's error is raised after task group exit to avoid its
+    # wrapping into exception group
+    consumer_error = None
+
+    async with anyio.create_task_group() as tg:
+        for producer, send in zip(producers, senders):
+            tg.start_soon(run, producer, send)
+
+        try:
+            yield consume()
+        except Exception as error:
+            consumer_error = error
+        finally:
+            tg.cancel_scope.cancel()
+
+    if consumer_error is not None:
+        raise consumer_error
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+from async_couch import get_couch_client
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_session_auth(anyio_backend):
+    client = get_couch_client(
+        user=os.getenv("COUCHDB_USER"),
+        password=os.getenv("COUCHDB_PASSWORD"),
+        auth_method="session",
+    )
+
+    response = await client.db_exists("_users")
+    assert response.status_code == 200
+
+    response = await client.db_exists("_users")
+    assert response.status_code == 200
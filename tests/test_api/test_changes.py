@@ -0,0 +1,142 @@
+import anyio
+import pytest
+
+from async_couch import CouchClient
+from async_couch.clients.changes.cache import ChangesCache
+from async_couch.clients.changes.consumer import ChangesConsumer
+
+pytestmark = pytest.mark.anyio
+
+db_name = "test_changes_endpoint"
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def prepare_all(client: CouchClient):
+    response = await client.db_create(db_name)
+    assert response.status_code == 201
+
+    response = await client.db_bulk_docs(
+        db_name, [dict(_id=f"doc_{i}", val=i) for i in range(5)]
+    )
+    assert response.status_code == 201
+
+    yield
+
+    response = await client.db_delete(db_name)
+    assert response.status_code == 200
+
+
+async def test_changes(client: CouchClient):
+    response = await client.changes(db_name, include_docs=True)
+    assert response.status_code == 200
+    assert len(response.model.results) == 5
+    assert response.model.results[0]["doc"]["val"] is not None
+
+    response = await client.changes(db_name, doc_ids=["doc_1", "doc_2"])
+    assert response.status_code == 200
+    assert {row["id"] for row in response.model.results} == {"doc_1", "doc_2"}
+
+    response = await client.changes(db_name, selector={"val": {"$gt": 2}})
+    assert {row["id"] for row in response.model.results} == {"doc_3", "doc_4"}
+
+
+@pytest.mark.parametrize("feed", ["normal", "longpoll", "continuous", "eventsource"])
+async def test_changes_stream(client: CouchClient, feed: str):
+    async with client.changes_stream(
+        db_name, feed, limit=3, heartbeat=1000, style="all_docs"
+    ) as changes:
+        rows = [row async for row in changes]
+
+    assert len(rows) == 3
+    assert changes.last_seq is not None
+
+    async with client.changes_stream(
+        db_name, feed, since=changes.last_seq, timeout=100
+    ) as changes:
+        rows = [row async for row in changes]
+
+    assert len(rows) == 2
+
+
+async def test_changes_stream_seq_interval(client: CouchClient):
+    seq = None
+
+    async with client.changes_stream(
+        db_name, "continuous", seq_interval=2, timeout=100
+    ) as changes:
+        async for row in changes:
+            if row.get("seq") is not None:
+                seq = row["seq"]
+
+            assert changes.last_seq == seq
+
+    assert changes.last_seq is not None
+
+
+async def test_consumer(client: CouchClient):
+    processed = []
+
+    async def handle(change: dict):
+        processed.append(change["id"])
+
+    consumer = ChangesConsumer(client, db_name, handle, "test", follow=False)
+    await consumer.run()
+
+    assert sorted(processed) == [f"doc_{i}" for i in range(5)]
+    assert consumer.seq is not None
+
+    response = await client.doc_create_or_update(db_name, "doc_5", dict(val=5))
+    assert response.status_code == 201
+
+    processed.clear()
+    consumer = ChangesConsumer(client, db_name, handle, "test", follow=False)
+    await consumer.run()
+
+    assert processed == ["doc_5"]
+
+
+async def test_changes_cache(client: CouchClient):
+    cache = ChangesCache(client, db_name, refresh=True)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(cache.run)
+
+        with anyio.fail_after(5):
+            while not cache.live:
+                await anyio.sleep(0.01)
+
+        response = await cache.doc_get("doc_1")
+        assert response.status_code == 200
+
+        response = await cache.doc_get("doc_1")
+        assert response.model.doc == dict(val=1)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        response = await client.doc_create_or_update(
+            db_name, "doc_1", dict(val=10), rev=response.model._rev
+        )
+        assert response.status_code == 201
+
+        with anyio.fail_after(5):
+            while (await cache.doc_get("doc_1")).model.doc != dict(val=10):
+                await anyio.sleep(0.01)
+
+        tg.cancel_scope.cancel()
+
+
+async def test_changes_cache_view(client: CouchClient):
+    response = await client.doc_create_or_update(
+        db_name,
+        "_design/cache",
+        {"views": {"val": {"map": "function (doc) { emit(doc.val, null) }"}}},
+    )
+    assert response.status_code == 201
+
+    cache = ChangesCache(client, db_name, fallback_ttl=60.0)
+
+    for _ in range(2):
+        response = await cache.view_exec("cache", "val", keys=[2, 3], keys_chunk_size=1)
+        assert response.status_code == 200
+        assert [row["id"] for row in response.model.rows] == ["doc_2", "doc_3"]
+
+    assert (cache.hits, cache.misses) == (1, 1)
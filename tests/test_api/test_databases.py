@@ -58,6 +58,83 @@ async def test_design_docs(client: CouchClient):
     assert len(response.model.rows) == 1
 
 
+async def test_all_docs_columns(client: CouchClient):
+    result = await client.db_all_docs_columns(db_name, keys=[doc_id, "missing_doc"])
+    assert list(result.ids) == [doc_id, None]
+    assert list(result.keys) == [doc_id, "missing_doc"]
+
+
+async def test_all_docs_lookup(client: CouchClient):
+    keys = [doc_id, "missing_doc"] * 5
+
+    async with client.db_all_docs_lookup(db_name, keys, chunk_size=3) as rows:
+        result = [row async for row in rows]
+
+    assert [row["key"] for row in result] == keys
+    assert [row.get("error") for row in result[:2]] == [None, "not_found"]
+
+    result = await client.db_all_docs_lookup_dict(
+        db_name, keys, chunk_size=3, include_docs=True
+    )
+    assert list(result) == [doc_id, "missing_doc"]
+    assert result[doc_id]["doc"]["_id"] == doc_id
+
+
+async def test_all_docs_queries(client: CouchClient):
+    response = await client.db_all_docs_queries(
+        db_name, [dict(keys=[doc_id]), dict(key=doc_id, include_docs=True)]
+    )
+    assert response.status_code == 200
+    assert [len(result.rows) for result in response.model.results] == [1, 1]
+    assert response.model.results[1].rows[0]["doc"]["_id"] == doc_id
+
+    response = await client.db_design_docs_queries(db_name, [dict(), dict(limit=0)])
+    assert response.status_code == 200
+    assert len(response.model.results) == 2
+
+
+async def test_bulk_docs(client: CouchClient):
+    response = await client.db_bulk_docs(db_name, [dict(_id="bulk_doc"), dict(val=1)])
+    assert response.status_code == 201
+    assert len(response.model.results) == 2
+    assert response.model.results[0]["id"] == "bulk_doc"
+
+    response = await client.db_bulk_docs(db_name, [dict(_id="bulk_doc")])
+    assert response.status_code == 201
+    assert response.model.results[0]["error"] == "conflict"
+
+
+async def test_bulk_import(client: CouchClient):
+    async def docs():
+        for i in range(25):
+            yield dict(_id=f"imported_{i}", val=i)
+
+    async with client.db_bulk_import(
+        db_name, docs(), batch_size=10, concurrency=2
+    ) as results:
+        ids = [result["id"] async for result in results if "error" not in result]
+
+    assert sorted(ids) == sorted(f"imported_{i}" for i in range(25))
+
+
+async def test_find(client: CouchClient):
+    selector = {"_id": {"$regex": "^imported_"}}
+
+    response = await client.db_find(db_name, selector, limit=10)
+    assert response.status_code == 200
+    assert len(response.model.docs) == 10
+    assert response.model.bookmark
+
+    async with client.db_find_iter(
+        db_name, selector, page_size=10, execution_stats=True
+    ) as docs:
+        ids = [doc["_id"] async for doc in docs]
+
+    assert sorted(ids) == sorted(f"imported_{i}" for i in range(25))
+    assert docs.pages >= 3
+    assert docs.execution_stats["results_returned"] == 25
+
+
 async def test_delete(client: CouchClient):
     response = await client.db_delete(db_name)
     assert response.status_code == 200
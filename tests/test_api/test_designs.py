@@ -1,12 +1,21 @@
 import pytest
 
 from async_couch import CouchClient
+from async_couch.clients.designs.cache import ViewCache
 
 pytestmark = pytest.mark.anyio
 
 db_name = "test_design_document_endpoint"
 design_name = "test_design_doc"
-design_body = {"views": {"test_view": {"map": "function (doc) { emit(1, 1) }"}}}
+design_body = {
+    "views": {
+        "test_view": {"map": "function (doc) { emit(1, 1) }"},
+        "test_reduce_view": {
+            "map": "function (doc) { if (doc.n) emit([doc.n % 3, doc.n], 1) }",
+            "reduce": "_count",
+        },
+    }
+}
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -38,3 +47,120 @@ async def test_view_exec(client: CouchClient):
 
     assert result.status_code == 200
     assert result.model.total_rows == 0
+
+
+async def test_view_queries(client: CouchClient):
+    result = await client.view_queries(
+        db_name, design_name, "test_view", [dict(), dict(key=2), dict(limit=0)]
+    )
+
+    assert result.status_code == 200
+    assert [len(item.rows) for item in result.model.results] == [0, 0, 0]
+
+
+async def test_view_cache(client: CouchClient):
+    cache = ViewCache(client, stale_budget=60.0)
+    expected = await client.view_exec(db_name, design_name, "test_view")
+
+    for _ in range(3):
+        result = await cache.view_exec(db_name, design_name, "test_view")
+        assert result.status_code == 200
+        assert result.model.rows == expected.model.rows
+
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    result = await cache.db_all_docs(db_name, limit=1)
+    assert result.status_code == 200
+    assert len(result.model.rows) == 1
+
+
+async def test_view_columns(client: CouchClient):
+    expected = await client.view_exec(db_name, design_name, "test_view")
+    result = await client.view_columns(db_name, design_name, "test_view")
+
+    assert len(result) == len(expected.model.rows)
+    assert result.total_rows == expected.model.total_rows
+    assert list(result.ids) == [row["id"] for row in expected.model.rows]
+    assert list(result.values) == [row["value"] for row in expected.model.rows]
+    assert result.values.numeric
+
+
+async def test_view_stream(client: CouchClient):
+    async with client.view_stream(db_name, design_name, "test_view") as rows:
+        result = [row async for row in rows]
+
+    assert result == []
+    assert rows.meta.get("total_rows") == 0
+
+
+async def test_view_paginate(client: CouchClient):
+    response = await client.db_bulk_docs(db_name, [dict(val=i) for i in range(5)])
+    assert response.status_code == 201
+
+    async with client.view_paginate(
+        db_name, design_name, "test_view", page_size=2
+    ) as rows:
+        result = [row async for row in rows]
+
+    assert len(result) == 5
+    assert len({row["id"] for row in result}) == 5
+
+
+async def test_view_exec_many_keys(client: CouchClient):
+    result = await client.view_exec(db_name, design_name, "test_view", keys=[1])
+    expected = [row["id"] for row in result.model.rows]
+
+    result = await client.view_exec(
+        db_name, design_name, "test_view", keys=[1, 2] * 600, keys_chunk_size=500
+    )
+    assert result.status_code == 200
+    assert [row["id"] for row in result.model.rows] == expected * 600
+
+
+async def test_view_scan(client: CouchClient):
+    result = await client.view_exec(db_name, design_name, "test_view")
+    expected = [row["id"] for row in result.model.rows]
+
+    async with client.view_scan(
+        db_name, design_name, "test_view", partitions=3, ordered=True, reduce=False
+    ) as rows:
+        assert [row["id"] async for row in rows] == expected
+
+    async with client.view_scan(
+        db_name, design_name, "test_view", split_keys=[1], reduce=False
+    ) as rows:
+        assert sorted([row["id"] async for row in rows]) == sorted(expected)
+
+
+async def test_view_scan_reduce(client: CouchClient):
+    response = await client.db_bulk_docs(db_name, [dict(n=i) for i in range(1, 31)])
+    assert response.status_code == 201
+
+    result = await client.view_exec(
+        db_name, design_name, "test_reduce_view", group_level=1
+    )
+    expected = result.model.rows
+    assert [row["value"] for row in expected] == [10, 10, 10]
+
+    for descending in (False, True):
+        async with client.view_scan(
+            db_name,
+            design_name,
+            "test_reduce_view",
+            partitions=4,
+            ordered=True,
+            group_level=1,
+            descending=descending,
+        ) as rows:
+            result = [row async for row in rows]
+
+        assert result == (expected[::-1] if descending else expected)
+
+    async with client.view_scan(
+        db_name, design_name, "test_reduce_view", split_keys=[[1, 4]], group_level=1
+    ) as rows:
+        assert sorted([row["key"] async for row in rows]) == [[0], [1], [2]]
+
+    with pytest.raises(ValueError):
+        async with client.view_scan(db_name, design_name, "test_reduce_view"):
+            pass
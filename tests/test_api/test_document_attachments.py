@@ -88,6 +88,72 @@ async def test_get(
     assert response.status_code == 404
 
 
+async def test_upload_stream(client: CouchClient, tmp_path):
+    content = bytes(range(256)) * 1024
+    path = tmp_path / "attachment.bin"
+    path.write_bytes(content)
+    progress = []
+
+    for use_mmap in (False, True):
+        response = await client.doc_get(db_name, doc_name)
+
+        response = await client.attachment_upload(
+            db_name,
+            doc_name,
+            "streamed_attachment",
+            "application/octet-stream",
+            path,
+            response.model._rev,
+            chunk_size=16 * 1024,
+            use_mmap=use_mmap,
+            progress=lambda sent, total: progress.append((sent, total)),
+        )
+        assert response.status_code == 201
+        assert progress[-1] == (len(content), len(content))
+
+    response = await client.attachment_get(db_name, doc_name, "streamed_attachment")
+    assert response.data == content
+
+
+async def test_download(client: CouchClient, tmp_path):
+    async with client.attachment_stream(
+        db_name, doc_name, "streamed_attachment"
+    ) as response:
+        content = b"".join([chunk async for chunk in response.data])
+
+    assert len(content) == 256 * 1024
+
+    path = tmp_path / "downloaded.bin"
+    response = await client.attachment_download(
+        db_name, doc_name, "streamed_attachment", path
+    )
+    assert response.data == len(content)
+    assert path.read_bytes() == content
+
+
+async def test_download_ranges(client: CouchClient, tmp_path):
+    content = bytes(range(256)) * 1024
+
+    response = await client.attachment_get(
+        db_name, doc_name, "streamed_attachment", byte_range=(256, 511)
+    )
+    assert response.status_code == 206
+    assert response.data == content[256:512]
+
+    buffer = bytearray(len(content))
+    response = await client.attachment_download_ranges(
+        db_name, doc_name, "streamed_attachment", buffer, part_size=50 * 1024
+    )
+    assert response.data == len(content)
+    assert buffer == content
+
+    path = tmp_path / "downloaded.bin"
+    await client.attachment_download_ranges(
+        db_name, doc_name, "streamed_attachment", path, part_size=50 * 1024
+    )
+    assert path.read_bytes() == content
+
+
 async def test_delete(
     client: CouchClient,
 ):
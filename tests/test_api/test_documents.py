@@ -1,5 +1,8 @@
+import anyio
 import pytest
-from async_couch import CouchClient
+from async_couch import CouchClient, exc
+from async_couch.clients.documents.batching import DocReadCoalescer, DocWriteBatcher
+from async_couch.clients.documents.cache import DocCache
 from async_couch.utils.content_types import MultipartRelatedAttachment
 
 
@@ -66,6 +69,39 @@ async def test_create_with_attachments(client: CouchClient, database):
     assert response.model._files[1].decode() == attachments.data
 
 
+async def test_create_with_streamed_attachments(
+    client: CouchClient, database, tmp_path
+):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"file" * 1024)
+
+    async def chunks():
+        for _ in range(4):
+            yield b"chunk" * 256
+
+    response = await client.doc_create_or_update(
+        db_name,
+        "test_doc_streamed_att",
+        dict(val=-2),
+        attachments=[
+            MultipartRelatedAttachment(
+                name=b"file", data=path, mime_type=b"application/octet-stream"
+            ),
+            MultipartRelatedAttachment(
+                name=b"chunks", data=chunks(), length=5 * 1024, mime_type=b"text/plain"
+            ),
+        ],
+        chunk_size=1000,
+    )
+    assert response.status_code == 201
+
+    response = await client.attachment_get(db_name, "test_doc_streamed_att", "file")
+    assert response.data == b"file" * 1024
+
+    response = await client.attachment_get(db_name, "test_doc_streamed_att", "chunks")
+    assert response.data == b"chunk" * 1024
+
+
 async def test_exists(client: CouchClient, database):
     response = await client.doc_exists(db_name, doc_name)
     assert response.status_code == 200
@@ -99,6 +135,43 @@ async def test_get(client: CouchClient, database):
     assert response.status_code == 404
 
 
+async def test_get_attachments(client: CouchClient, database):
+    response = await client.doc_get(db_name, doc_with_attachments, attachments=True)
+    assert response.status_code == 200
+    assert response.model._files[1].name == b"text"
+    assert response.model._files[1].decode() == b"test_text"
+
+    response = await client.doc_get(
+        db_name, doc_with_attachments, attachments=True, multipart=False
+    )
+    assert response.status_code == 200
+    assert response.model._files is None
+    assert response.model.doc["_attachments"]["text"]["data"] == "dGVzdF90ZXh0"
+
+
+async def test_get_open_revs(client: CouchClient, database):
+    original = await client.doc_get(db_name, doc_with_attachments)
+
+    for multipart in (True, False):
+        response = await client.doc_get(
+            db_name,
+            doc_with_attachments,
+            open_revs=[original.model._rev, "1-missing"],
+            attachments=True,
+            multipart=multipart,
+        )
+        assert response.status_code == 200
+        assert [doc._rev for doc in response.model.docs] == [original.model._rev]
+        assert response.model.missing == ["1-missing"]
+
+    assert response.model.docs[0]._files is None
+
+    response = await client.doc_get(
+        db_name, doc_with_attachments, open_revs="all", attachments=True
+    )
+    assert response.model.docs[0]._files[1].decode() == b"test_text"
+
+
 async def test_copy(client: CouchClient, database):
     original = await client.doc_get(db_name, doc_name)
     assert original.status_code == 200
@@ -133,3 +206,59 @@ async def test_delete(client: CouchClient, database):
 
     response = await client.doc_delete(db_name, doc_name, doc.model._rev)
     assert response.status_code == 404
+
+
+async def test_read_coalescer(client: CouchClient, database):
+    loader = DocReadCoalescer(client)
+    results = dict()
+
+    async def get(doc_id: str):
+        results[doc_id] = await loader.doc_get(db_name, doc_id)
+
+    async with anyio.create_task_group() as tg:
+        for doc_id in [doc_with_attachments, "non_existing"]:
+            tg.start_soon(get, doc_id)
+
+    assert results[doc_with_attachments].status_code == 200
+    assert results[doc_with_attachments].model._id == doc_with_attachments
+    assert results["non_existing"].status_code == 404
+
+
+async def test_write_batcher(client: CouchClient, database):
+    writer = DocWriteBatcher(client)
+    results = dict()
+
+    async def save(doc_id: str):
+        try:
+            results[doc_id] = await writer.save(db_name, dict(val=3), doc_id=doc_id)
+        except exc.BulkDocumentError as error:
+            results[doc_id] = error
+
+    async with anyio.create_task_group() as tg:
+        for doc_id in ["batched_1", "batched_2", doc_with_attachments]:
+            tg.start_soon(save, doc_id)
+
+    assert results["batched_1"].rev is not None
+    assert results["batched_2"].id == "batched_2"
+    assert results[doc_with_attachments].error == "conflict"
+
+
+async def test_doc_cache(client: CouchClient, database):
+    cache = DocCache(client)
+
+    response = await cache.doc_get(db_name, "batched_1")
+    assert response.status_code == 200
+
+    response = await client.doc_get(
+        db_name, "batched_1", if_none_match=response.headers["etag"]
+    )
+    assert response.status_code == 304
+
+    response = await cache.doc_get(db_name, "batched_1")
+    assert response.status_code == 200
+    assert response.model.doc == dict(val=3)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    response = await cache.doc_get(db_name, "batched_1", conflicts=False, rev=None)
+    assert response.model.doc == dict(val=3)
+    assert (cache.hits, cache.misses) == (2, 1)
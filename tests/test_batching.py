@@ -0,0 +1,51 @@
+import anyio
+import pytest
+
+from async_couch.utils.batching import BatchCollector
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batch_collector():
+    flushed = []
+
+    async def flush(key, items):
+        flushed.append((key, list(items)))
+        return [ValueError(item) if item < 0 else item * 2 for item in items]
+
+    collector = BatchCollector(flush, window=0.01, max_items=3)
+    results = dict()
+
+    async def submit(key, item):
+        try:
+            results[item] = await collector.submit(key, item)
+        except ValueError as error:
+            results[item] = error
+
+    async with anyio.create_task_group() as tg:
+        for key, item in [("a", 1), ("a", 2), ("b", 3), ("a", -4), ("a", 5)]:
+            tg.start_soon(submit, key, item)
+
+    batches = sorted((key, sorted(items)) for key, items in flushed)
+    assert [key for key, _ in batches] == ["a", "a", "b"]
+    assert sorted(len(items) for key, items in batches if key == "a") == [1, 3]
+    assert batches[-1] == ("b", [3])
+    assert results[1] == 2
+    assert results[5] == 10
+    assert isinstance(results[-4], ValueError)
+
+
+async def test_batch_collector_max_size():
+    flushed = []
+
+    async def flush(key, items):
+        flushed.append(items)
+        return items
+
+    collector = BatchCollector(flush, window=0.01, max_size=4, size_of=len)
+
+    async with anyio.create_task_group() as tg:
+        for item in ["ab", "cd", "ef"]:
+            tg.start_soon(collector.submit, "key", item)
+
+    assert sorted(map(len, flushed)) == [1, 2]
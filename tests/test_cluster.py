@@ -0,0 +1,125 @@
+import anyio
+import httpx
+import pytest
+
+from async_couch import get_couch_client, types
+from async_couch.http_clients import ClusterHttpClient
+
+
+def get_cluster(balancer: str) -> ClusterHttpClient:
+    urls = ["http://node1:5984", "http://node2:5984", "http://node3:5984"]
+    return ClusterHttpClient.get_client(urls, balancer=balancer)
+
+
+def test_round_robin():
+    cluster = get_cluster("round_robin")
+    first = [cluster.candidates()[0].url for _ in range(3)]
+
+    assert sorted(first) == sorted(node.url for node in cluster.nodes)
+
+
+def test_least_outstanding():
+    cluster = get_cluster("least_outstanding")
+    cluster.nodes[0].outstanding = 2
+    cluster.nodes[1].outstanding = 1
+
+    assert cluster.candidates()[0] is cluster.nodes[2]
+
+
+def test_ejected_node():
+    cluster = get_cluster("latency_weighted")
+    cluster.eject(cluster.nodes[0])
+
+    for _ in range(5):
+        assert cluster.candidates()[-1] is cluster.nodes[0]
+
+    cluster.retry_interval = 0
+    first = [cluster.candidates()[0] for _ in range(30)]
+    assert cluster.nodes[0] in first
+
+
+def test_node_urls():
+    client = get_couch_client(
+        user="admin",
+        password="password",
+        https=True,
+        port=6984,
+        hosts=["node1", "node2:5984", "::1", "fe80::1", "[fe80::2]:5984"],
+    )
+
+    assert [node.url for node in client.http_client.nodes] == [
+        "https://node1:6984",
+        "https://node2:5984",
+        "https://[::1]:6984",
+        "https://[fe80::1]:6984",
+        "https://[fe80::2]:5984",
+    ]
+
+    for node in client.http_client.nodes:
+        assert node.client.base_url.port in (5984, 6984)
+
+
+def test_unknown_balancer():
+    with pytest.raises(ValueError):
+        get_cluster("random")
+
+
+@pytest.mark.anyio
+async def test_health_checks():
+    probes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        probes.append(request.url.host)
+        return httpx.Response(200, json={"status": "ok"})
+
+    urls = ["http://node1:5984", "http://node2:5984"]
+    cluster = ClusterHttpClient.get_client(
+        urls, retry_interval=0.01, transport=httpx.MockTransport(handler)
+    )
+    cluster.eject(cluster.nodes[1])
+
+    async with cluster:
+        with anyio.fail_after(1):
+            while not cluster.nodes[1].healthy:
+                await anyio.sleep(0.01)
+
+    assert probes == ["node2"]
+    assert cluster.nodes[1].latency is not None
+    assert all(node.client.is_closed for node in cluster.nodes)
+
+
+@pytest.mark.anyio
+async def test_unavailable_node():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "node1":
+            return httpx.Response(503, json={"error": "nodedown", "reason": ""})
+
+        return httpx.Response(200, json={})
+
+    urls = ["http://node1:5984", "http://node2:5984"]
+    cluster = ClusterHttpClient.get_client(urls, transport=httpx.MockTransport(handler))
+    statuses = {200: "OK", 503: "Unavailable"}
+
+    for _ in range(2):
+        response = await cluster.make_request(
+            endpoint="/", method=types.HttpMethod.GET, statuses=statuses, path={}
+        )
+        assert response.status_code == 200
+
+    async with cluster.stream_request(
+        endpoint="/", method=types.HttpMethod.GET, statuses=statuses, path={}
+    ) as response:
+        assert response.status_code == 200
+
+    assert not cluster.nodes[0].healthy
+    assert cluster.nodes[1].healthy
+
+    # Non-idempotent request is not repeated on another node
+    cluster.retry_interval = 0
+    results = [
+        await cluster.make_request(
+            endpoint="/", method=types.HttpMethod.POST, statuses=statuses, path={}
+        )
+        for _ in range(2)
+    ]
+    assert sorted(response.status_code for response in results) == [200, 503]
@@ -0,0 +1,52 @@
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from async_couch.codecs import codecs, get_codec
+
+
+def available_codecs():
+    result = []
+
+    for name in codecs:
+        try:
+            result.append(get_codec(name))
+        except ImportError:
+            continue
+
+    return result
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_round_trip(codec):
+    data = {"a": [1, 2.5, None, True], "b": {"c": "ж"}}
+    encoded = codec.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == data
+    assert codec.loads(memoryview(encoded)) == data
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_extra_types(codec):
+    doc_uuid = uuid.uuid4()
+    data = {
+        "created": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "day": datetime.date(2024, 1, 2),
+        "uuid": doc_uuid,
+        "price": decimal.Decimal("10.01"),
+    }
+
+    assert codec.loads(codec.dumps(data)) == {
+        "created": "2024-01-02T03:04:05",
+        "day": "2024-01-02",
+        "uuid": str(doc_uuid),
+        "price": "10.01",
+    }
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_codec("unknown")
@@ -0,0 +1,86 @@
+import array
+
+import pytest
+
+from async_couch.utils.columnar import Column, KeyColumn, StringTable
+
+
+def test_column_numbers():
+    column = Column()
+
+    for value in (1, 2, 3):
+        column.append(value)
+
+    assert column.data == array.array("q", [1, 2, 3])
+
+    column.append(0.5)
+    assert column.data == array.array("d", [1, 2, 3, 0.5])
+
+    column.append(2**70)
+    assert column.numeric
+    assert list(column) == [1, 2, 3, 0.5, 2**70]
+
+
+def test_column_fallback():
+    column = Column()
+
+    for value in (1, 2.5, [1, 2], None, True):
+        column.append(value)
+
+    assert not column.numeric
+    assert column.data == [1, 2.5, [1, 2], None, True]
+    assert column[2] == [1, 2]
+
+
+def test_key_column():
+    column = KeyColumn()
+
+    for key in ([1, "a"], [2, "b", 0.5], [3]):
+        column.append(key)
+
+    assert column.split
+    assert column.components[0].data == array.array("q", [1, 2, 3])
+    assert column.components[1].data == ["a", "b", None]
+    assert list(column) == [[1, "a"], [2, "b", 0.5], [3]]
+
+    column.append("c")
+    assert not column.split
+    assert list(column) == [[1, "a"], [2, "b", 0.5], [3], "c"]
+    assert column[3] == "c"
+
+
+def test_string_table():
+    table = StringTable()
+
+    for value in ("a", "b", "a", None, "b"):
+        table.append(value)
+
+    assert table.strings == ["a", "b", None]
+    assert list(table.indexes) == [0, 1, 0, 2, 1]
+    assert list(table) == ["a", "b", "a", None, "b"]
+    assert table[3] is None
+
+
+def test_numpy():
+    numpy = pytest.importorskip("numpy")
+
+    column, table = Column(), StringTable()
+
+    for value in (1, 2, 3):
+        column.append(value)
+        table.append(str(value % 2))
+
+    assert column.numpy().dtype == numpy.int64
+    assert column.numpy().sum() == 6
+    assert list(table.numpy()) == ["1", "0", "1"]
+
+    values, indexes = column.numpy(), table.numpy()
+    column.append(4)
+    table.append("0")
+    assert (len(values), len(indexes)) == (3, 3)
+
+    keys = KeyColumn()
+    keys.append([1, 2])
+    keys.append([3, 4])
+    assert keys.numpy().shape == (2,)
+    assert keys.components[1].numpy().tolist() == [2, 4]
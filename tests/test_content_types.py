@@ -1,4 +1,11 @@
-from async_couch.utils.content_types import MultipartRelated, MultipartRelatedAttachment
+import pytest
+
+from async_couch.utils.content_types import (
+    MultipartParser,
+    MultipartRelated,
+    MultipartRelatedAttachment,
+    content_type_boundary,
+)
 
 
 encoded_data = (
@@ -41,3 +48,95 @@ def test_multipart_decoding():
     assert attachments[1].decode() == b"some test text"
     assert attachments[1].name == b"text.txt"
     assert attachments[1].mime_type == b"text/plain"
+
+
+@pytest.mark.anyio
+async def test_multipart_streamed_encoding(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_bytes(b"some test text")
+
+    async def chunks():
+        yield b"some "
+        yield b"test text"
+
+    for data, length in ((path, None), (chunks(), 14), ([b"some test text"], 14)):
+        attachments = [
+            MultipartRelatedAttachment(mime_type=b"application/json", data=b"{}"),
+            MultipartRelatedAttachment(
+                mime_type=b"text/plain", name=b"text.txt", data=data, length=length
+            ),
+        ]
+        assert MultipartRelated.dump_length(attachments) == len(encoded_data)
+        assert attachments[1].as_dict["length"] == 14
+
+        body = [chunk async for chunk in MultipartRelated.iter_dump(attachments, 4)]
+        assert b"".join(body) == encoded_data
+
+
+def test_multipart_unknown_length():
+    attachment = MultipartRelatedAttachment(
+        mime_type=b"text/plain", name=b"text.txt", data=iter([b"text"])
+    )
+
+    with pytest.raises(ValueError):
+        MultipartRelated.dump_length([attachment])
+
+
+binary_data = b"\r\n--XFKYLGSHYCAFWJGY\r\n\x00\xff\r\n\r\n" * 100
+
+mixed_data = (
+    b"--abc"
+    b"\r\nContent-Type: application/json"
+    b"\r\n"
+    b'\r\n{"_id":"doc"}'
+    b"\r\n--abc"
+    b"\r\nContent-Type: application/octet-stream"
+    b"\r\n"
+    b"\r\n" + binary_data + b"\r\n--abc"
+    b'\r\nContent-Disposition: attachment; filename="bin"'
+    b"\r\nContent-Length: " + str(len(binary_data)).encode() + b"\r\n"
+    b"\r\n" + binary_data + b"\r\n--abc--\r\n"
+)
+
+
+def test_content_type_boundary():
+    assert content_type_boundary('multipart/related; boundary="abc"') == b"abc"
+    assert content_type_boundary(b"multipart/mixed;boundary=abc") == b"abc"
+
+    with pytest.raises(ValueError):
+        content_type_boundary("application/json")
+
+
+def test_multipart_binary_decoding():
+    for chunk_size in (1, 7, 100, len(mixed_data)):
+        parser = MultipartParser(b"abc")
+        parts = []
+
+        for position in range(0, len(mixed_data), chunk_size):
+            parts.extend(parser.feed(mixed_data[position : position + chunk_size]))
+
+        parser.close()
+        assert [part.mime_type for part in parts] == [
+            b"application/json",
+            b"application/octet-stream",
+            None,
+        ]
+        assert parts[0].json() == {"_id": "doc"}
+        assert parts[1].data == binary_data
+        assert parts[2].data == binary_data
+        assert parts[2].name == b"bin"
+        assert isinstance(parts[2].data, memoryview)
+
+
+@pytest.mark.anyio
+async def test_multipart_iter_load():
+    async def chunks():
+        for position in range(0, len(mixed_data), 64):
+            yield mixed_data[position : position + 64]
+
+    parts = [part async for part in MultipartRelated.iter_load(chunks(), b"abc")]
+    assert len(parts) == 3
+
+    with pytest.raises(ValueError):
+        async for _ in MultipartRelated.iter_load([mixed_data[:-10]], b"abc"):
+            pass
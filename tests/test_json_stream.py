@@ -0,0 +1,93 @@
+from async_couch.utils.json_stream import (
+    EventStreamParser,
+    JsonArrayParser,
+    JsonLinesParser,
+)
+
+
+encoded_data = (
+    b'{"total_rows":2,"offset":0,"rows":[\r\n'
+    b'{"id":"a","key":"a\\"]}","value":{"rev":"1-a"}},\r\n'
+    b'{"id":"b","key":["b",{"c":"\\\\"}],"value":[1,2]}\r\n'
+    b'],"update_seq":"2-x"}'
+)
+
+decoded_rows = [
+    {"id": "a", "key": 'a"]}', "value": {"rev": "1-a"}},
+    {"id": "b", "key": ["b", {"c": "\\"}], "value": [1, 2]},
+]
+
+
+def test_rows_parsing():
+    parser = JsonArrayParser()
+    assert parser.feed(encoded_data) == decoded_rows
+    assert parser.close() == {"total_rows": 2, "offset": 0, "update_seq": "2-x"}
+
+
+def test_chunked_rows_parsing():
+    for size in range(1, len(encoded_data)):
+        parser = JsonArrayParser()
+        rows = []
+
+        for i in range(0, len(encoded_data), size):
+            rows.extend(parser.feed(encoded_data[i : i + size]))
+
+        assert rows == decoded_rows
+        assert parser.close()["update_seq"] == "2-x"
+
+
+def test_key_as_value():
+    data = b'{"id": "rows", "rows" : [{"a": 1}], "tags": ["rows"]}'
+
+    for size in (1, len(data)):
+        parser = JsonArrayParser()
+        rows = []
+
+        for i in range(0, len(data), size):
+            rows.extend(parser.feed(data[i : i + size]))
+
+        assert rows == [{"a": 1}]
+        assert parser.close() == {"id": "rows", "tags": ["rows"]}
+
+    assert JsonArrayParser().feed(b'["rows", [{"a": 1}]]') == []
+
+
+def test_custom_key_parsing():
+    parser = JsonArrayParser(key=b"docs")
+    assert parser.feed(b'{"docs":[{"_id":"a"}],"bookmark":"x"}') == [{"_id": "a"}]
+    assert parser.close() == {"bookmark": "x"}
+
+
+def feed_chunked(parser, data: bytes, size: int) -> list:
+    items = []
+
+    for i in range(0, len(data), size):
+        items.extend(parser.feed(data[i : i + size]))
+
+    return items
+
+
+def test_json_lines_parsing():
+    data = b'{"seq":1,"id":"a"}\n\n{"seq":2,"id":"b"}\n{"last_seq":2}'
+
+    for size in range(1, len(data)):
+        parser = JsonLinesParser()
+        items = feed_chunked(parser, data, size)
+
+        assert items == [{"seq": 1, "id": "a"}, {"seq": 2, "id": "b"}]
+        assert parser.close() == [{"last_seq": 2}]
+
+
+def test_event_stream_parsing():
+    data = (
+        b'data: {"seq":1,"id":"a"}\nid: 1\n\n'
+        b"event: heartbeat\ndata: \n\n"
+        b'data: {"seq":2,\ndata: "id":"b"}\nid: 2\n\n'
+    )
+
+    for size in range(1, len(data)):
+        parser = EventStreamParser()
+        items = feed_chunked(parser, data, size)
+
+        assert items == [{"seq": 1, "id": "a"}, {"seq": 2, "id": "b"}]
+        assert parser.last_event_id == "2"
@@ -0,0 +1,42 @@
+import time
+
+from async_couch.utils.lru import LRUCache
+
+
+def test_max_entries():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_max_bytes():
+    cache = LRUCache(max_bytes=10)
+    cache.set("a", 1, size=4)
+    cache.set("b", 2, size=4)
+    cache.set("c", 3, size=4)
+    assert len(cache) == 2
+    assert cache.size == 8
+    assert "a" not in cache
+
+    cache.set("d", 4, size=11)
+    assert "d" not in cache
+
+    assert cache.pop("b") == 2
+    assert cache.size == 4
+
+
+def test_ttl(monkeypatch):
+    cache = LRUCache(ttl=10)
+    cache.set("a", 1, size=1)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert cache.get("a") is None
+    assert cache.size == 0
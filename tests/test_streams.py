@@ -0,0 +1,153 @@
+import hashlib
+import io
+
+import anyio
+import pytest
+
+from async_couch.utils.streams import (
+    OffsetWriter,
+    byte_source,
+    gather_in_background,
+    iterate,
+    produce_in_background,
+    track_progress,
+    write_chunks,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_iterate():
+    async def items():
+        yield 1
+        yield 2
+
+    assert [item async for item in iterate([1, 2])] == [1, 2]
+    assert [item async for item in iterate(items())] == [1, 2]
+
+
+async def test_produce_in_background():
+    async def producer(send):
+        for i in range(5):
+            await send.send(i)
+
+    async with produce_in_background(producer, buffer=2) as items:
+        assert [item async for item in items] == list(range(5))
+
+
+async def test_producer_error():
+    async def producer(send):
+        await send.send(1)
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        async with produce_in_background(producer) as items:
+            async for _ in items:
+                pass
+
+
+async def test_early_exit():
+    async def producer(send):
+        while True:
+            await send.send(1)
+
+    with anyio.fail_after(1):
+        async with produce_in_background(producer) as items:
+            async for _ in items:
+                break
+
+
+def make_producer(items):
+    async def producer(send):
+        for item in items:
+            await anyio.sleep(0)
+            await send.send(item)
+
+    return producer
+
+
+async def test_gather_in_background():
+    producers = [make_producer(range(i * 10, i * 10 + 10)) for i in range(3)]
+
+    async with gather_in_background(producers, buffer=2) as items:
+        assert sorted([item async for item in items]) == list(range(30))
+
+    async with gather_in_background(producers, buffer=2, ordered=True) as items:
+        assert [item async for item in items] == list(range(30))
+
+
+async def test_gather_error():
+    async def failing(send):
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        async with gather_in_background(
+            [make_producer(range(10)), failing], ordered=True
+        ) as items:
+            async for _ in items:
+                pass
+
+
+async def test_byte_source(tmp_path):
+    content = bytes(range(256)) * 10
+    path = tmp_path / "data.bin"
+    path.write_bytes(content)
+
+    assert byte_source(content) == (content, len(content))
+
+    async def chunks():
+        yield content
+
+    sources = [
+        (path, dict(), len(content)),
+        (path, dict(use_mmap=True), len(content)),
+        (open(path, "rb"), dict(), len(content)),
+        (chunks(), dict(), None),
+    ]
+
+    for data, options, expected_length in sources:
+        body, length = byte_source(data, chunk_size=1000, **options)
+        assert length == expected_length
+        assert b"".join([bytes(chunk) async for chunk in body]) == content
+
+    with pytest.raises(TypeError):
+        byte_source(1)
+
+
+async def test_track_progress():
+    progress = []
+    chunks = track_progress(
+        iterate([b"ab", b"cde"]), lambda *args: progress.append(args), 5
+    )
+
+    assert [chunk async for chunk in chunks] == [b"ab", b"cde"]
+    assert progress == [(2, 5), (5, 5)]
+
+
+async def test_write_chunks(tmp_path):
+    path = tmp_path / "data.bin"
+
+    assert await write_chunks(iterate([b"ab", b"cd"]), path) == 4
+    assert path.read_bytes() == b"abcd"
+
+    with open(path, "wb") as file:
+        assert await write_chunks(iterate([b"ef"]), file) == 2
+
+    assert path.read_bytes() == b"ef"
+
+
+async def test_offset_writer(tmp_path):
+    content = bytes(range(256)) * 4
+    parts = [(512, content[512:]), (0, content[:512])]
+
+    for destination in (tmp_path / "data.bin", io.BytesIO(), bytearray(1024)):
+        writer = OffsetWriter(destination, len(content))
+        await writer.prepare()
+
+        for offset, part in parts:
+            assert await writer.write(iterate([part[:100], part[100:]]), offset) == 512
+
+        assert await writer.md5() == hashlib.md5(content).digest()
+
+    with pytest.raises(ValueError):
+        OffsetWriter(bytearray(10), 11)